@@ -0,0 +1,4 @@
+"""Benchmarks for ghsec's fetch, parse, render and serialize paths.
+
+Run ``python -m bench.run --help`` from the repository root.
+"""
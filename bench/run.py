@@ -0,0 +1,240 @@
+"""Time ghsec's hot paths over synthetic alert sets and print JSON results.
+
+    python -m bench.run                                # 100, 1k and 10k alerts
+    python -m bench.run --sizes 1000000 --only fetch,parse
+    python -m bench.run --latency 0.05 --output bench.json
+    python -m bench.run --compare bench.json           # exit 1 on regressions
+
+Each result is the best and median wall time over ``--repeat`` runs. Rendering
+benchmarks write to an in-memory console 120 columns wide.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from collections.abc import Callable
+
+from ghsec import __version__, api, display
+from ghsec.records import to_records
+from ghsec.synthetic import iter_alerts, make_alerts
+from ghsec.transport import Response
+
+from bench.transport import LatencyTransport
+
+DEFAULT_SIZES = [100, 1_000, 10_000]
+ALERT_TYPES = ["code", "dep", "secret"]
+PER_PAGE = 100
+# print_alert_detail renders one panel per alert; past this many the per-alert figure is stable.
+DETAIL_LIMIT = 1_000
+
+
+def _time(fn: Callable[[], object], repeat: int) -> dict:
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        runs.append(time.perf_counter() - start)
+    return {"min": min(runs), "median": statistics.median(runs), "runs": len(runs)}
+
+
+@contextlib.contextmanager
+def _quiet_console():
+    from rich.console import Console
+
+    saved = display.__dict__.get("console")
+    display.console = Console(file=io.StringIO(), width=120, force_terminal=True)
+    try:
+        yield
+    finally:
+        if saved is None:
+            del display.console
+        else:
+            display.console = saved
+
+
+def bench_fetch(alert_type: str, size: int, repeat: int, latency: float) -> dict:
+    """list_alerts end to end: pagination, scheduling, prefetch and JSON decoding."""
+    api.configure_cache(enabled=False)
+    transport = LatencyTransport({alert_type: size})
+    api.set_transport(transport)
+    try:
+        api.list_alerts("bench/repo", alert_type)  # untimed: generate and keep the pages
+        transport.latency = latency
+        return _time(lambda: api.list_alerts("bench/repo", alert_type), repeat)
+    finally:
+        api.set_transport(None)
+
+
+def bench_parse(alert_type: str, size: int, repeat: int) -> dict:
+    """Decoding API pages, as gh_api does for every response."""
+    alerts = make_alerts(alert_type, size)
+    pages = [json.dumps(alerts[i:i + PER_PAGE]).encode() for i in range(0, size, PER_PAGE)]
+    del alerts
+    return _time(lambda: [Response(200, {}, body).json() for body in pages], repeat)
+
+
+def bench_records(alert_type: str, size: int, repeat: int) -> dict:
+    alerts = make_alerts(alert_type, size)
+    return _time(lambda: to_records(alerts, alert_type, "bench/repo"), repeat)
+
+
+def bench_table(alert_type: str, size: int, repeat: int) -> dict:
+    records = to_records(iter_alerts(alert_type, size), alert_type, "bench/repo")
+    with _quiet_console():
+        return _time(lambda: display.print_alerts_table(records, alert_type), repeat)
+
+
+def bench_detail(alert_type: str, size: int, repeat: int) -> dict:
+    alerts = list(iter_alerts(alert_type, min(size, DETAIL_LIMIT)))
+
+    def render():
+        for alert in alerts:
+            display.print_alert_detail(alert, alert_type)
+
+    with _quiet_console():
+        result = _time(render, repeat)
+    result["rendered"] = len(alerts)
+    return result
+
+
+def _bench_output(printer: Callable[[list], None], alert_type: str, size: int, repeat: int) -> dict:
+    alerts = make_alerts(alert_type, size)
+
+    def run():
+        with contextlib.redirect_stdout(io.StringIO()):
+            printer(alerts)
+
+    return _time(run, repeat)
+
+
+def bench_json(alert_type: str, size: int, repeat: int) -> dict:
+    return _bench_output(display.print_json, alert_type, size, repeat)
+
+
+def bench_jsonl(alert_type: str, size: int, repeat: int) -> dict:
+    return _bench_output(display.print_jsonl, alert_type, size, repeat)
+
+
+def bench_startup(repeat: int) -> dict:
+    """Wall time of a fresh interpreter importing ghsec.cli (includes interpreter start)."""
+    code = "import ghsec.cli"
+    return _time(lambda: subprocess.run([sys.executable, "-c", code], check=True), repeat)
+
+
+BENCHMARKS = ["fetch", "parse", "records", "table", "detail", "json", "jsonl", "startup"]
+
+
+def run_benchmarks(
+    sizes: list[int],
+    types: list[str] = ALERT_TYPES,
+    only: list[str] | None = None,
+    repeat: int = 3,
+    latency: float = 0.0,
+    progress: Callable[[str], None] | None = None,
+) -> dict:
+    """Run the selected benchmarks and return the JSON-ready report."""
+    selected = only or BENCHMARKS
+    results = []
+
+    def record(name: str, alert_type: str | None, size: int | None, timing: dict) -> None:
+        entry = {"name": name, "type": alert_type, "size": size, "seconds": timing}
+        if size:
+            entry["per_alert_us"] = timing["min"] / (timing.get("rendered") or size) * 1e6
+        results.append(entry)
+        if progress:
+            progress(f"{name:8} {alert_type or '-':6} {size or '-':>8}  {timing['min'] * 1e3:10.2f} ms")
+
+    per_size = {
+        "fetch": lambda t, n: bench_fetch(t, n, repeat, latency),
+        "parse": lambda t, n: bench_parse(t, n, repeat),
+        "records": lambda t, n: bench_records(t, n, repeat),
+        "table": lambda t, n: bench_table(t, n, repeat),
+        "detail": lambda t, n: bench_detail(t, n, repeat),
+        "json": lambda t, n: bench_json(t, n, repeat),
+        "jsonl": lambda t, n: bench_jsonl(t, n, repeat),
+    }
+    for name in selected:
+        if name == "startup":
+            record("startup", None, None, bench_startup(repeat))
+            continue
+        for alert_type in types:
+            for size in sizes:
+                record(name, alert_type, size, per_size[name](alert_type, size))
+
+    return {
+        "ghsec": __version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "config": {"sizes": sizes, "types": types, "repeat": repeat, "latency": latency, "per_page": PER_PAGE},
+        "results": results,
+    }
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> list[str]:
+    """Describe every result that got slower than ``baseline`` by more than ``threshold``."""
+    def key(entry):
+        return entry["name"], entry["type"], entry["size"]
+
+    before = {key(e): e["seconds"]["min"] for e in baseline["results"]}
+    regressions = []
+    for entry in current["results"]:
+        old = before.get(key(entry))
+        new = entry["seconds"]["min"]
+        if old and new > old * (1 + threshold):
+            name, alert_type, size = key(entry)
+            regressions.append(
+                f"{name} {alert_type or ''} {size or ''}: {old * 1e3:.2f} ms -> {new * 1e3:.2f} ms (+{(new / old - 1):.0%})"
+            )
+    return regressions
+
+
+def _csv(value: str) -> list[str]:
+    return [item for item in value.split(",") if item]
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m bench.run", description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", type=lambda v: [int(n) for n in _csv(v)], default=DEFAULT_SIZES,
+                        help="Comma-separated alert counts (default: 100,1000,10000)")
+    parser.add_argument("--types", type=_csv, default=ALERT_TYPES, help="Alert types (default: code,dep,secret)")
+    parser.add_argument("--only", type=_csv, default=None, help=f"Benchmarks to run ({','.join(BENCHMARKS)})")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per benchmark; the best is reported (default: 3)")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every stub API request (default: 0)")
+    parser.add_argument("--output", metavar="FILE", help="Write the JSON report to FILE instead of stdout")
+    parser.add_argument("--compare", metavar="FILE", help="Exit 1 if any result is slower than in this earlier report")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed slowdown for --compare (default: 0.25)")
+    args = parser.parse_args(argv)
+
+    unknown = set(args.only or []) - set(BENCHMARKS) or set(args.types) - set(ALERT_TYPES)
+    if unknown:
+        parser.error(f"unknown benchmark or type: {', '.join(sorted(unknown))}")
+
+    report = run_benchmarks(
+        args.sizes, args.types, args.only, args.repeat, args.latency,
+        progress=lambda line: print(line, file=sys.stderr),
+    )
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(json.load(f), report, args.threshold)
+        for line in regressions:
+            print(f"regression: {line}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
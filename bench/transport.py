@@ -0,0 +1,61 @@
+"""A stand-in transport that serves synthetic alert pages with injected latency."""
+
+import json
+import time
+from urllib.parse import parse_qs, urlsplit
+
+from ghsec.synthetic import make_alert
+from ghsec.transport import Response
+
+_TYPES = {"code-scanning": "code", "dependabot": "dep", "secret-scanning": "secret"}
+
+
+class LatencyTransport:
+    """Serve ``counts[alert_type]`` alerts per repo, ``per_page`` at a time.
+
+    Every request sleeps ``latency`` seconds first, standing in for the
+    network round trip. Pages are generated on first request; with
+    ``keep_pages`` their encoded bodies are kept so later crawls measure the
+    client rather than the generator (at the cost of holding every page).
+    """
+
+    def __init__(self, counts: dict[str, int], latency: float = 0.0, seed: int = 0, keep_pages: bool = True) -> None:
+        self.counts = counts
+        self.latency = latency
+        self.seed = seed
+        self.keep_pages = keep_pages
+        self.requests = 0
+        self._pages: dict[tuple[str, str, int, int], bytes] = {}
+
+    def request(self, method: str, endpoint: str, fields=None, headers=None, include: bool = False) -> Response:
+        self.requests += 1
+        if self.latency:
+            time.sleep(self.latency)
+        parts = urlsplit(endpoint)
+        segments = parts.path.strip("/").split("/")
+        query = parse_qs(parts.query)
+        # /repos/OWNER/REPO/<kind>/alerts[/N]
+        repo, kind = "/".join(segments[1:3]), segments[3]
+        alert_type = _TYPES[kind]
+        total = self.counts.get(alert_type, 0)
+        if len(segments) > 5:
+            number = int(segments[5])
+            if not 1 <= number <= total:
+                return Response(404, {}, b'{"message": "Not Found"}')
+            return Response(200, {}, json.dumps(make_alert(alert_type, number, repo, self.seed)).encode())
+
+        per_page = int(query.get("per_page", ["30"])[0])
+        page = int(query.get("page", ["1"])[0])
+        first = total - (page - 1) * per_page
+        numbers = range(first, max(0, first - per_page), -1)
+        body = self._pages.get((repo, alert_type, per_page, page))
+        if body is None:
+            body = json.dumps([make_alert(alert_type, n, repo, self.seed) for n in numbers]).encode()
+            if self.keep_pages:
+                self._pages[(repo, alert_type, per_page, page)] = body
+        response_headers = {"x-ratelimit-remaining": "4999", "x-ratelimit-reset": str(int(time.time()) + 3600)}
+        if first - per_page > 0:
+            response_headers["link"] = (
+                f'<https://api.github.com{parts.path}?per_page={per_page}&page={page + 1}>; rel="next"'
+            )
+        return Response(200, response_headers, body)
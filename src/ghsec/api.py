@@ -1,44 +1,329 @@
-"""GitHub API wrapper using the gh CLI."""
+"""GitHub API wrapper.
 
+Requests go through a transport from ``ghsec.transport``: direct pooled HTTPS
+when a token is available, otherwise the ``gh api`` subprocess.
+"""
+
+import contextlib
 import json
+import os
+import re
 import subprocess
 import sys
+import threading
+import time
+from collections.abc import Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 
+from ghsec import trace
+from ghsec.gitconfig import detect_repo_local
+from ghsec.jsonstream import iter_array
+from ghsec.ratelimit import Scheduler
+from ghsec.transport import Response, StreamedResponse, default_transport
 
-def gh_api(endpoint: str, method: str = "GET", fields: dict | None = None) -> dict | list:
-    """Call gh api and return parsed JSON."""
-    cmd = ["gh", "api", endpoint, "--method", method]
-    if fields:
-        for key, value in fields.items():
-            cmd.extend(["-f", f"{key}={value}"])
-    try:
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-    except FileNotFoundError:
-        print("Error: 'gh' CLI not found. Install it from https://cli.github.com/", file=sys.stderr)
-        sys.exit(1)
-    except subprocess.CalledProcessError as e:
-        stderr = e.stderr.strip()
-        if e.returncode == 4:
-            # gh returns 4 for 404 — usually means feature not enabled
-            raise APIError(f"Not found (HTTP 404). Is this feature enabled for the repo?\n{stderr}")
-        raise APIError(stderr or f"gh api failed with exit code {e.returncode}")
-    if not result.stdout.strip():
-        return {}
-    return json.loads(result.stdout)
+_transport = None
+_transport_lock = threading.Lock()
+_scheduler = Scheduler()
+
+_cache = None
+_cache_lock = threading.Lock()
+_cache_enabled = True
+_offline = False
+_detected: dict[str, str] = {}
 
 
 class APIError(Exception):
     pass
 
 
+def get_transport():
+    """Return the process-wide transport, creating it (and fetching the token) once."""
+    global _transport
+    with _transport_lock:
+        if _transport is None:
+            with trace.span("select transport", "auth"):
+                _transport = default_transport()
+        return _transport
+
+
+def set_transport(transport) -> None:
+    """Replace the process-wide transport (``None`` re-selects the default)."""
+    global _transport
+    with _transport_lock:
+        _transport = transport
+
+
+def get_scheduler() -> Scheduler:
+    """Return the rate-limit scheduler every request goes through."""
+    return _scheduler
+
+
+def set_scheduler(scheduler: Scheduler) -> None:
+    global _scheduler
+    _scheduler = scheduler
+
+
+def configure_cache(enabled: bool = True, offline: bool = False) -> None:
+    """Turn the response cache on/off, or answer GETs from it alone (``offline``)."""
+    global _cache, _cache_enabled, _offline
+    if offline and not enabled:
+        raise ValueError("offline mode needs the cache")
+    _cache_enabled = enabled
+    _offline = offline
+    _cache = None
+
+
+def get_cache():
+    """Return the response cache, opening it on first use (``None`` when disabled)."""
+    global _cache, _cache_enabled
+    if not _cache_enabled:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            if os.environ.get("GHSEC_NO_CACHE"):
+                return None
+            import sqlite3
+
+            from ghsec.cache import Cache
+            try:
+                _cache = Cache()
+            except (OSError, sqlite3.Error) as e:  # unwritable cache dir, corrupt db, ...
+                print(f"Warning: response cache disabled ({e})", file=sys.stderr)
+                _cache_enabled = False
+        return _cache
+
+
+def set_cache(cache) -> None:
+    """Use ``cache`` (a ``ghsec.cache.Cache``) for responses."""
+    global _cache, _cache_enabled
+    _cache = cache
+    _cache_enabled = cache is not None
+
+
+def _error_message(resp: Response) -> str:
+    text = resp.body.decode(errors="replace").strip()
+    try:
+        message = json.loads(text).get("message", text)
+    except (ValueError, AttributeError):
+        message = text
+    if resp.status == 404:
+        return f"Not found (HTTP 404). Is this feature enabled for the repo?\n{message}"
+    if resp.status == 0:  # gh CLI failure without an HTTP status
+        return message
+    return f"{message} (HTTP {resp.status})"
+
+
+def _send(endpoint: str, method: str, fields: dict | None, headers: dict | None, include: bool) -> Response:
+    transport = get_transport()
+
+    def attempt() -> Response:
+        resp = transport.request(method, endpoint, fields=fields, headers=headers, include=include)
+        trace.count("requests")
+        trace.count("bytes_in", len(resp.body))
+        return resp
+
+    with trace.span("request", "network", method=method, endpoint=endpoint) as span:
+        try:
+            resp = _scheduler.run(attempt)
+        except OSError as e:
+            raise APIError(f"Request to {endpoint} failed: {e}") from e
+        span.set(status=resp.status, bytes=len(resp.body))
+    remaining = resp.headers.get("x-ratelimit-remaining")
+    if remaining is not None and remaining.isdigit():
+        trace.gauge("ratelimit.remaining", int(remaining))
+    if resp.status == 0 or resp.status >= 400:
+        raise APIError(_error_message(resp))
+    return resp
+
+
+def _open_stream(endpoint: str, headers: dict | None) -> Response | StreamedResponse:
+    """Send a GET like ``_send`` does, but leave a 200 body unread."""
+    transport = get_transport()
+    stream = getattr(transport, "stream", None)
+
+    def attempt() -> Response | StreamedResponse:
+        if stream is not None:
+            resp = stream("GET", endpoint, headers=headers)
+        else:  # e.g. the replay transports, which hold bodies in memory anyway
+            resp = transport.request("GET", endpoint, headers=headers, include=True)
+            if resp.status == 200:
+                resp = StreamedResponse(200, resp.headers, iter((resp.body,)))
+        trace.count("requests")
+        return resp
+
+    with trace.span("request", "network", method="GET", endpoint=endpoint, stream=True) as span:
+        try:
+            resp = _scheduler.run(attempt)
+        except OSError as e:
+            raise APIError(f"Request to {endpoint} failed: {e}") from e
+        span.set(status=resp.status)
+    remaining = resp.headers.get("x-ratelimit-remaining")
+    if remaining is not None and remaining.isdigit():
+        trace.gauge("ratelimit.remaining", int(remaining))
+    if resp.status == 0 or resp.status >= 400:
+        trace.count("bytes_in", len(resp.body))
+        raise APIError(_error_message(resp))
+    return resp
+
+
+def _caching(cache, endpoint: str, resp: StreamedResponse) -> Iterator[bytes]:
+    """Pass a body through, storing it in the cache once all of it has arrived."""
+    parts = []
+    for chunk in resp.chunks:
+        parts.append(chunk)
+        yield chunk
+    cache.put(endpoint, Response(200, resp.headers, b"".join(parts)))
+
+
+def _stream_page(endpoint: str) -> tuple[dict[str, str], Iterator[bytes]]:
+    """Open one page for incremental decoding: its headers and its body chunks.
+
+    Goes through the response cache like ``gh_request``. A 304 (or offline
+    mode) replays the cached body, and a fresh body is stored once it has
+    been read to the end.
+    """
+    cache = get_cache()
+    if cache is None:
+        if _offline:
+            raise APIError(f"Offline mode: cannot GET {endpoint}")
+        resp = _open_stream(endpoint, None)
+    else:
+        with trace.span("lookup", "cache"):
+            cached = cache.get(endpoint)
+        if _offline:
+            if cached is None:
+                raise APIError(f"Offline mode: {endpoint} is not in the cache")
+            return cached.response.headers, iter((cached.response.body,))
+        resp = _open_stream(endpoint, cached.conditional_headers() if cached is not None else None)
+        if resp.status == 304 and cached is not None:
+            cache.touch(endpoint)
+            return cached.response.headers, iter((cached.response.body,))
+        if resp.status == 200:
+            return resp.headers, _caching(cache, endpoint, resp)
+    if isinstance(resp, StreamedResponse):
+        return resp.headers, resp.chunks
+    return resp.headers, iter((resp.body,))
+
+
+def _decode_stream(chunks: Iterator[bytes], endpoint: str) -> Iterator:
+    """Decode a page's items as its chunks arrive, counting the bytes received."""
+
+    def counted() -> Iterator[bytes]:
+        for chunk in chunks:
+            trace.count("bytes_in", len(chunk))
+            yield chunk
+
+    body = counted()
+    try:
+        yield from iter_array(body)
+        for _ in body:  # read to the end, so the connection is released and the page cached
+            pass
+    except ValueError as e:
+        raise APIError(f"Invalid JSON from {endpoint}: {e}") from e
+    except OSError as e:
+        raise APIError(f"Request to {endpoint} failed: {e}") from e
+    finally:
+        close = getattr(chunks, "close", None)
+        if close is not None:
+            close()  # frees the connection or gh process if the caller stopped early
+
+
+def _release(chunks: Iterator[bytes]) -> None:
+    """Free the connection or ``gh`` process behind a page body that won't be read.
+
+    A generator's cleanup only runs once it has started, so an unread body is
+    advanced by one chunk before it is closed.
+    """
+    with contextlib.suppress(Exception):
+        next(chunks, None)
+    close = getattr(chunks, "close", None)
+    if close is not None:
+        close()
+
+
+def gh_request(
+    endpoint: str,
+    method: str = "GET",
+    fields: dict | None = None,
+    headers: dict | None = None,
+    include: bool = False,
+    max_age: float | None = None,
+) -> Response:
+    """Send one request through the active transport and return the raw response.
+
+    GETs go through the response cache when it is enabled: stored validators
+    are sent as If-None-Match/If-Modified-Since and a 304 is answered from
+    disk. A cached copy fetched or revalidated less than ``max_age`` seconds
+    ago is returned without a request; a successful PATCH or POST drops the
+    cached copy of its endpoint. In offline mode GETs are answered from the
+    cache only.
+
+    ``include`` asks for response headers; both built-in transports always
+    return them. Raises APIError for failed requests.
+    """
+    cache = get_cache() if method == "GET" else None
+    if cache is None:
+        if _offline:
+            raise APIError(f"Offline mode: cannot {method} {endpoint}")
+        resp = _send(endpoint, method, fields, headers, include)
+        if method != "GET" and (written := get_cache()) is not None:
+            written.delete(endpoint)  # a cached GET of what was just changed is stale, however young
+        return resp
+
+    with trace.span("lookup", "cache"):
+        cached = cache.get(endpoint)
+    if _offline:
+        if cached is None:
+            raise APIError(f"Offline mode: {endpoint} is not in the cache")
+        return cached.response
+    if cached is not None and max_age is not None and time.time() - cached.fetched_at < max_age:
+        return cached.response
+    conditional = dict(headers or {})
+    if cached is not None:
+        conditional.update(cached.conditional_headers())
+    resp = _send(endpoint, method, fields, conditional, include=True)
+    if resp.status == 304 and cached is not None:
+        cache.touch(endpoint)
+        return cached.response
+    if resp.status == 200:
+        cache.put(endpoint, resp)
+    return resp
+
+
+def gh_api(endpoint: str, method: str = "GET", fields: dict | None = None, max_age: float | None = None) -> dict | list:
+    """Call the GitHub API and return parsed JSON."""
+    return _decode(gh_request(endpoint, method=method, fields=fields, max_age=max_age))
+
+
+def _decode(resp: Response) -> dict | list:
+    with trace.span("json", "decode", bytes=len(resp.body)):
+        return resp.json()
+
+
+@trace.traced("git")
 def detect_repo() -> str:
-    """Detect OWNER/REPO from the current git directory using gh."""
+    """Detect OWNER/REPO from the current git directory.
+
+    ``GH_REPO`` wins, as it does for ``gh``. Otherwise reads the remotes from
+    local git config, and only asks ``gh`` when that is ambiguous (no GitHub
+    remote, or remotes pointing at different repos).
+    """
+    if env_repo := os.environ.get("GH_REPO"):
+        return "/".join(env_repo.split("/")[-2:])  # GH_REPO may be HOST/OWNER/REPO
+    repo = detect_repo_local()
+    if repo:
+        return repo
+    cwd = os.getcwd()
+    if cwd in _detected:  # a long-lived process (ghsec serve) asks once per directory
+        return _detected[cwd]
     try:
         result = subprocess.run(
             ["gh", "repo", "view", "--json", "nameWithOwner", "-q", ".nameWithOwner"],
             capture_output=True, text=True, check=True,
         )
-        return result.stdout.strip()
+        repo = _detected[cwd] = result.stdout.strip()
+        return repo
     except (FileNotFoundError, subprocess.CalledProcessError):
         print("Error: could not detect repo. Use --repo OWNER/REPO or run from inside a git repo.", file=sys.stderr)
         sys.exit(1)
@@ -52,23 +337,213 @@ ALERT_TYPE_PATHS = {
 }
 
 
-def list_alerts(repo: str, alert_type: str, state: str | None = None, severity: str | None = None) -> list:
-    """Fetch alerts of the given type."""
+_LINK_RE = re.compile(r'<([^>]+)>;\s*rel="([^"]+)"')
+
+
+def _next_link(headers: dict[str, str], rel: str = "next") -> str | None:
+    """Return the rel="next" (or other ``rel``) URL from a Link header, if any."""
+    for url, link_rel in _LINK_RE.findall(headers.get("link", "")):
+        if link_rel == rel:
+            return url
+    return None
+
+
+def _with_page(url: str, page: int) -> str:
+    """``url`` with its ``page`` query parameter set to ``page``."""
+    parts = urlsplit(url)
+    query = [(k, v) for k, v in parse_qsl(parts.query) if k != "page"] + [("page", str(page))]
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+def iter_pages(endpoint: str, prefetch: bool = True) -> Iterator[list]:
+    """Yield each page of a list endpoint, following Link rel="next" cursors.
+
+    The next page is fetched in the background while the caller works on the
+    current one, so at most two pages are held at a time. Pass
+    ``prefetch=False`` when the caller may stop early and every request counts.
+    """
+    if not prefetch:
+        url = endpoint
+        while url:
+            resp = gh_request(url, include=True)
+            url = _next_link(resp.headers)
+            yield _decode(resp)
+        return
+    pool = ThreadPoolExecutor(max_workers=1)
+    try:
+        pending = pool.submit(gh_request, endpoint, include=True)
+        while pending is not None:
+            resp = pending.result()
+            next_url = _next_link(resp.headers)
+            pending = pool.submit(gh_request, next_url, include=True) if next_url else None
+            yield _decode(resp)
+    finally:
+        # A caller that stops early doesn't wait on the prefetch; one not yet sent never is.
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def iter_pages_parallel(endpoint: str, max_workers: int = 8) -> Iterator[list]:
+    """Yield every page of a page-numbered list endpoint, fetching up to ``max_workers`` at once.
+
+    The first response's rel="last" link gives the page count, and the rest
+    are requested together; pages are still yielded in order, each as soon as
+    it and the ones before it have arrived. Endpoints without a last link
+    (cursor pagination) are followed one page at a time.
+    """
+    first = gh_request(endpoint, include=True)
+    next_url = _next_link(first.headers)
+    last_url = _next_link(first.headers, "last")
+    yield _decode(first)
+    if next_url is None:
+        return
+    last = dict(parse_qsl(urlsplit(last_url).query)).get("page", "") if last_url else ""
+    if not last.isdigit():
+        yield from iter_pages(next_url)
+        return
+    urls = [_with_page(next_url, page) for page in range(2, int(last) + 1)]
+    pool = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(urls))))
+    try:
+        futures = [pool.submit(gh_request, url, include=True) for url in urls]
+        for future in futures:
+            yield _decode(future.result())
+    finally:
+        pool.shutdown(cancel_futures=True)
+
+
+# Streamed pages are cut into lists of at most this many alerts.
+STREAM_BATCH = 25
+
+
+def _iter_page_items(endpoint: str) -> Iterator[Iterator]:
+    """Yield an item iterator per page; each must be used up before the next is taken.
+
+    The next page is requested as soon as the current one's Link header is
+    in, so its response is on its way while this page is being decoded.
+    """
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        pending: Future | None = pool.submit(_stream_page, endpoint)
+        try:
+            while pending is not None:
+                headers, chunks = pending.result()
+                next_url = _next_link(headers)
+                pending = pool.submit(_stream_page, next_url) if next_url else None
+                items = _decode_stream(chunks, endpoint)
+                try:
+                    yield items
+                finally:
+                    items.close()
+                    _release(chunks)
+        finally:
+            # The caller stopped early: free the prefetched page nobody will read.
+            if pending is not None and not pending.cancel():
+                with contextlib.suppress(Exception):
+                    _release(pending.result()[1])
+
+
+def iter_items(endpoint: str) -> Iterator:
+    """Yield every item of a list endpoint, one at a time, across all its pages.
+
+    Items are decoded from the response bytes as they arrive (see
+    ``ghsec.jsonstream``), so no page is held as text or as a decoded list.
+    With the response cache on, a page's raw bytes are kept until its end so
+    they can be stored.
+    """
+    for items in _iter_page_items(endpoint):
+        yield from items
+
+
+def iter_item_batches(endpoint: str, size: int = STREAM_BATCH) -> Iterator[list]:
+    """Like ``iter_items``, grouped into lists of up to ``size`` for page-at-a-time consumers.
+
+    A batch never spans two pages, so one waiting on the network is never held back.
+    """
+    for items in _iter_page_items(endpoint):
+        batch = []
+        for item in items:
+            batch.append(item)
+            if len(batch) >= size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+
+def _alerts_endpoint(
+    scope: str, alert_type: str, state: str | None, severity: str | None, sort: str | None = None
+) -> str:
+    """Build a list endpoint; ``scope`` is ``/repos/OWNER/REPO`` or ``/orgs/ORG``."""
     path = ALERT_TYPE_PATHS[alert_type]
-    endpoint = f"/repos/{repo}/{path}?per_page=100"
+    endpoint = f"{scope}/{path}?per_page=100"
     if state:
         endpoint += f"&state={state}"
     if severity:
         endpoint += f"&severity={severity}"
-    return gh_api(endpoint)
+    if sort:
+        endpoint += f"&sort={sort}&direction=desc"
+    return endpoint
+
+
+def iter_alert_pages(
+    repo: str,
+    alert_type: str,
+    state: str | None = None,
+    severity: str | None = None,
+    sort: str | None = None,
+    prefetch: bool = True,
+    stream: bool = False,
+) -> Iterator[list]:
+    """Yield pages of alerts of the given type until the API runs out.
+
+    ``sort`` ("created" or "updated") orders results newest first. With
+    ``stream`` the alerts are decoded as they arrive and handed out in
+    batches of ``STREAM_BATCH`` (see ``iter_item_batches``).
+    """
+    endpoint = _alerts_endpoint(f"/repos/{repo}", alert_type, state, severity, sort)
+    if stream:
+        return iter_item_batches(endpoint)
+    return iter_pages(endpoint, prefetch=prefetch)
+
+
+def iter_org_alert_pages(
+    org: str, alert_type: str, state: str | None = None, severity: str | None = None, stream: bool = False
+) -> Iterator[list]:
+    """Yield pages of alerts across every repo in an organization.
+
+    Uses the org-level endpoints; each alert carries ``repository.full_name``.
+    ``stream`` works as for ``iter_alert_pages``.
+    """
+    endpoint = _alerts_endpoint(f"/orgs/{org}", alert_type, state, severity)
+    return iter_item_batches(endpoint) if stream else iter_pages(endpoint)
+
+
+@trace.traced("api")
+def list_alerts(repo: str, alert_type: str, state: str | None = None, severity: str | None = None) -> list:
+    """Fetch all alerts of the given type, across every page."""
+    return [alert for page in iter_alert_pages(repo, alert_type, state, severity) for alert in page]
+
+
+@trace.traced("api")
+def get_alert(repo: str, alert_type: str, alert_id: int, max_age: float | None = None) -> dict:
+    """Fetch a single alert by ID, from the cache if it is under ``max_age`` seconds old."""
+    path = ALERT_TYPE_PATHS[alert_type]
+    return gh_api(f"/repos/{repo}/{path}/{alert_id}", max_age=max_age)
+
+
+# Per-alert sub-resources listing every place an alert was found.
+INSTANCE_PATHS = {
+    "code": "instances",
+    "secret": "locations",
+}
 
 
-def get_alert(repo: str, alert_type: str, alert_id: int) -> dict:
-    """Fetch a single alert by ID."""
+def iter_alert_instances(repo: str, alert_type: str, alert_id: int, max_workers: int = 8) -> Iterator[list]:
+    """Yield pages of a code scanning alert's instances or a secret scanning alert's locations."""
     path = ALERT_TYPE_PATHS[alert_type]
-    return gh_api(f"/repos/{repo}/{path}/{alert_id}")
+    endpoint = f"/repos/{repo}/{path}/{alert_id}/{INSTANCE_PATHS[alert_type]}?per_page=100"
+    return iter_pages_parallel(endpoint, max_workers=max_workers)
 
 
+@trace.traced("api")
 def update_alert(repo: str, alert_type: str, alert_id: int, fields: dict) -> dict:
     """PATCH a single alert (dismiss/reopen)."""
     path = ALERT_TYPE_PATHS[alert_type]
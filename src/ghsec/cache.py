@@ -0,0 +1,156 @@
+"""Persistent SQLite cache of GitHub API responses.
+
+Responses are keyed by endpoint (which carries the repo, alert type and
+query string) and stored with their ETag and Last-Modified validators, so
+later requests can be sent conditionally and a ``304`` served locally.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from ghsec.transport import Response
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    etag TEXT,
+    last_modified TEXT,
+    headers TEXT NOT NULL,
+    body BLOB NOT NULL,
+    fetched_at REAL NOT NULL
+)
+"""
+
+
+def cache_dir() -> Path:
+    """``$GHSEC_CACHE_DIR``, else ``$XDG_CACHE_HOME/ghsec``, else ``~/.cache/ghsec``."""
+    if os.environ.get("GHSEC_CACHE_DIR"):
+        return Path(os.environ["GHSEC_CACHE_DIR"])
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return Path(base) / "ghsec"
+
+
+def connect_private(path: str | Path | None, name: str) -> sqlite3.Connection:
+    """Open a WAL-mode database only the current user can read.
+
+    Responses and stored alerts include secret scanning results, plaintext
+    secrets and all. ``path`` defaults to ``name`` in the cache dir, which
+    is created 0700; the database and its ``-wal``/``-shm`` files are 0600.
+    """
+    if path is None:
+        cache_dir().mkdir(mode=0o700, parents=True, exist_ok=True)
+        path = cache_dir() / name
+    path = str(path)
+    os.close(os.open(path, os.O_RDWR | os.O_CREAT, 0o600))
+    os.chmod(path, 0o600)  # tighten databases created by older versions
+    conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=10)
+    conn.execute("PRAGMA journal_mode=WAL")  # SQLite gives -wal/-shm the database's mode
+    for suffix in ("-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.chmod(path + suffix, 0o600)
+    return conn
+
+
+class CachedResponse:
+    """A stored response plus the validators needed to revalidate it."""
+
+    __slots__ = ("response", "etag", "last_modified", "fetched_at")
+
+    def __init__(self, response: Response, etag: str | None, last_modified: str | None, fetched_at: float) -> None:
+        self.response = response
+        self.etag = etag
+        self.last_modified = last_modified
+        self.fetched_at = fetched_at
+
+    def conditional_headers(self) -> dict[str, str]:
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class Cache:
+    """Thread-safe handle on the cache database."""
+
+    def __init__(self, path: str | Path | None = None) -> None:
+        self._lock = threading.Lock()
+        self._conn = connect_private(path, "cache.db")
+        self._conn.execute(_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def get(self, key: str) -> CachedResponse | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT etag, last_modified, headers, body, fetched_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        etag, last_modified, headers, body, fetched_at = row
+        return CachedResponse(Response(200, json.loads(headers), bytes(body)), etag, last_modified, fetched_at)
+
+    def put(self, key: str, resp: Response) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, etag, last_modified, headers, body, fetched_at)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    resp.headers.get("etag"),
+                    resp.headers.get("last-modified"),
+                    json.dumps(resp.headers),
+                    resp.body,
+                    time.time(),
+                ),
+            )
+
+    def touch(self, key: str) -> None:
+        """Mark an entry as just revalidated."""
+        with self._lock:
+            self._conn.execute("UPDATE responses SET fetched_at = ? WHERE key = ?", (time.time(), key))
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+
+
+class MemoryCache:
+    """Same interface as ``Cache``, kept in memory for the life of the process.
+
+    ``ghsec watch`` uses it when the disk cache is off, so its polls are
+    still conditional requests.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._entries: dict[str, CachedResponse] = {}
+
+    def close(self) -> None:
+        pass
+
+    def get(self, key: str) -> CachedResponse | None:
+        with self._lock:
+            return self._entries.get(key)
+
+    def put(self, key: str, resp: Response) -> None:
+        entry = CachedResponse(resp, resp.headers.get("etag"), resp.headers.get("last-modified"), time.time())
+        with self._lock:
+            self._entries[key] = entry
+
+    def touch(self, key: str) -> None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.fetched_at = time.time()
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
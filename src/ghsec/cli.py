@@ -1,16 +1,43 @@
 """CLI entry point for ghsec."""
 
 import argparse
+import queue
 import sys
-
-from ghsec.api import APIError, detect_repo, get_alert, list_alerts, update_alert
+import threading
+import time
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from ghsec import trace
+from ghsec.api import (
+    INSTANCE_PATHS,
+    APIError,
+    configure_cache,
+    detect_repo,
+    get_alert,
+    get_cache,
+    get_scheduler,
+    iter_alert_instances,
+    iter_alert_pages,
+    iter_org_alert_pages,
+    list_alerts,
+    set_cache,
+    update_alert,
+)
+from ghsec.diff import CHANGES, diff_alerts, load_snapshot, save_snapshot
 from ghsec.display import (
     print_alert_detail,
+    print_alerts_stream,
     print_alerts_table,
     print_error,
+    print_heading,
+    print_instances_stream,
     print_json,
+    print_jsonl,
     print_success,
 )
+from ghsec.query import AlertIndex, Query, parse_query
+from ghsec.records import AlertRecord, to_records
 
 ALERT_TYPES = ["code", "dep", "secret"]
 
@@ -48,21 +75,209 @@ def _resolve_repo(args: argparse.Namespace) -> str:
     return args.repo if args.repo else detect_repo()
 
 
-def _handle_list(args: argparse.Namespace, alert_types: list[str]) -> None:
-    repo = _resolve_repo(args)
-    for atype in alert_types:
+_DONE = object()
+
+
+def _pump(pages: Iterator[list], out: queue.Queue, stop: threading.Event | None = None) -> None:
+    """Move pages from a (blocking) page iterator onto a queue, then a sentinel.
+
+    Whatever the iterator raises is queued for ``_drain`` to re-raise, and the
+    sentinel always follows, so the reader never waits on a dead pump. Setting
+    ``stop`` ends the crawl after the page in flight.
+    """
+    try:
+        for page in pages:
+            if stop is not None and stop.is_set():
+                break
+            out.put(page)
+    except BaseException as e:
+        out.put(e)
+    finally:
         try:
-            alerts = list_alerts(repo, atype, state=args.state, severity=args.severity)
+            if hasattr(pages, "close"):
+                pages.close()  # release pooled requests still in flight
+        finally:
+            out.put(_DONE)
+
+
+def _drain(out: queue.Queue) -> Iterator[list]:
+    while (item := out.get()) is not _DONE:
+        if isinstance(item, BaseException):
+            raise item
+        yield item
+
+
+def _print_type_heading(atype: str) -> None:
+    print_heading(f"{atype.upper()} scanning alerts")
+
+
+def _read_repos_file(path: str) -> list[str]:
+    """Read OWNER/REPO names, one per line; blank lines and # comments are skipped."""
+    try:
+        if path == "-":
+            lines = sys.stdin.read().splitlines()
+        else:
+            with open(path) as f:
+                lines = f.read().splitlines()
+    except OSError as e:
+        print_error(f"Cannot read repo list: {e}")
+        sys.exit(1)
+    repos = [name for line in lines if (name := line.split("#", 1)[0].strip())]
+    if not repos:
+        print_error(f"No repos listed in {path}")
+        sys.exit(1)
+    return repos
+
+
+def _repo_alerts(repo: str, atype: str, state: str | None, severity: str | None) -> list:
+    alerts = list_alerts(repo, atype, state=state, severity=severity)
+    for a in alerts:
+        a.setdefault("repository", {"full_name": repo})
+    return alerts
+
+
+def _fan_out_pages(
+    pool: ThreadPoolExecutor, repos: list[str], atype: str, state: str | None, severity: str | None
+) -> Iterator[list]:
+    """Yield each repo's alerts as one page, in completion order.
+
+    The pool bounds how many repos are fetched at once. A repo that fails
+    (e.g. the feature isn't enabled there) is reported and skipped.
+    """
+    futures = {pool.submit(_repo_alerts, repo, atype, state, severity): repo for repo in repos}
+    for future in as_completed(futures):
+        try:
+            yield future.result()
         except APIError as e:
-            print_error(f"[{atype}] {e}")
-            continue
-        if args.json:
-            print_json(alerts)
+            print_error(f"[{atype}] {futures[future]}: {e}")
+
+
+def _local_query(args: argparse.Namespace) -> Query | None:
+    """Fold --state/--severity into --where; the local store can't filter server-side."""
+    parts = [f"{name}={value}" for name, value in (("state", args.state), ("severity", args.severity)) if value]
+    if args.where is not None:
+        parts.append(f"({args.where.text})")
+    return Query(" and ".join(parts)) if parts else None
+
+
+def _handle_list(args: argparse.Namespace, alert_types: list[str]) -> None:
+    if args.repo and (args.org or args.repos_file):
+        print_error("--repo can't be combined with --org or --repos-file")
+        sys.exit(1)
+    if args.local and (args.org or args.repos_file):
+        print_error("--local reads a single repo's synced alerts; it can't be combined with --org or --repos-file")
+        sys.exit(1)
+    if args.graphql and not args.repos_file:
+        print_error("--graphql batches Dependabot alerts across the repos in --repos-file")
+        sys.exit(1)
+    repos = _read_repos_file(args.repos_file) if args.repos_file else None
+    repo = None if (args.org or repos) else _resolve_repo(args)
+    fan_out = ThreadPoolExecutor(max_workers=args.concurrency) if repos else None
+    store = store_query = None
+    where = args.where
+    if args.local:
+        from ghsec.store import AlertStore
+
+        store = AlertStore()
+        store_query, where = _local_query(args), None  # the store applies it
+
+    def pages_for(atype: str) -> Iterator[list]:
+        if store is not None:
+            return iter([store.query(repo, atype, store_query)])
+        if args.org:
+            return iter_org_alert_pages(args.org, atype, state=args.state, severity=args.severity, stream=True)
+        if args.graphql and atype == "dep":
+            from ghsec.graphql import iter_dependabot_pages
+
+            return iter_dependabot_pages(
+                repos, state=args.state, severity=args.severity,
+                on_error=lambda name, message: print_error(f"[dep] {name}: {message}"),
+            )
+        if fan_out is not None:
+            return _fan_out_pages(fan_out, repos, atype, args.state, args.severity)
+        return iter_alert_pages(repo, atype, state=args.state, severity=args.severity, stream=True)
+
+    def matching(page: list, atype: str) -> list:
+        if where is None:
+            return page
+        return [a for a in page if where.matches(AlertRecord.from_api(a, atype, repo or ""))]
+
+    def fetch(atype: str) -> list:
+        if repo is not None and store is None:
+            alerts = list_alerts(repo, atype, state=args.state, severity=args.severity)
         else:
-            if len(alert_types) > 1:
-                from rich.console import Console
-                Console().print(f"\n[bold underline]{atype.upper()} scanning alerts[/]")
-            print_alerts_table(alerts, atype)
+            alerts = [a for page in pages_for(atype) for a in page]
+        if args.json and where is None:
+            return alerts
+        # Tables only need the normalized fields; let the raw payloads go.
+        records = to_records(alerts, atype, repo or "")
+        if where is None:
+            return records
+        keep = where.select(AlertIndex(records))
+        return [alerts[i] for i in keep] if args.json else [records[i] for i in keep]
+
+    show_repo = repo is None
+
+    def render_table(pages: Iterator[list], atype: str) -> None:
+        if len(alert_types) > 1:
+            _print_type_heading(atype)
+        records = (to_records(matching(page, atype), atype, repo or "") for page in pages)
+        print_alerts_stream(records, atype, show_repo=show_repo)
+
+    def render_jsonl(pages: Iterator[list], atype: str) -> None:
+        for page in pages:
+            print_jsonl(matching(page, atype))
+
+    try:
+        if args.jsonl:
+            _handle_list_stream(alert_types, pages_for, render_jsonl)
+            return
+        if args.stream and not args.json:
+            _handle_list_stream(alert_types, pages_for, render_table)
+            return
+        # Fetch every type at once so the run costs the slowest request, not the sum;
+        # results are still reported in alert_types order.
+        with ThreadPoolExecutor(max_workers=len(alert_types)) as pool:
+            futures = [(atype, pool.submit(fetch, atype)) for atype in alert_types]
+            for atype, future in futures:
+                try:
+                    alerts = future.result()
+                except APIError as e:
+                    print_error(f"[{atype}] {e}")
+                    continue
+                if args.json:
+                    print_json(alerts)
+                else:
+                    if len(alert_types) > 1:
+                        _print_type_heading(atype)
+                    print_alerts_table(alerts, atype, show_repo=show_repo)
+    finally:
+        if fan_out is not None:
+            fan_out.shutdown()
+        if store is not None:
+            store.close()
+
+
+def _handle_list_stream(alert_types: list[str], pages_for, render) -> None:
+    """Hand each type's pages to ``render(pages, atype)`` as they arrive.
+
+    All types are fetched concurrently; rendering happens in alert_types order.
+    """
+    stop = threading.Event()
+    with ThreadPoolExecutor(max_workers=len(alert_types)) as pool:
+        try:
+            feeds = []
+            for atype in alert_types:
+                out: queue.Queue = queue.Queue()
+                pool.submit(_pump, pages_for(atype), out, stop)
+                feeds.append((atype, out))
+            for atype, out in feeds:
+                try:
+                    render(_drain(out), atype)
+                except APIError as e:
+                    print_error(f"[{atype}] {e}")
+        finally:
+            stop.set()  # on an early exit, don't wait for the other crawls to finish
 
 
 def cmd_list(args: argparse.Namespace) -> None:
@@ -81,17 +296,368 @@ def cmd_list_secrets(args: argparse.Namespace) -> None:
     _handle_list(args, ["secret"])
 
 
-def cmd_show(args: argparse.Namespace) -> None:
+def cmd_sync(args: argparse.Namespace) -> None:
+    from ghsec.store import AlertStore, sync_alerts
+
     repo = _resolve_repo(args)
+    alert_types = [args.type] if args.type else ALERT_TYPES
+    store = AlertStore()
+    summaries = []
+    with ThreadPoolExecutor(max_workers=len(alert_types)) as pool:
+        futures = [(atype, pool.submit(sync_alerts, store, repo, atype)) for atype in alert_types]
+        for atype, future in futures:
+            try:
+                summary = future.result()
+            except APIError as e:
+                print_error(f"[{atype}] {e}")
+                continue
+            summaries.append(summary)
+            if args.jsonl:
+                print_jsonl([summary])
+            elif not args.json:
+                print_success(
+                    f"[{atype}] {summary['changed']} changed, {summary['total']} stored "
+                    f"({summary['pages']} page request{'s' if summary['pages'] != 1 else ''})"
+                )
+    store.close()
+    if args.json:
+        print_json(summaries)
+
+
+def cmd_export(args: argparse.Namespace) -> None:
+    from ghsec.export import ExportError, export_pages, open_writer
+
+    if args.repo and (args.org or args.repos_file):
+        print_error("--repo can't be combined with --org or --repos-file")
+        sys.exit(1)
+    repos = _read_repos_file(args.repos_file) if args.repos_file else None
+    repo = None if (args.org or repos) else _resolve_repo(args)
+    alert_types = [args.type] if args.type else ALERT_TYPES
     try:
-        alert = get_alert(repo, args.type, args.id)
-    except APIError as e:
+        writer = open_writer(args.format, args.output)
+    except ExportError as e:
         print_error(str(e))
         sys.exit(1)
+    total = 0
+    # One type at a time: the writer is single-threaded and pages shouldn't pile up.
+    with ThreadPoolExecutor(max_workers=args.concurrency) as fan_out:
+        try:
+            for atype in alert_types:
+                try:
+                    if args.org:
+                        pages = iter_org_alert_pages(
+                            args.org, atype, state=args.state, severity=args.severity, stream=True
+                        )
+                    elif repos:
+                        pages = _fan_out_pages(fan_out, repos, atype, args.state, args.severity)
+                    else:
+                        pages = iter_alert_pages(repo, atype, state=args.state, severity=args.severity, stream=True)
+                    total += export_pages(writer, pages, atype, repo or "")
+                except APIError as e:
+                    print_error(f"[{atype}] {e}")
+        finally:
+            writer.close()
+    if args.output != "-":
+        print_success(f"Exported {total} alert{'s' if total != 1 else ''} to {args.output}")
+
+
+def _diff_baseline(args: argparse.Namespace, repo: str, alert_types: list[str]) -> list[AlertRecord]:
+    if args.against:
+        try:
+            records = load_snapshot(args.against)
+        except (OSError, ValueError) as e:
+            print_error(f"Cannot read snapshot: {e}")
+            sys.exit(1)
+        return [rec for rec in records if rec.repo == repo and rec.type in alert_types]
+
+    from ghsec.store import AlertStore
+
+    store = AlertStore()
+    try:
+        if all(store.high_water(repo, atype) is None for atype in alert_types):
+            print_error(f"No previous sync for {repo}; run 'ghsec sync' first or pass --against FILE")
+            sys.exit(1)
+        return [rec for atype in alert_types for rec in to_records(store.query(repo, atype), atype, repo)]
+    finally:
+        store.close()
+
+
+def cmd_diff(args: argparse.Namespace) -> None:
+    repo = _resolve_repo(args)
+    alert_types = [args.type] if args.type else ALERT_TYPES
+    baseline = _diff_baseline(args, repo, alert_types)
+
+    current: dict[str, list[AlertRecord]] = {}
+    with ThreadPoolExecutor(max_workers=len(alert_types)) as pool:
+        futures = [(atype, pool.submit(list_alerts, repo, atype)) for atype in alert_types]
+        for atype, future in futures:
+            try:
+                current[atype] = to_records(future.result(), atype, repo)
+            except APIError as e:
+                print_error(f"[{atype}] {e}")
+    # A type we couldn't fetch is left out of the comparison rather than reported as all removed.
+    baseline = [rec for rec in baseline if rec.type in current]
+    changes = diff_alerts(baseline, (rec for records in current.values() for rec in records))
+    if args.save:
+        save_snapshot(args.save, repo, (rec for records in current.values() for rec in records))
+
     if args.json:
-        print_json(alert)
-    else:
-        print_alert_detail(alert, args.type)
+        print_json({change: [rec.to_dict() for rec in records] for change, records in changes.items()})
+        return
+    if args.jsonl:
+        _print_changes_jsonl(changes)
+        return
+    _print_changes(changes, list(current))
+
+
+def _print_changes_jsonl(changes: dict[str, list[AlertRecord]]) -> None:
+    print_jsonl({"change": change, **rec.to_dict()} for change, records in changes.items() for rec in records)
+
+
+def _print_changes(changes: dict[str, list[AlertRecord]], alert_types: list[str]) -> None:
+    """A table per type and kind of change, then a one-line count per type."""
+    for atype in alert_types:
+        counts = []
+        for change in CHANGES:
+            records = [rec for rec in changes[change] if rec.type == atype]
+            if records:
+                print_heading(f"{atype.upper()}: {change} ({len(records)})")
+                print_alerts_table(records, atype)
+            if records or change != "removed":
+                counts.append(f"{len(records)} {change}")
+        print_success(f"[{atype}] {', '.join(counts)}")
+
+
+def cmd_watch(args: argparse.Namespace) -> None:
+    from ghsec.watch import PollInterval, watch
+
+    repo = _resolve_repo(args)
+    alert_types = [args.type] if args.type else ALERT_TYPES
+    if not 0 < args.min_interval <= args.interval <= args.max_interval:
+        print_error("Intervals must satisfy 0 < --min-interval <= --interval <= --max-interval")
+        sys.exit(1)
+    if get_cache() is None and not args.offline:
+        from ghsec.cache import MemoryCache
+
+        set_cache(MemoryCache())  # keep polls conditional even without the disk cache
+    latest: dict[str, list[AlertRecord]] = {}
+
+    def poll() -> list[AlertRecord]:
+        with ThreadPoolExecutor(max_workers=len(alert_types)) as pool:
+            futures = [
+                (atype, pool.submit(list_alerts, repo, atype, state=args.state, severity=args.severity))
+                for atype in alert_types
+            ]
+            for atype, future in futures:
+                try:
+                    latest[atype] = to_records(future.result(), atype, repo)
+                except APIError as e:
+                    # Keep the last good result so a failed poll doesn't read as every alert removed.
+                    print_error(f"[{atype}] {e}")
+        return [rec for records in latest.values() for rec in records]
+
+    def report(changes: dict[str, list[AlertRecord]]) -> None:
+        if args.json or args.jsonl:
+            _print_changes_jsonl(changes)
+            return
+        changed_types = {rec.type for records in changes.values() for rec in records}
+        print_heading(time.strftime("%Y-%m-%d %H:%M:%S"))
+        _print_changes(changes, [atype for atype in alert_types if atype in changed_types])
+
+    def budget() -> tuple[int | None, float | None]:
+        scheduler = get_scheduler()
+        reset_in = scheduler.reset_at - time.time() if scheduler.reset_at is not None else None
+        return scheduler.remaining, reset_in
+
+    interval = PollInterval(args.interval, args.min_interval, args.max_interval)
+    try:
+        watch(poll, report, interval, budget, polls=args.polls)
+    except KeyboardInterrupt:
+        pass
+
+
+def cmd_show(args: argparse.Namespace) -> None:
+    try:
+        targets = parse_show_targets(args.targets)
+    except argparse.ArgumentTypeError as e:
+        print_error(str(e))
+        sys.exit(1)
+    if args.instances and (len(targets) != 1 or targets[0][0] not in INSTANCE_PATHS):
+        print_error("--instances is available for a single code or secret alert")
+        sys.exit(1)
+    repo = _resolve_repo(args)
+    if args.instances:
+        _show_instances(args, repo, *targets[0])
+        return
+
+    # Fetch concurrently, but print in input order as each alert's turn comes up.
+    alerts: list[dict] = []
+    failed = 0
+    with ThreadPoolExecutor(max_workers=max(1, min(args.concurrency, len(targets)))) as pool:
+        futures = [pool.submit(get_alert, repo, atype, alert_id, max_age=args.max_age) for atype, alert_id in targets]
+        for (atype, alert_id), future in zip(targets, futures):
+            try:
+                alert = future.result()
+            except APIError as e:
+                failed += 1
+                print_error(f"{atype} alert #{alert_id}: {e}" if len(targets) > 1 else str(e))
+                continue
+            if args.jsonl:
+                print_jsonl([alert])
+            elif args.json:
+                alerts.append(alert)
+            else:
+                print_alert_detail(alert, atype)
+    if args.json and len(targets) > 1:
+        print_json(alerts)
+    elif args.json and alerts:
+        print_json(alerts[0])
+    if failed:
+        if len(targets) > 1:
+            print_error(f"Fetched {len(targets) - failed} of {len(targets)} alerts; {failed} failed")
+        sys.exit(1)
+
+
+def _show_instances(args: argparse.Namespace, repo: str, atype: str, alert_id: int) -> None:
+    """Show one alert followed by its instances (code) or locations (secret)."""
+    stop = threading.Event()
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        out: queue.Queue = queue.Queue()
+        # Start on the instances while the alert itself is fetched.
+        pool.submit(_pump, iter_alert_instances(repo, atype, alert_id), out, stop)
+        try:
+            try:
+                alert = get_alert(repo, atype, alert_id, max_age=args.max_age)
+            except APIError as e:
+                print_error(str(e))
+                sys.exit(1)
+            if args.jsonl:
+                print_jsonl([alert])
+            elif not args.json:
+                print_alert_detail(alert, atype)
+            try:
+                if args.jsonl:
+                    for page in _drain(out):
+                        print_jsonl(page)
+                elif args.json:
+                    print_json(dict(alert, instances=[i for page in _drain(out) for i in page]))
+                else:
+                    print_instances_stream(_drain(out), atype)
+            except APIError as e:
+                print_error(str(e))
+                sys.exit(1)
+        finally:
+            stop.set()  # leaving early (a failed get_alert) ends the crawl after its page in flight
+
+
+def parse_id_spec(spec: str) -> list[int]:
+    """Expand an ID spec like ``1-3,7`` into ``[1, 2, 3, 7]``."""
+    ids: list[int] = []
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        lo, sep, hi = part.partition("-")
+        try:
+            start, end = (int(lo), int(hi)) if sep else (int(part), int(part))
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"invalid alert ID or range: '{part}'") from None
+        if start < 1 or end < start:
+            raise argparse.ArgumentTypeError(f"invalid alert ID range: '{part}'")
+        ids.extend(range(start, end + 1))
+    return ids
+
+
+def _split_show_token(token: str) -> tuple[str, str, str]:
+    atype, sep, spec = token.rpartition(":")
+    if sep and atype not in ALERT_TYPES:
+        raise argparse.ArgumentTypeError(f"invalid alert type '{atype}' in '{token}' (choose from {', '.join(ALERT_TYPES)})")
+    return atype, sep, spec
+
+
+def _show_target(token: str) -> str:
+    """argparse check for one ``show`` token: a type, an ID spec or ``type:spec``."""
+    if token not in ALERT_TYPES:
+        parse_id_spec(_split_show_token(token)[2])
+    return token
+
+
+def parse_show_targets(tokens: list[str]) -> list[tuple[str, int]]:
+    """Expand ``show`` arguments into ``(type, id)`` pairs, in input order.
+
+    A bare type name applies to the ID specs after it (``code 1-3 dep 5``);
+    ``type:spec`` applies to that token only (``code:12 secret:3,4``).
+    Repeated alerts are kept once.
+    """
+    targets: list[tuple[str, int]] = []
+    current = None
+    for token in tokens:
+        if token in ALERT_TYPES:
+            current = token
+            continue
+        atype, _, spec = _split_show_token(token)
+        atype = atype or current
+        if atype is None:
+            raise argparse.ArgumentTypeError(f"alert ID '{token}' needs a type, e.g. 'code {token}' or 'code:{token}'")
+        targets.extend((atype, alert_id) for alert_id in parse_id_spec(spec))
+    if not targets:
+        raise argparse.ArgumentTypeError("no alert IDs given")
+    return list(dict.fromkeys(targets))
+
+
+def _collect_ids(specs: list[str]) -> list[int]:
+    """Flatten ID specs, reading more from stdin for ``-`` or when none are given."""
+    missing = "No alert IDs given (pass IDs, ranges like 1-300,412, or pipe them on stdin)"
+    if not specs or "-" in specs:
+        if sys.stdin.isatty():
+            print_error(missing)
+            sys.exit(1)
+        specs = [s for s in specs if s != "-"] + sys.stdin.read().split()
+    ids: list[int] = []
+    for spec in specs:
+        try:
+            ids.extend(parse_id_spec(spec))
+        except argparse.ArgumentTypeError as e:
+            print_error(str(e))
+            sys.exit(1)
+    if not ids:  # e.g. an empty stdin under cron or CI
+        print_error(missing)
+        sys.exit(1)
+    return list(dict.fromkeys(ids))  # de-duplicate, keep order
+
+
+def _update_many(args: argparse.Namespace, repo: str, fields: dict, verb: str) -> None:
+    """PATCH every requested alert with ``fields`` and report the outcome.
+
+    A single ID keeps the one-line output; several IDs are patched
+    concurrently (bounded by --concurrency) and summarised at the end.
+    """
+    atype = args.type
+    ids = _collect_ids(args.ids)
+    if len(ids) == 1:
+        try:
+            update_alert(repo, atype, ids[0], fields)
+        except APIError as e:
+            print_error(str(e))
+            sys.exit(1)
+        print_success(f"{verb} {atype} alert #{ids[0]}")
+        return
+
+    failures: dict[int, str] = {}
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        futures = {pool.submit(update_alert, repo, atype, alert_id, fields): alert_id for alert_id in ids}
+        for future in as_completed(futures):
+            try:
+                future.result()
+            except APIError as e:
+                failures[futures[future]] = str(e)
+    for alert_id in sorted(failures):
+        print_error(f"{atype} alert #{alert_id}: {failures[alert_id]}")
+    succeeded = len(ids) - len(failures)
+    if failures:
+        print_error(f"{verb} {succeeded} of {len(ids)} {atype} alerts; {len(failures)} failed")
+        sys.exit(1)
+    print_success(f"{verb} {succeeded} {atype} alerts")
 
 
 def cmd_dismiss(args: argparse.Namespace) -> None:
@@ -107,29 +673,43 @@ def cmd_dismiss(args: argparse.Namespace) -> None:
     fields = {state_field: state_val, reason_field: api_reason}
     if args.comment:
         fields[comment_field] = args.comment
-
-    try:
-        update_alert(repo, atype, args.id, fields)
-    except APIError as e:
-        print_error(str(e))
-        sys.exit(1)
-    print_success(f"Dismissed {atype} alert #{args.id}")
+    _update_many(args, repo, fields, "Dismissed")
 
 
 def cmd_reopen(args: argparse.Namespace) -> None:
     repo = _resolve_repo(args)
+    _update_many(args, repo, REOPEN_FIELD_MAP[args.type], "Reopened")
+
+
+def cmd_serve(args: argparse.Namespace) -> None:
+    from ghsec.daemon import serve
+
+    serve(args.socket)
+
+
+def _positive_int(text: str) -> int:
+    """argparse ``type=`` for counts such as ``--concurrency``."""
     try:
-        update_alert(repo, args.type, args.id, REOPEN_FIELD_MAP[args.type])
-    except APIError as e:
-        print_error(str(e))
-        sys.exit(1)
-    print_success(f"Reopened {args.type} alert #{args.id}")
+        value = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: '{text}'") from None
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return value
 
 
 def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(prog="ghsec", description="GitHub Security Alerts CLI")
     parser.add_argument("--repo", help="Override repo (OWNER/REPO). Default: auto-detect from git remote")
-    parser.add_argument("--json", action="store_true", help="Output raw JSON instead of formatted tables")
+    output = parser.add_mutually_exclusive_group()
+    output.add_argument("--json", action="store_true", help="Output raw JSON instead of formatted tables")
+    output.add_argument(
+        "--jsonl", action="store_true", help="Output one compact JSON alert per line, streamed as pages arrive"
+    )
+    parser.add_argument("--offline", action="store_true", help="Answer list/show from the local cache only")
+    parser.add_argument("--no-cache", action="store_true", help="Don't read or write the local response cache")
+    parser.add_argument("--trace", metavar="FILE", help="Write a Chrome/Perfetto trace of this run to FILE")
+    parser.add_argument("--timings", action="store_true", help="Print a per-phase timing summary to stderr")
 
     sub = parser.add_subparsers(dest="command")
 
@@ -137,6 +717,20 @@ def build_parser() -> argparse.ArgumentParser:
     def add_list_filters(p: argparse.ArgumentParser) -> None:
         p.add_argument("--state", choices=["open", "dismissed", "fixed"], default=None, help="Filter by state")
         p.add_argument("--severity", choices=["critical", "high", "medium", "low"], default=None, help="Filter by severity")
+        p.add_argument(
+            "--where", type=parse_query, metavar="EXPR",
+            help="Filter client-side, e.g. 'rule=py/sql-injection and path~src/*' or 'package=lodash and age>30d'",
+        )
+        p.add_argument("--local", action="store_true", help="Answer from the local alert store (see sync) instead of the API")
+        p.add_argument("--stream", action="store_true", help="Print table rows page by page as they arrive")
+        scope = p.add_mutually_exclusive_group()
+        scope.add_argument("--org", help="List alerts across every repo in an organization")
+        scope.add_argument("--repos-file", metavar="FILE", help="List alerts for the repos in FILE (one OWNER/REPO per line, - for stdin)")
+        p.add_argument("--concurrency", type=_positive_int, default=8, help="Repos fetched at once with --repos-file (default: 8)")
+        p.add_argument(
+            "--graphql", action="store_true",
+            help="Fetch Dependabot alerts for --repos-file with batched GraphQL queries (one request per ~50 repos)",
+        )
 
     p_list = sub.add_parser("list", help="List all security alerts")
     add_list_filters(p_list)
@@ -154,23 +748,77 @@ def build_parser() -> argparse.ArgumentParser:
     add_list_filters(p_secrets)
     p_secrets.set_defaults(func=cmd_list_secrets)
 
-    p_show = sub.add_parser("show", help="Show detail for one alert")
-    p_show.add_argument("type", choices=ALERT_TYPES, help="Alert type")
-    p_show.add_argument("id", type=int, help="Alert number")
+    p_sync = sub.add_parser("sync", help="Fetch alerts changed since the last sync into the local store")
+    p_sync.add_argument("--type", choices=ALERT_TYPES, default=None, help="Only sync this alert type")
+    p_sync.set_defaults(func=cmd_sync)
+
+    p_export = sub.add_parser("export", help="Stream alerts into a CSV, SQLite or Parquet file")
+    p_export.add_argument("--format", choices=["csv", "sqlite", "parquet"], default="csv", help="Output format (default: csv)")
+    p_export.add_argument("--output", "-o", required=True, metavar="FILE", help="File to write (- for CSV on stdout)")
+    p_export.add_argument("--type", choices=ALERT_TYPES, default=None, help="Only export this alert type")
+    p_export.add_argument("--state", choices=["open", "dismissed", "fixed"], default=None, help="Filter by state")
+    p_export.add_argument("--severity", choices=["critical", "high", "medium", "low"], default=None, help="Filter by severity")
+    export_scope = p_export.add_mutually_exclusive_group()
+    export_scope.add_argument("--org", help="Export alerts across every repo in an organization")
+    export_scope.add_argument("--repos-file", metavar="FILE", help="Export alerts for the repos in FILE (one OWNER/REPO per line)")
+    p_export.add_argument("--concurrency", type=_positive_int, default=8, help="Repos fetched at once with --repos-file (default: 8)")
+    p_export.set_defaults(func=cmd_export)
+
+    p_diff = sub.add_parser("diff", help="Show alerts introduced, fixed, dismissed or reopened since a baseline")
+    p_diff.add_argument("--type", choices=ALERT_TYPES, default=None, help="Only compare this alert type")
+    p_diff.add_argument("--against", metavar="FILE", help="Compare with a snapshot file (default: the last sync)")
+    p_diff.add_argument("--save", metavar="FILE", help="Write the current alerts to FILE as a new snapshot")
+    p_diff.set_defaults(func=cmd_diff)
+
+    p_watch = sub.add_parser("watch", help="Poll for alerts that appear, change state or disappear")
+    p_watch.add_argument("--type", choices=ALERT_TYPES, default=None, help="Only watch this alert type")
+    p_watch.add_argument("--state", choices=["open", "dismissed", "fixed"], default=None, help="Only watch alerts in this state")
+    p_watch.add_argument("--severity", choices=["critical", "high", "medium", "low"], default=None, help="Only watch this severity")
+    p_watch.add_argument("--interval", type=float, default=60.0, help="Initial seconds between polls (default: 60)")
+    p_watch.add_argument("--min-interval", type=float, default=15.0, help="Shortest interval while alerts are changing (default: 15)")
+    p_watch.add_argument("--max-interval", type=float, default=600.0, help="Longest interval when quiet or low on rate limit (default: 600)")
+    p_watch.add_argument("--polls", type=int, default=None, help="Stop after this many polls (default: run until interrupted)")
+    p_watch.set_defaults(func=cmd_watch)
+
+    p_show = sub.add_parser("show", help="Show detail for one or more alerts")
+    p_show.add_argument(
+        "targets", nargs="+", type=_show_target, metavar="TARGET",
+        help="Alert type followed by IDs or ranges (code 1-3,7), or type:IDs tokens (code:12 dep:5)",
+    )
+    p_show.add_argument("--concurrency", type=_positive_int, default=8, help="Alerts fetched at once (default: 8)")
+    p_show.add_argument(
+        "--max-age", type=float, default=60, metavar="SECONDS",
+        help="Use cached alerts fetched less than this long ago without revalidating (default: 60)",
+    )
+    p_show.add_argument(
+        "--instances", action="store_true",
+        help="Also list every instance (code) or location (secret), grouped by ref and path",
+    )
     p_show.set_defaults(func=cmd_show)
 
-    p_dismiss = sub.add_parser("dismiss", help="Dismiss an alert")
-    p_dismiss.add_argument("type", choices=ALERT_TYPES, help="Alert type")
-    p_dismiss.add_argument("id", type=int, help="Alert number")
+    # Shared arguments for commands that PATCH one or many alerts
+    def add_bulk_ids(p: argparse.ArgumentParser) -> None:
+        p.add_argument("type", choices=ALERT_TYPES, help="Alert type")
+        p.add_argument(
+            "ids", nargs="*", metavar="ID",
+            help="Alert numbers or ranges, e.g. 1-300,412 (read from stdin if omitted or '-')",
+        )
+        p.add_argument("--concurrency", type=_positive_int, default=8, help="Parallel requests for multiple IDs (default: 8)")
+
+    p_dismiss = sub.add_parser("dismiss", help="Dismiss one or more alerts")
+    add_bulk_ids(p_dismiss)
     p_dismiss.add_argument("--reason", required=True, help="Dismissal reason")
     p_dismiss.add_argument("--comment", help="Optional comment")
     p_dismiss.set_defaults(func=cmd_dismiss)
 
-    p_reopen = sub.add_parser("reopen", help="Reopen a dismissed alert")
-    p_reopen.add_argument("type", choices=ALERT_TYPES, help="Alert type")
-    p_reopen.add_argument("id", type=int, help="Alert number")
+    p_reopen = sub.add_parser("reopen", help="Reopen one or more dismissed alerts")
+    add_bulk_ids(p_reopen)
     p_reopen.set_defaults(func=cmd_reopen)
 
+    p_serve = sub.add_parser("serve", help="Run a daemon that other ghsec commands forward to")
+    p_serve.add_argument("--socket", metavar="PATH", help="Unix socket to listen on (default: $GHSEC_SOCKET or a per-user path)")
+    p_serve.set_defaults(func=cmd_serve)
+
     return parser
 
 
@@ -180,7 +828,32 @@ def main() -> None:
     if not args.command:
         parser.print_help()
         sys.exit(1)
-    args.func(args)
+    if args.offline and args.no_cache:
+        parser.error("--offline and --no-cache are mutually exclusive")
+    configure_cache(enabled=not args.no_cache, offline=args.offline)
+    run(args)
+
+
+def run(args: argparse.Namespace) -> None:
+    """Run a parsed command, traced when --trace or --timings asked for it."""
+    if not (args.trace or args.timings):
+        args.func(args)
+        return
+    trace.enable()
+    try:
+        with trace.span(f"ghsec {args.command}", "cli"):
+            args.func(args)
+    finally:
+        try:
+            if args.trace:
+                try:
+                    trace.write_chrome_trace(args.trace)
+                except OSError as e:
+                    print_error(f"Cannot write trace: {e}")
+            if args.timings:
+                trace.print_summary()
+        finally:
+            trace.disable()  # the daemon runs later commands in this process
 
 
 if __name__ == "__main__":
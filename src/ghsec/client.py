@@ -0,0 +1,124 @@
+"""The ``ghsec`` entry point: forward to a running daemon, else run standalone.
+
+This module is kept to a handful of stdlib imports so that a forwarded
+command pays only for interpreter startup and one Unix-socket round trip.
+``ghsec serve`` (see ``ghsec.daemon``) keeps the transport, token, cache and
+repo detection warm between commands. Set ``GHSEC_NO_DAEMON=1`` to always
+run standalone.
+"""
+
+import json
+import os
+import socket
+import sys
+from collections.abc import Iterator
+
+from ghsec import __version__
+
+# Settings that change what a command does; the daemon only runs commands
+# for clients whose values match its own.
+_ENV_NAMES = (
+    "GH_TOKEN", "GITHUB_TOKEN", "GH_ENTERPRISE_TOKEN", "GITHUB_ENTERPRISE_TOKEN", "GH_HOST", "GH_REPO", "XDG_CACHE_HOME",
+)
+_CLIENT_ONLY = ("GHSEC_SOCKET", "GHSEC_NO_DAEMON")
+
+# Commands that may read stdin or must run in this process. ``watch`` runs
+# until interrupted and would hold the daemon's one-command-at-a-time lock.
+_LOCAL_COMMANDS = {"serve", "dismiss", "reopen", "watch"}
+
+
+def socket_path() -> str:
+    """``$GHSEC_SOCKET``, else ``$XDG_RUNTIME_DIR/ghsec.sock``, else the cache dir."""
+    if os.environ.get("GHSEC_SOCKET"):
+        return os.environ["GHSEC_SOCKET"]
+    if os.environ.get("XDG_RUNTIME_DIR"):
+        return os.path.join(os.environ["XDG_RUNTIME_DIR"], "ghsec.sock")
+    # Same directory as ghsec.cache.cache_dir(), without importing sqlite3.
+    base = os.environ.get("GHSEC_CACHE_DIR") or os.path.join(
+        os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"), "ghsec"
+    )
+    return os.path.join(base, "daemon.sock")
+
+
+def forwarded_env() -> dict[str, str]:
+    """The environment variables that must agree between client and daemon."""
+    return {
+        name: value
+        for name, value in os.environ.items()
+        if name in _ENV_NAMES or (name.startswith("GHSEC_") and name not in _CLIENT_ONLY)
+    }
+
+
+def _should_forward(argv: list[str]) -> bool:
+    if os.environ.get("GHSEC_NO_DAEMON"):
+        return False
+    return "-" not in argv and not _LOCAL_COMMANDS.intersection(argv)
+
+
+def forward(argv: list[str], stdout=None, stderr=None) -> int | None:
+    """Run ``argv`` in the daemon and return its exit code.
+
+    Output is copied to ``stdout``/``stderr`` as it arrives. Returns ``None``
+    without output when there is no daemon to talk to (or it is a different
+    ghsec version, or was started with a different token, host or ``GHSEC_*``
+    settings), so the caller can run the command itself.
+    """
+    if not _should_forward(argv):
+        return None
+    stdout = stdout or sys.stdout
+    stderr = stderr or sys.stderr
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(socket_path())
+    except OSError:
+        sock.close()
+        return None
+    color = stdout.isatty() and "NO_COLOR" not in os.environ
+    try:
+        width = os.get_terminal_size(stdout.fileno()).columns if color else None
+    except (OSError, ValueError, AttributeError):
+        width = None
+    request = {
+        "version": __version__, "argv": argv, "cwd": os.getcwd(), "color": color, "width": width, "env": forwarded_env(),
+    }
+    started = False
+    with sock, sock.makefile("rb") as replies:
+        try:
+            sock.sendall(json.dumps(request).encode() + b"\n")
+        except OSError:
+            return None
+        for message in _messages(replies):
+            if "fallback" in message:
+                return None
+            started = True
+            if "o" in message:
+                stdout.write(message["o"])
+                stdout.flush()
+            elif "e" in message:
+                stderr.write(message["e"])
+                stderr.flush()
+            elif "exit" in message:
+                return message["exit"]
+    if not started:
+        return None
+    stderr.write("Error: lost the connection to the ghsec daemon\n")
+    return 1
+
+
+def _messages(replies) -> Iterator[dict]:
+    """Decode the daemon's JSON lines until it hangs up."""
+    try:
+        for line in replies:
+            yield json.loads(line)
+    except (OSError, ValueError):
+        return
+
+
+def main() -> None:
+    code = forward(sys.argv[1:])
+    if code is None:
+        from ghsec.cli import main as cli_main
+
+        cli_main()
+        return
+    sys.exit(code)
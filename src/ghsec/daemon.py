@@ -0,0 +1,192 @@
+"""``ghsec serve``: run CLI commands for ``ghsec.client`` over a Unix socket.
+
+The daemon process keeps everything a fresh invocation would rebuild:
+imported modules (Rich included), the transport with its token and pooled
+connections, the open response cache, the rate-limit scheduler's view of the
+budget and repo detection per working directory.
+
+Each connection sends one JSON line ``{version, argv, cwd, color, width, env}``.
+A client whose token, host or ``GHSEC_*`` settings (``env``) differ from
+the daemon's is told to run the command itself. Otherwise the daemon
+answers with JSON lines ``{"o": text}`` / ``{"e": text}`` as the command
+writes to stdout/stderr, then ``{"exit": code}``. Commands run one
+at a time, because stdout, stderr and the working directory are
+process-wide; a command's own worker threads still run concurrently.
+"""
+
+import contextlib
+import io
+import json
+import os
+import signal
+import socketserver
+import sys
+import threading
+import traceback
+
+from ghsec import __version__, api, cli, display
+from ghsec.client import forwarded_env, socket_path
+
+
+class _Stream(io.TextIOBase):
+    """A text stream that sends each write to the client as a JSON line."""
+
+    def __init__(self, send, key: str, color: bool) -> None:
+        self._send = send
+        self._key = key
+        self._color = color
+
+    def write(self, text: str) -> int:
+        if text:
+            self._send({self._key: text})
+        return len(text)
+
+    def writable(self) -> bool:
+        return True
+
+    def isatty(self) -> bool:
+        return self._color  # so _paint and Rich color output like the client's terminal would
+
+
+def _exit_code(e: SystemExit) -> int:
+    if e.code is None or isinstance(e.code, int):
+        return e.code or 0
+    print(e.code, file=sys.stderr)
+    return 1
+
+
+def run_command(argv: list[str]) -> int:
+    """Parse and run one command as ``cli.main`` would; return its exit code."""
+    parser = cli.build_parser()
+    try:
+        args = parser.parse_args(argv)
+        if not args.command:
+            parser.print_help()
+            return 1
+        if args.offline and args.no_cache:
+            parser.error("--offline and --no-cache are mutually exclusive")
+        # The default cache stays open across commands; only reset it for these flags.
+        custom_cache = args.offline or args.no_cache
+        if custom_cache:
+            api.configure_cache(enabled=not args.no_cache, offline=args.offline)
+        try:
+            cli.run(args)
+        finally:
+            if custom_cache:
+                api.configure_cache()
+    except SystemExit as e:
+        return _exit_code(e)
+    except Exception:  # keep serving; the client sees the traceback
+        traceback.print_exc()
+        return 1
+    return 0
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        try:
+            request = json.loads(self.rfile.readline())
+        except ValueError:
+            return
+        lock = threading.Lock()
+
+        def send(message: dict) -> None:
+            with lock:
+                self.wfile.write(json.dumps(message).encode() + b"\n")
+
+        if request.get("version") != __version__:
+            send({"fallback": f"daemon runs ghsec {__version__}"})
+            return
+        if request.get("env") != forwarded_env():
+            send({"fallback": "daemon was started with a different environment"})
+            return
+        with self.server.command_lock:
+            code = self._run(request, send)
+        with contextlib.suppress(OSError):
+            send({"exit": code})
+
+    def _run(self, request: dict, send) -> int:
+        from rich.console import Console
+
+        color = bool(request.get("color"))
+        out, err = _Stream(send, "o", color), _Stream(send, "e", color)
+        display.console = Console(force_terminal=color, no_color=not color, width=request.get("width"))
+        display.err_console = Console(stderr=True, force_terminal=color, no_color=not color)
+        previous = os.getcwd()
+        try:
+            os.chdir(request.get("cwd") or previous)
+            with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+                return run_command(list(request.get("argv") or []))
+        except OSError:  # the client went away mid-command, or its cwd is gone
+            return 1
+        finally:
+            os.chdir(previous)
+
+
+class DaemonServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.command_lock = threading.Lock()
+        # The daemon holds the user's token: create the socket 0600 rather than
+        # chmod it after bind, which would leave it open to others for a moment.
+        umask = os.umask(0o177)
+        try:
+            super().__init__(path, _Handler)
+        finally:
+            os.umask(umask)
+
+    def server_close(self) -> None:
+        super().server_close()
+        with contextlib.suppress(OSError):
+            os.unlink(self.path)
+
+
+def _claim(path: str) -> None:
+    """Remove a stale socket file, or exit if a daemon is already listening on it."""
+    import socket
+
+    if not os.path.exists(path):
+        # Usually the cache dir, which holds secret scanning responses (see ghsec.cache).
+        os.makedirs(os.path.dirname(path) or ".", mode=0o700, exist_ok=True)
+        return
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except OSError:
+        os.unlink(path)
+        return
+    finally:
+        probe.close()
+    display.print_error(f"A ghsec daemon is already listening on {path}")
+    sys.exit(1)
+
+
+def _warm_up() -> None:
+    """Do the one-time work up front so the first forwarded command is fast too."""
+    import rich.panel  # noqa: F401
+    import rich.table  # noqa: F401
+
+    api.get_transport()
+    api.get_cache()
+
+
+def _interrupt(signum, frame) -> None:
+    raise KeyboardInterrupt
+
+
+def serve(path: str | None = None) -> None:
+    """Serve forwarded commands on ``path`` until interrupted."""
+    path = path or socket_path()
+    _claim(path)
+    _warm_up()
+    server = DaemonServer(path)
+    signal.signal(signal.SIGTERM, _interrupt)
+    print(f"ghsec daemon listening on {path}", file=sys.stderr, flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
@@ -0,0 +1,78 @@
+"""Compare two alert sets: what was introduced, fixed, dismissed or reopened.
+
+Both sides are keyed by ``(repo, type, number)`` in a dict, and an alert is
+only classified when its ``(state, updated_at)`` differs from the baseline,
+so a diff is one linear pass over each side. Baselines come from a snapshot
+file written by ``ghsec diff --save`` or from the local store of ``ghsec sync``.
+"""
+
+import json
+import time
+from collections.abc import Iterable
+from pathlib import Path
+
+from ghsec.records import AlertRecord
+
+SNAPSHOT_VERSION = 1
+
+# Report sections, in display order.
+CHANGES = ("new", "fixed", "dismissed", "reopened", "removed")
+
+_FIXED = {"fixed", "resolved"}
+_DISMISSED = {"dismissed", "auto_dismissed"}
+
+
+def _key(rec: AlertRecord) -> tuple[str, str, int]:
+    return rec.repo, rec.type, rec.number
+
+
+def _classify(old: AlertRecord | None, new: AlertRecord) -> str | None:
+    if old is None:
+        return "new" if new.state == "open" else None  # appeared already closed: nothing to act on
+    if old.state == new.state:
+        return None
+    if new.state == "open":
+        return "reopened"
+    if new.state in _FIXED:
+        return "fixed"
+    if new.state in _DISMISSED:
+        return "dismissed"
+    return None
+
+
+def diff_alerts(before: Iterable[AlertRecord], after: Iterable[AlertRecord]) -> dict[str, list[AlertRecord]]:
+    """Classify the changes from ``before`` to ``after``.
+
+    Returns a list per ``CHANGES`` entry. ``removed`` holds open alerts that
+    are no longer listed at all (e.g. their analysis was deleted).
+    """
+    baseline = {_key(rec): rec for rec in before}
+    changes: dict[str, list[AlertRecord]] = {name: [] for name in CHANGES}
+    for rec in after:
+        old = baseline.pop(_key(rec), None)
+        if old is not None and (old.state, old.updated_at) == (rec.state, rec.updated_at):
+            continue
+        change = _classify(old, rec)
+        if change:
+            changes[change].append(rec)
+    changes["removed"] = [rec for rec in baseline.values() if rec.state == "open"]
+    return changes
+
+
+def save_snapshot(path: str | Path, repo: str, records: Iterable[AlertRecord]) -> None:
+    """Write ``records`` as a snapshot file for a later ``ghsec diff --against``."""
+    data = {
+        "version": SNAPSHOT_VERSION,
+        "repo": repo,
+        "taken_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "alerts": [rec.to_dict() for rec in records],
+    }
+    Path(path).write_text(json.dumps(data, separators=(",", ":")))
+
+
+def load_snapshot(path: str | Path) -> list[AlertRecord]:
+    """Read a snapshot written by ``save_snapshot``; raises ``ValueError`` if it isn't one."""
+    data = json.loads(Path(path).read_text())
+    if not isinstance(data, dict) or data.get("version") != SNAPSHOT_VERSION:
+        raise ValueError(f"{path} is not a ghsec snapshot")
+    return [AlertRecord.from_dict(a) for a in data["alerts"]]
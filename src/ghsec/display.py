@@ -1,26 +1,82 @@
-"""Rich formatting for security alert output."""
+"""Rich formatting for security alert output.
+
+Rich is imported only when a table or panel is actually rendered, so JSON
+output and one-line status messages (dismiss/reopen) start fast.
+"""
 
 import json
+import os
+import sys
+from collections.abc import Iterable
+from typing import TYPE_CHECKING
+
+from ghsec import trace
+from ghsec.records import AlertRecord
+
+if TYPE_CHECKING:
+    from rich.table import Table
+
+
+def __getattr__(name: str):
+    # ``console`` and ``err_console`` are created on first use (PEP 562).
+    if name in ("console", "err_console"):
+        with trace.span("import rich", "render"):
+            from rich.console import Console
+        value = Console(stderr=name == "err_console")
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-from rich.console import Console
-from rich.panel import Panel
-from rich.table import Table
 
-console = Console()
-err_console = Console(stderr=True)
+def _console():
+    return globals()["console"] if "console" in globals() else __getattr__("console")
 
 
+def _paint(text: str, sgr: str, stream) -> str:
+    """Wrap ``text`` in an ANSI style when ``stream`` is a color terminal."""
+    if "NO_COLOR" in os.environ or not stream.isatty():
+        return text
+    return f"\033[{sgr}m{text}\033[0m"
+
+
+@trace.traced("render")
 def print_json(data: dict | list) -> None:
     """Print raw JSON output (bypasses Rich to avoid ANSI in machine-readable output)."""
     print(json.dumps(data, indent=2))
 
 
+_encode = None
+
+
+def _jsonl_encoder():
+    """Compact single-line encoder: orjson when installed, else the stdlib."""
+    try:
+        import orjson
+    except ImportError:
+        return lambda obj: json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
+    return lambda obj: orjson.dumps(obj).decode()
+
+
+@trace.traced("render")
+def print_jsonl(alerts: Iterable[dict]) -> None:
+    """Print one compact JSON object per line, flushing so consumers see each batch at once."""
+    global _encode
+    if _encode is None:
+        _encode = _jsonl_encoder()
+    sys.stdout.write("".join(f"{_encode(a)}\n" for a in alerts))
+    sys.stdout.flush()
+
+
 def print_error(msg: str) -> None:
-    err_console.print(f"[bold red]Error:[/] {msg}")
+    print(f"{_paint('Error:', '1;31', sys.stderr)} {msg}", file=sys.stderr)
 
 
 def print_success(msg: str) -> None:
-    console.print(f"[bold green]OK:[/] {msg}")
+    print(f"{_paint('OK:', '1;32', sys.stdout)} {msg}")
+
+
+def print_heading(text: str) -> None:
+    _console().print(f"\n[bold underline]{text}[/]")
 
 
 SEVERITY_COLORS = {
@@ -38,37 +94,31 @@ def _severity_label(sev: str | None) -> str:
     return f"[{color}]{sev}[/]" if color else sev
 
 
-def _extract_severity(alert: dict, alert_type: str) -> str | None:
-    """Pull severity from the type-specific location in the alert JSON."""
-    if alert_type == "code":
-        rule = alert.get("rule", {})
-        return rule.get("security_severity_level") or rule.get("severity")
-    if alert_type == "dep":
-        vuln = (alert.get("security_vulnerability") or alert.get("security_advisory", {}))
-        return vuln.get("severity")
-    return None  # secret scanning has no severity
+def _alert_row(a: "dict | AlertRecord", alert_type: str, show_repo: bool = False) -> tuple[str, ...]:
+    rec = a if isinstance(a, AlertRecord) else AlertRecord.from_api(a, alert_type)
+    number = str(rec.number or "")
+    sev = _severity_label(rec.severity)
+    created = rec.created_at[:10]
+    if show_repo:
+        return rec.repo, number, sev, rec.description, rec.state, created
+    return number, sev, rec.description, rec.state, created
 
 
-def _extract_description(alert: dict, alert_type: str) -> str:
-    """Pull a short description from the alert."""
-    if alert_type == "code":
-        rule = alert.get("rule", {})
-        return rule.get("description", rule.get("id", ""))
-    if alert_type == "dep":
-        adv = alert.get("security_advisory", {})
-        return adv.get("summary", alert.get("dependency", {}).get("package", {}).get("name", ""))
-    if alert_type == "secret":
-        return alert.get("secret_type_display_name", alert.get("secret_type", ""))
-    return ""
+@trace.traced("render")
+def print_alerts_table(alerts: list, alert_type: str, show_repo: bool = False) -> None:
+    """Render a rich table of alerts (with a Repo column for multi-repo results).
 
+    ``alerts`` may hold raw API dicts or ``AlertRecord``s.
+    """
+    from rich.table import Table
 
-def print_alerts_table(alerts: list, alert_type: str) -> None:
-    """Render a rich table of alerts."""
     if not alerts:
-        console.print("[dim]No alerts found.[/]")
+        _console().print("[dim]No alerts found.[/]")
         return
 
     table = Table(show_lines=False, pad_edge=True)
+    if show_repo:
+        table.add_column("Repo", style="magenta", no_wrap=True)
     table.add_column("#", style="bold cyan", no_wrap=True)
     table.add_column("Severity", no_wrap=True)
     table.add_column("Description")
@@ -76,16 +126,114 @@ def print_alerts_table(alerts: list, alert_type: str) -> None:
     table.add_column("Created", no_wrap=True)
 
     for a in alerts:
-        number = str(a.get("number", ""))
-        sev = _severity_label(_extract_severity(a, alert_type))
-        desc = _extract_description(a, alert_type)
-        state = a.get("state", "")
-        created = (a.get("created_at") or "")[:10]
-        table.add_row(number, sev, desc, state, created)
+        table.add_row(*_alert_row(a, alert_type, show_repo))
+
+    _console().print(table)
+
+
+def _stream_block(show_header: bool, show_repo: bool = False) -> "Table":
+    """An empty table whose column widths don't depend on its rows."""
+    from rich import box
+    from rich.table import Table
 
-    console.print(table)
+    table = Table(box=box.SIMPLE_HEAD, show_header=show_header, show_edge=False, expand=True)
+    if show_repo:
+        table.add_column("Repo", style="magenta", no_wrap=True, overflow="ellipsis", width=30)
+    table.add_column("#", style="bold cyan", no_wrap=True, width=7)
+    table.add_column("Severity", no_wrap=True, width=8)
+    table.add_column("Description", ratio=1)
+    table.add_column("State", no_wrap=True, width=9)
+    table.add_column("Created", no_wrap=True, width=10)
+    return table
 
 
+@trace.traced("render")
+def print_alerts_stream(pages: Iterable[list], alert_type: str, show_repo: bool = False) -> None:
+    """Render alerts one block per page as pages arrive.
+
+    Every block uses the same fixed column widths, so consecutive blocks line
+    up as a single table and the first rows appear after the first page.
+    """
+    first = True
+    for page in pages:
+        if not page:
+            continue
+        table = _stream_block(show_header=first, show_repo=show_repo)
+        for a in page:
+            table.add_row(*_alert_row(a, alert_type, show_repo))
+        _console().print(table)
+        first = False
+    if first:
+        _console().print("[dim]No alerts found.[/]")
+
+
+def _instance_row(instance: dict, alert_type: str) -> tuple[str, str, str, str, str]:
+    """(ref, path, line, state, commit) for a code scanning instance or a secret location."""
+    if alert_type == "code":
+        loc = instance.get("location") or {}
+        return (
+            instance.get("ref") or "",
+            loc.get("path") or "",
+            str(loc.get("start_line") or ""),
+            instance.get("state") or "",
+            (instance.get("commit_sha") or "")[:7],
+        )
+    details = instance.get("details") or {}
+    where = details.get("path") or next((v for k, v in details.items() if k.endswith("_url")), "")
+    return (
+        instance.get("type") or "",
+        where,
+        str(details.get("start_line") or ""),
+        "",
+        (details.get("commit_sha") or "")[:7],
+    )
+
+
+@trace.traced("render")
+def print_instances_stream(pages: Iterable[list], alert_type: str) -> None:
+    """Render alert instances (or secret locations) one block per page as pages arrive.
+
+    Rows are sorted by ref and path within a page, and a ref or path is only
+    printed where it changes, so each group reads as one run of lines.
+    """
+    from rich import box
+    from rich.table import Table
+
+    first = True
+    last_ref = last_path = None
+    refs: dict[str, int] = {}
+    paths: set[tuple[str, str]] = set()
+    for page in pages:
+        if not page:
+            continue
+        table = Table(box=box.SIMPLE_HEAD, show_header=first, show_edge=False, expand=True)
+        table.add_column("Ref" if alert_type == "code" else "Location", style="magenta", no_wrap=True, width=24)
+        table.add_column("Path", ratio=1)
+        table.add_column("Line", justify="right", no_wrap=True, width=6)
+        table.add_column("State", no_wrap=True, width=9)
+        table.add_column("Commit", style="dim", no_wrap=True, width=7)
+        for ref, path, line, state, commit in sorted(_instance_row(i, alert_type) for i in page):
+            refs[ref] = refs.get(ref, 0) + 1
+            paths.add((ref, path))
+            shown_ref = ref if ref != last_ref else ""
+            shown_path = path if (ref, path) != (last_ref, last_path) else ""
+            table.add_row(shown_ref, shown_path, line, state, commit)
+            last_ref, last_path = ref, path
+        _console().print(table)
+        first = False
+    if first:
+        _console().print("[dim]No instances found.[/]")
+        return
+    total = sum(refs.values())
+    _console().print(
+        f"[dim]{total} instance{'s' if total != 1 else ''} in {len(paths)} "
+        f"path{'s' if len(paths) != 1 else ''} across {len(refs)} {'ref' if alert_type == 'code' else 'location type'}"
+        f"{'s' if len(refs) != 1 else ''}[/]",
+        highlight=False,
+    )
+
+
+@trace.traced("render")
 def print_alert_detail(alert: dict, alert_type: str) -> None:
     """Render detailed info for a single alert."""
     rows: list[tuple[str, str]] = []
@@ -134,4 +282,6 @@ def print_alert_detail(alert: dict, alert_type: str) -> None:
 
     # Build rich panel content
     content = "\n".join(f"[bold]{k}:[/] {v}" for k, v in rows if v)
-    console.print(Panel(content, title=f"Alert #{alert.get('number', '')}", expand=False))
+    from rich.panel import Panel
+
+    _console().print(Panel(content, title=f"Alert #{alert.get('number', '')}", expand=False))
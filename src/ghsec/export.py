@@ -0,0 +1,117 @@
+"""Stream alerts into CSV, SQLite or Parquet files for ``ghsec export``.
+
+Pages go straight from the API into the writer. Each page is normalized to
+``AlertRecord``s, written, and dropped, so memory stays flat however many
+alerts there are. The columns are the record fields, the same values tables
+and ``--where`` use. SQLite rows are inserted a page at a time in one
+transaction each. Parquet rows are buffered into row groups and written
+with pyarrow, an optional dependency (``pip install ghsec[parquet]``).
+"""
+
+import csv
+import sqlite3
+import sys
+from collections.abc import Iterable
+
+from ghsec.records import AlertRecord, to_records
+
+COLUMNS = AlertRecord.__slots__
+FORMATS = ("csv", "sqlite", "parquet")
+
+
+class ExportError(Exception):
+    pass
+
+
+class CsvWriter:
+    """Header row, then one row per alert; ``-`` writes to stdout."""
+
+    def __init__(self, path: str) -> None:
+        self._file = sys.stdout if path == "-" else open(path, "w", newline="")
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(COLUMNS)
+
+    def write(self, records: list[AlertRecord]) -> None:
+        self._writer.writerows([getattr(rec, c) for c in COLUMNS] for rec in records)
+
+    def close(self) -> None:
+        if self._file is sys.stdout:
+            self._file.flush()
+        else:
+            self._file.close()
+
+
+class SqliteWriter:
+    """An ``alerts`` table keyed by (repo, type, number); re-exports replace rows."""
+
+    def __init__(self, path: str) -> None:
+        self._conn = sqlite3.connect(path, isolation_level=None)
+        columns = ", ".join(f"{c} INTEGER" if c == "number" else f"{c} TEXT" for c in COLUMNS)
+        self._conn.execute(f"CREATE TABLE IF NOT EXISTS alerts ({columns}, PRIMARY KEY (repo, type, number))")
+        placeholders = ", ".join("?" for _ in COLUMNS)
+        self._insert = f"INSERT OR REPLACE INTO alerts ({', '.join(COLUMNS)}) VALUES ({placeholders})"
+
+    def write(self, records: list[AlertRecord]) -> None:
+        self._conn.execute("BEGIN")
+        self._conn.executemany(self._insert, ([getattr(rec, c) for c in COLUMNS] for rec in records))
+        self._conn.execute("COMMIT")
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+class ParquetWriter:
+    """Buffers up to ``row_group_size`` records, then writes them as one row group."""
+
+    def __init__(self, path: str, row_group_size: int = 50_000) -> None:
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ExportError("Parquet export needs pyarrow: pip install 'ghsec[parquet]'") from None
+        self._pa = pa
+        self._schema = pa.schema([(c, pa.int64() if c == "number" else pa.string()) for c in COLUMNS])
+        self._writer = pq.ParquetWriter(path, self._schema)
+        self._row_group_size = row_group_size
+        self._pending: list[AlertRecord] = []
+
+    def _flush(self) -> None:
+        if self._pending:
+            columns = {c: [getattr(rec, c) for rec in self._pending] for c in COLUMNS}
+            self._writer.write_table(self._pa.table(columns, schema=self._schema))
+            self._pending = []
+
+    def write(self, records: list[AlertRecord]) -> None:
+        self._pending.extend(records)
+        if len(self._pending) >= self._row_group_size:
+            self._flush()
+
+    def close(self) -> None:
+        self._flush()
+        self._writer.close()
+
+
+def open_writer(fmt: str, path: str) -> CsvWriter | SqliteWriter | ParquetWriter:
+    """Open a writer for ``fmt``; raises ``ExportError`` if it can't be created."""
+    if path == "-" and fmt != "csv":
+        raise ExportError(f"{fmt} export needs a file; only csv can go to stdout")
+    try:
+        if fmt == "csv":
+            return CsvWriter(path)
+        if fmt == "sqlite":
+            return SqliteWriter(path)
+        if fmt == "parquet":
+            return ParquetWriter(path)
+    except (OSError, sqlite3.Error) as e:
+        raise ExportError(f"Cannot write {path}: {e}") from e
+    raise ExportError(f"Unknown export format {fmt!r}")
+
+
+def export_pages(writer, pages: Iterable[list[dict]], alert_type: str, repo: str = "") -> int:
+    """Write each page as it arrives; return how many alerts were written."""
+    written = 0
+    for page in pages:
+        records = to_records(page, alert_type, repo)
+        writer.write(records)
+        written += len(records)
+    return written
@@ -0,0 +1,226 @@
+"""A local stand-in for the GitHub alert APIs, for load and integration tests.
+
+Serves the code scanning, Dependabot and secret scanning endpoints ghsec
+uses, at repo and org scope: paginated lists with ``Link`` headers, the
+``state``/``severity``/``sort`` filters, single alerts, PATCH updates and
+ETag revalidation. ``Faults`` (from ``ghsec.replay``) adds latency, errors
+and a rate-limit budget. Point ghsec at it with ``GHSEC_API_URL``::
+
+    python -m ghsec.fakegithub --repo acme/web --alerts 2000 --latency 0.1
+    GHSEC_API_URL=http://127.0.0.1:8765 GH_TOKEN=fake ghsec --repo acme/web list
+"""
+
+import argparse
+import hashlib
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from ghsec.records import extract_severity
+from ghsec.replay import Faults
+from ghsec.synthetic import make_alert
+from ghsec.transport import Response
+
+_KINDS = {"code-scanning": "code", "dependabot": "dep", "secret-scanning": "secret"}
+
+
+def _json_response(status: int, payload, headers: dict | None = None) -> Response:
+    return Response(status, {"content-type": "application/json", **(headers or {})}, json.dumps(payload).encode())
+
+
+class FakeGitHub:
+    """In-memory alerts behind a threaded HTTP server on 127.0.0.1.
+
+    Use as a context manager (or ``start()``/``stop()``); ``url`` is the base
+    URL to hand to ``HTTPTransport``. ``requests`` counts requests served.
+    """
+
+    def __init__(self, faults: Faults | None = None, port: int = 0, max_per_page: int = 100) -> None:
+        self.faults = faults
+        self.port = port
+        self.max_per_page = max_per_page
+        self.requests = 0
+        self._alerts: dict[tuple[str, str], dict[int, dict]] = {}
+        self._lock = threading.Lock()
+        self._server: ThreadingHTTPServer | None = None
+
+    # --- data ---
+
+    def add_alerts(self, repo: str, alert_type: str, alerts: list[dict]) -> None:
+        with self._lock:
+            store = self._alerts.setdefault((repo, alert_type), {})
+            for alert in alerts:
+                store[alert["number"]] = alert
+
+    def populate(self, repo: str, count: int, alert_types: tuple[str, ...] = ("code", "dep", "secret")) -> None:
+        """Add ``count`` synthetic alerts of each type to ``repo``."""
+        for alert_type in alert_types:
+            self.add_alerts(repo, alert_type, [make_alert(alert_type, n, repo) for n in range(1, count + 1)])
+
+    def alerts(self, repo: str, alert_type: str) -> list[dict]:
+        with self._lock:
+            return list(self._alerts.get((repo, alert_type), {}).values())
+
+    # --- request handling ---
+
+    def handle(self, method: str, target: str, body: bytes = b"", headers: dict | None = None) -> Response:
+        """Answer one request; the HTTP server and tests both call this."""
+        with self._lock:
+            self.requests += 1
+        if self.faults is None:
+            return self._route(method, target, body, headers or {})
+        return self.faults.apply(lambda: self._route(method, target, body, headers or {}))
+
+    def _route(self, method: str, target: str, body: bytes, headers: dict) -> Response:
+        parts = urlsplit(target)
+        segments = parts.path.strip("/").split("/")
+        query = {k: v[-1] for k, v in parse_qs(parts.query).items()}
+        # repos/OWNER/REPO/<kind>/alerts[/N]  or  orgs/ORG/<kind>/alerts
+        if segments[:1] == ["repos"] and len(segments) in (5, 6) and segments[4] == "alerts":
+            scope, kind, rest = "/".join(segments[1:3]), segments[3], segments[5:]
+        elif segments[:1] == ["orgs"] and len(segments) == 4 and segments[3] == "alerts":
+            scope, kind, rest = None, segments[2], []
+            org = segments[1]
+        else:
+            return _json_response(404, {"message": "Not Found"})
+        alert_type = _KINDS.get(kind)
+        if alert_type is None:
+            return _json_response(404, {"message": "Not Found"})
+
+        if rest:
+            return self._single(method, scope, alert_type, rest[0], body)
+        if method != "GET":
+            return _json_response(405, {"message": "Method Not Allowed"})
+        if scope is None:
+            with self._lock:
+                alerts = [
+                    {**a, "repository": {"full_name": repo}}
+                    for (repo, atype), by_number in self._alerts.items()
+                    if atype == alert_type and repo.split("/")[0] == org
+                    for a in by_number.values()
+                ]
+        elif (scope, alert_type) not in self._alerts:
+            return _json_response(404, {"message": "Not Found"})
+        else:
+            alerts = self.alerts(scope, alert_type)
+        return self._page(parts.path, query, alert_type, alerts, headers)
+
+    def _single(self, method: str, repo: str, alert_type: str, number: str, body: bytes) -> Response:
+        with self._lock:
+            alert = self._alerts.get((repo, alert_type), {}).get(int(number)) if number.isdigit() else None
+            if alert is None:
+                return _json_response(404, {"message": "Not Found"})
+            if method == "PATCH":
+                alert.update(json.loads(body or b"{}"))
+                alert["updated_at"] = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+            elif method != "GET":
+                return _json_response(405, {"message": "Method Not Allowed"})
+            return _json_response(200, alert)
+
+    def _page(self, path: str, query: dict, alert_type: str, alerts: list[dict], headers: dict) -> Response:
+        if query.get("state"):
+            states = set(query["state"].split(","))
+            alerts = [a for a in alerts if a.get("state") in states]
+        if query.get("severity"):
+            severities = set(query["severity"].split(","))
+            alerts = [a for a in alerts if extract_severity(a, alert_type) in severities]
+        sort_key = "updated_at" if query.get("sort") == "updated" else "created_at"
+        alerts.sort(key=lambda a: (a.get(sort_key) or "", a["number"]), reverse=query.get("direction", "desc") == "desc")
+
+        per_page = min(int(query.get("per_page", 30)), self.max_per_page)
+        page = int(query.get("page", 1))
+        chunk = alerts[(page - 1) * per_page:page * per_page]
+        resp = _json_response(200, chunk)
+        etag = '"' + hashlib.sha1(resp.body).hexdigest() + '"'
+        if headers.get("if-none-match") == etag:
+            return Response(304, {"etag": etag}, b"")
+        resp.headers["etag"] = etag
+        if page * per_page < len(alerts):
+            next_query = "&".join(f"{k}={v}" for k, v in {**query, "page": page + 1}.items())
+            resp.headers["link"] = f'<{self.url}{path}?{next_query}>; rel="next"'
+        return resp
+
+    # --- server ---
+
+    @property
+    def url(self) -> str:
+        if self._server is None:
+            return ""
+        return f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    def start(self) -> str:
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _serve(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length) if length else b""
+                headers = {k.lower(): v for k, v in self.headers.items()}
+                resp = fake.handle(self.command, self.path, body, headers)
+                self.send_response(resp.status)
+                for key, value in resp.headers.items():
+                    self.send_header(key, value)
+                self.send_header("Content-Length", str(len(resp.body)))
+                self.end_headers()
+                self.wfile.write(resp.body)
+
+            do_GET = do_PATCH = do_POST = _serve
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", self.port), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True).start()
+        return self.url
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "FakeGitHub":
+        self.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m ghsec.fakegithub", description="Serve fake GitHub alert APIs")
+    parser.add_argument("--port", type=int, default=8765, help="Port on 127.0.0.1 (default: 8765)")
+    parser.add_argument("--repo", action="append", default=[], help="OWNER/REPO to populate (repeatable; default: acme/web)")
+    parser.add_argument("--alerts", type=int, default=250, help="Synthetic alerts per type and repo (default: 250)")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response")
+    parser.add_argument("--rate-limit", type=int, default=None, help="Requests allowed per window before 403s")
+    parser.add_argument("--reset-after", type=float, default=60.0, help="Rate-limit window in seconds (default: 60)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with a 502")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="Fraction of requests answered with a 429")
+    args = parser.parse_args(argv)
+
+    errors = {502: args.error_rate, 429: args.throttle_rate}
+    faults = Faults(
+        latency=args.latency, errors={k: v for k, v in errors.items() if v},
+        rate_limit=args.rate_limit, reset_after=args.reset_after,
+    )
+    fake = FakeGitHub(faults, port=args.port)
+    for repo in args.repo or ["acme/web"]:
+        fake.populate(repo, args.alerts)
+    url = fake.start()
+    print(f"Serving fake GitHub API on {url}  (GHSEC_API_URL={url} GH_TOKEN=fake)", flush=True)
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        fake.stop()
+
+
+if __name__ == "__main__":
+    main()
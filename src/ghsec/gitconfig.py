@@ -0,0 +1,140 @@
+"""Resolve OWNER/REPO from local git config, without running ``gh``.
+
+Walks up from the working directory to the nearest ``.git`` (directory, or
+file for worktrees and submodules), reads the remotes from its config,
+applies ``url.<base>.insteadOf`` rewrites and parses GitHub HTTPS/SSH URLs.
+Results are memoized per config file and modification time.
+"""
+
+import functools
+import os
+import re
+from pathlib import Path
+
+_SECTION_RE = re.compile(r'^\[\s*([^\s\]"]+)(?:\s+"((?:[^"\\]|\\.)*)")?\s*\]')
+
+# https://github.com/o/r(.git), ssh://git@github.com[:port]/o/r(.git), git://github.com/o/r
+_URL_RE = re.compile(r"^(?:https?|ssh|git)://(?:[^@/]+@)?([^/:]+)(?::\d+)?/([^/]+)/([^/]+?)(?:\.git)?/?$")
+# scp-like: git@github.com:o/r(.git)
+_SCP_RE = re.compile(r"^(?:[^@/]+@)?([^/:]+):/?([^/]+)/([^/]+?)(?:\.git)?/?$")
+
+
+def parse_git_config(text: str) -> list[tuple[str, str | None, str, str]]:
+    """Parse git config text into ``(section, subsection, key, value)`` entries.
+
+    Section and key names are lower-cased as git treats them case-insensitively;
+    subsection names keep their case.
+    """
+    entries = []
+    section, subsection = "", None
+    for raw in text.splitlines():
+        line = raw.strip()
+        if not line or line[0] in "#;":
+            continue
+        if line.startswith("["):
+            m = _SECTION_RE.match(line)
+            if m:
+                section, subsection = m.group(1).lower(), m.group(2)
+                if "." in section and subsection is None:  # legacy [remote.origin] form
+                    section, subsection = section.split(".", 1)
+            continue
+        key, sep, value = line.partition("=")
+        value = value.strip() if sep else "true"
+        if value.startswith('"') and value.endswith('"') and len(value) >= 2:
+            value = value[1:-1]
+        else:
+            value = re.split(r"\s[#;]", value, maxsplit=1)[0].strip()
+        entries.append((section, subsection, key.strip().lower(), value))
+    return entries
+
+
+def github_repo_from_url(url: str, host: str = "github.com") -> str | None:
+    """Return ``OWNER/REPO`` if ``url`` points at a repo on ``host``."""
+    m = _URL_RE.match(url) or _SCP_RE.match(url)
+    if not m:
+        return None
+    url_host, owner, name = m.groups()
+    # ssh.github.com is GitHub's SSH-over-443 endpoint
+    if url_host.lower() not in (host.lower(), f"ssh.{host.lower()}"):
+        return None
+    return f"{owner}/{name}"
+
+
+def _apply_instead_of(url: str, rewrites: list[tuple[str, str]]) -> str:
+    """Rewrite ``url`` with the longest matching insteadOf prefix, as git does."""
+    best = max((r for r in rewrites if url.startswith(r[0])), key=lambda r: len(r[0]), default=None)
+    return best[1] + url[len(best[0]):] if best else url
+
+
+def find_git_config(start: Path) -> Path | None:
+    """Locate the config file of the repository containing ``start``."""
+    for directory in (start, *start.parents):
+        dotgit = directory / ".git"
+        if dotgit.is_dir():
+            return dotgit / "config"
+        if dotgit.is_file():
+            # Worktree or submodule: ".git" holds "gitdir: <path>"
+            content = dotgit.read_text().strip()
+            if not content.startswith("gitdir:"):
+                return None
+            gitdir = (directory / content[len("gitdir:"):].strip()).resolve()
+            commondir = gitdir / "commondir"
+            if commondir.is_file():  # linked worktree: config lives in the main git dir
+                gitdir = (gitdir / commondir.read_text().strip()).resolve()
+            return gitdir / "config"
+    return None
+
+
+def _global_configs() -> list[Path]:
+    xdg = os.environ.get("XDG_CONFIG_HOME") or os.path.join(os.path.expanduser("~"), ".config")
+    return [Path(xdg) / "git" / "config", Path(os.path.expanduser("~")) / ".gitconfig"]
+
+
+def _mtime(path: Path) -> int:
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
+        return 0
+
+
+@functools.lru_cache(maxsize=64)
+def _resolve(config: str, mtimes: tuple[int, ...], host: str) -> str | None:
+    """Pick the repo from one config file. ``mtimes`` only keys the cache."""
+    entries: list[tuple[str, str | None, str, str]] = []
+    for path in (*_global_configs(), Path(config)):
+        try:
+            entries.extend(parse_git_config(path.read_text()))
+        except (OSError, UnicodeDecodeError):
+            continue
+
+    rewrites = [(value, sub) for section, sub, key, value in entries if section == "url" and sub and key == "insteadof"]
+    remotes: dict[str, str] = {}
+    resolved: str | None = None
+    for section, sub, key, value in entries:
+        if section != "remote" or not sub:
+            continue
+        if key == "url" and sub not in remotes:
+            remotes[sub] = value
+        elif key == "gh-resolved" and value == "base":  # set by `gh repo set-default`
+            resolved = sub
+
+    repos = {}
+    for name, url in remotes.items():
+        repo = github_repo_from_url(_apply_instead_of(url, rewrites), host)
+        if repo:
+            repos[name] = repo
+    if resolved in repos:
+        return repos[resolved]
+    if len(set(repos.values())) == 1:
+        return next(iter(repos.values()))
+    return None  # no GitHub remote, or several pointing at different repos
+
+
+def detect_repo_local(start: str | Path | None = None) -> str | None:
+    """Return OWNER/REPO from local git config, or ``None`` if it's ambiguous."""
+    config = find_git_config(Path(start or os.getcwd()).resolve())
+    if config is None or not config.is_file():
+        return None
+    host = os.environ.get("GH_HOST", "github.com")
+    mtimes = (_mtime(config), *(_mtime(p) for p in _global_configs()))
+    return _resolve(str(config), mtimes, host)
@@ -0,0 +1,188 @@
+"""Batched GraphQL fetches of Dependabot alerts across many repositories.
+
+The REST API needs at least one request per repo. GraphQL can alias many
+``repository { vulnerabilityAlerts }`` connections into one query, each with
+its own cursor. Repos drop out of the batch as their alerts run out and the
+next repos in line take their place. Nodes are converted to the REST payload
+shape, so records, tables and JSON output treat them like any other alert.
+
+Every query is priced with GitHub's cost formula before it is sent. A
+``budget`` caps the total points one crawl may spend.
+"""
+
+import json
+import math
+from collections.abc import Callable, Iterator
+
+from ghsec import trace
+from ghsec.api import APIError, _decode, gh_request
+
+PAGE_SIZE = 100
+BATCH_SIZE = 50
+NODE_LIMIT = 500_000  # GitHub rejects queries that could return more nodes
+
+_STATES = {
+    "open": ["OPEN"],
+    "dismissed": ["DISMISSED", "AUTO_DISMISSED"],
+    "fixed": ["FIXED"],
+}
+
+_ALERT_FIELDS = """
+        number state createdAt dismissedAt fixedAt autoDismissedAt dismissReason dismissComment
+        vulnerableManifestPath
+        securityAdvisory { ghsaId summary severity }
+        securityVulnerability {
+          severity vulnerableVersionRange firstPatchedVersion { identifier }
+          package { ecosystem name }
+        }"""
+
+
+def estimate_cost(connections: int, page_size: int = PAGE_SIZE) -> int:
+    """Rate-limit points for a query with ``connections`` alert connections.
+
+    GitHub adds up the requests needed to fill each connection (one per
+    ``page_size`` nodes), divides by 100 and rounds, with a minimum of 1.
+    """
+    requests = connections * math.ceil(page_size / 100)
+    return max(1, round(requests / 100))
+
+
+def _literal(value: str) -> str:
+    return json.dumps(value)  # a JSON string is a valid GraphQL string literal
+
+
+def build_query(cursors: dict[str, str | None], states: list[str] | None, page_size: int = PAGE_SIZE) -> str:
+    """One query with an aliased ``repository`` block per OWNER/REPO in ``cursors``."""
+    args = f"first: {page_size}"
+    if states:
+        args += f", states: [{', '.join(states)}]"
+    blocks = []
+    for i, (repo, cursor) in enumerate(cursors.items()):
+        owner, _, name = repo.partition("/")
+        after = f", after: {_literal(cursor)}" if cursor else ""
+        blocks.append(
+            f"  r{i}: repository(owner: {_literal(owner)}, name: {_literal(name)}) {{\n"
+            f"    vulnerabilityAlerts({args}{after}) {{\n"
+            f"      pageInfo {{ hasNextPage endCursor }}\n"
+            f"      nodes {{{_ALERT_FIELDS}\n      }}\n"
+            f"    }}\n  }}"
+        )
+    return "query {\n  rateLimit { cost remaining resetAt }\n" + "\n".join(blocks) + "\n}"
+
+
+def _lower(value: str | None) -> str | None:
+    return value.lower() if value else value
+
+
+def _severity(value: str | None) -> str | None:
+    """GraphQL says MODERATE where REST says medium."""
+    value = _lower(value)
+    return "medium" if value == "moderate" else value
+
+
+def to_rest_alert(node: dict, repo: str) -> dict:
+    """Reshape a ``RepositoryVulnerabilityAlert`` node like a REST Dependabot alert."""
+    advisory = node.get("securityAdvisory") or {}
+    vuln = node.get("securityVulnerability") or {}
+    package = vuln.get("package") or {}
+    package = {"ecosystem": _lower(package.get("ecosystem")) or "", "name": package.get("name") or ""}
+    changed = [node.get(k) for k in ("createdAt", "dismissedAt", "fixedAt", "autoDismissedAt")]
+    number = node.get("number")
+    return {
+        "number": number,
+        "state": _lower(node.get("state")) or "",
+        "created_at": node.get("createdAt"),
+        "updated_at": max(t for t in changed if t) if any(changed) else None,
+        "dismissed_at": node.get("dismissedAt"),
+        "fixed_at": node.get("fixedAt"),
+        "auto_dismissed_at": node.get("autoDismissedAt"),
+        "dismissed_reason": node.get("dismissReason"),
+        "dismissed_comment": node.get("dismissComment"),
+        "html_url": f"https://github.com/{repo}/security/dependabot/{number}",
+        "dependency": {"package": package, "manifest_path": node.get("vulnerableManifestPath")},
+        "security_advisory": {
+            "ghsa_id": advisory.get("ghsaId"),
+            "summary": advisory.get("summary"),
+            "severity": _severity(advisory.get("severity")),
+        },
+        "security_vulnerability": {
+            "package": package,
+            "severity": _severity(vuln.get("severity")),
+            "vulnerable_version_range": vuln.get("vulnerableVersionRange"),
+            "first_patched_version": vuln.get("firstPatchedVersion"),
+        },
+        "repository": {"full_name": repo},
+    }
+
+
+def _raise(repo: str, message: str) -> None:
+    raise APIError(f"{repo}: {message}")
+
+
+def iter_dependabot_pages(
+    repos: list[str],
+    state: str | None = None,
+    severity: str | None = None,
+    batch_size: int = BATCH_SIZE,
+    page_size: int = PAGE_SIZE,
+    budget: int | None = None,
+    on_error: Callable[[str, str], None] = _raise,
+) -> Iterator[list]:
+    """Yield the alerts from each batched query as one page.
+
+    Each alert carries ``repository.full_name``. A repo GraphQL can't read
+    (missing, or Dependabot alerts unavailable) is passed to
+    ``on_error(repo, message)``, which raises ``APIError`` by default.
+    Raises ``APIError`` before sending a query that would exceed ``budget``.
+    """
+    states = _STATES.get(state) if state else None
+    batch_size = max(1, min(batch_size, NODE_LIMIT // page_size))
+    pending = list(dict.fromkeys(repos))
+    pending.reverse()  # pop() from the end keeps the input order
+    cursors: dict[str, str | None] = {}
+    spent = 0
+    while pending or cursors:
+        while pending and len(cursors) < batch_size:
+            cursors[pending.pop()] = None
+        cost = estimate_cost(len(cursors), page_size)
+        if budget is not None and spent + cost > budget:
+            raise APIError(f"GraphQL cost budget of {budget} points spent ({len(cursors) + len(pending)} repos left)")
+        query = build_query(cursors, states, page_size)
+        with trace.span("graphql batch", "api", repos=len(cursors)):
+            data = _decode(gh_request("graphql", method="POST", fields={"query": query}))
+        result = data.get("data") or {}
+        errors = {}
+        for error in data.get("errors") or []:
+            path = error.get("path") or []
+            errors[path[0] if path else None] = error.get("message", "GraphQL error")
+        if not result and errors:
+            raise APIError("; ".join(errors.values()))
+        rate = result.get("rateLimit") or {}
+        spent += rate.get("cost") or cost
+        if rate.get("remaining") is not None:
+            trace.gauge("graphql.remaining", rate["remaining"])
+
+        page = []
+        for i, repo in enumerate(list(cursors)):
+            alias = f"r{i}"
+            alerts = (result.get(alias) or {}).get("vulnerabilityAlerts")
+            if alerts is None:
+                del cursors[repo]
+                on_error(repo, errors.get(alias, "repository not found or Dependabot alerts unavailable"))
+                continue
+            for node in alerts.get("nodes") or []:
+                alert = to_rest_alert(node, repo)
+                if severity is None or alert["security_vulnerability"]["severity"] == severity:
+                    page.append(alert)
+            info = alerts.get("pageInfo") or {}
+            if info.get("hasNextPage") and info.get("endCursor"):
+                cursors[repo] = info["endCursor"]
+            else:
+                del cursors[repo]
+        yield page
+
+
+@trace.traced("api")
+def list_dependabot_alerts(repos: list[str], state: str | None = None, severity: str | None = None, **kwargs) -> list:
+    """Fetch every repo's Dependabot alerts with batched GraphQL queries."""
+    return [alert for page in iter_dependabot_pages(repos, state, severity, **kwargs) for alert in page]
@@ -0,0 +1,94 @@
+"""Decode a JSON array item by item from a stream of byte chunks.
+
+List endpoints answer with one top-level array. ``iter_array`` hands out each
+element as soon as its closing bracket has arrived, keeping only the text of
+the element being decoded. The bytes of a page are never joined, and neither
+the page text nor the whole decoded list is ever held. Elements are parsed with
+the stdlib decoder (its C scanner when available), so each one comes out
+exactly as ``json.loads`` would produce it.
+"""
+
+import codecs
+import json
+import re
+from collections.abc import Iterable, Iterator
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_DELIMITERS = ",] \t\n\r"
+
+
+def iter_array(chunks: Iterable[bytes]) -> Iterator:
+    """Yield the elements of the UTF-8 JSON array spread over ``chunks``.
+
+    An empty body yields nothing. Raises ``ValueError`` for malformed JSON
+    or a top-level value that isn't an array.
+    """
+    source = iter(chunks)
+    utf8 = codecs.getincrementaldecoder("utf-8")()
+    buf = ""
+    pos = 0
+    done = False
+
+    def more() -> bool:
+        """Append the next chunk to the unread text; False once the stream has ended."""
+        nonlocal buf, pos, done
+        if done:
+            return False
+        chunk = next(source, None)
+        if chunk is None:
+            done = True
+            text = utf8.decode(b"", final=True)
+        else:
+            text = utf8.decode(chunk)
+        buf = buf[pos:] + text
+        pos = 0
+        return True
+
+    def skip_whitespace() -> str:
+        """Advance past whitespace and return the next character ("" at the end)."""
+        nonlocal pos
+        while True:
+            pos = _WHITESPACE.match(buf, pos).end()
+            if pos < len(buf):
+                return buf[pos]
+            if not more():
+                return ""
+
+    first = skip_whitespace()
+    if not first:
+        return
+    if first != "[":
+        raise ValueError("expected a JSON array")
+    pos += 1
+    need_item, may_close = True, True
+    while True:
+        char = skip_whitespace()
+        if not char:
+            raise ValueError("unterminated JSON array")
+        if char == "]":
+            if may_close:
+                return
+            raise ValueError(f"trailing comma in JSON array before offset {pos}")
+        if not need_item:
+            if char != ",":
+                raise ValueError(f"expected ',' or ']' in JSON array, got {char!r}")
+            pos += 1
+            need_item, may_close = True, False
+            continue
+        while True:
+            try:
+                item, end = _decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                if more():
+                    continue  # the element runs past what has arrived so far
+                raise
+            # raw_decode stops a number at "2" in "2." or "-3e", so a scalar only
+            # counts once a delimiter follows it; until then the next chunk may extend it.
+            if not isinstance(item, (dict, list, str)) and (end == len(buf) or buf[end] not in _DELIMITERS):
+                if more():
+                    continue
+            break
+        pos = end
+        need_item, may_close = False, True
+        yield item
@@ -0,0 +1,361 @@
+"""``--where`` expressions over alert records.
+
+A query is a boolean expression of comparisons::
+
+    rule=py/sql-injection and path~src/api/*
+    (package=lodash or package=minimist) and not state=dismissed
+    severity>=high and age>30d
+
+Fields are the ``AlertRecord`` attributes (repo, type, number, state,
+severity, rule, path, package, ecosystem, tool, validity) plus ``age``.
+``=``/``!=`` compare exactly, ``~``/``!~`` match a glob (``*`` also matches
+``/``), and ``<``, ``<=``, ``>``, ``>=`` order numbers, severities
+(low < medium < high < critical) and ages (``90d``, ``12h``, ``2w``; a bare
+number means days). Adjacent comparisons are joined with ``and``; values
+containing spaces or parentheses can be quoted.
+
+Equality and glob terms on indexed fields narrow the candidates through an
+``AlertIndex`` before the full expression runs; for the local store the
+rule, package and path terms are pushed down to SQLite indexes instead.
+"""
+
+import argparse
+import bisect
+import re
+import time
+from collections import defaultdict
+from fnmatch import fnmatchcase
+
+from ghsec.records import AlertRecord
+
+SEVERITY_RANK = {"low": 1, "medium": 2, "moderate": 2, "high": 3, "critical": 4}
+
+STRING_FIELDS = ("repo", "type", "state", "severity", "rule", "path", "package", "ecosystem", "tool", "validity")
+
+# Fields with a column and index in the alert store (see ghsec.store).
+SQL_FIELDS = ("rule", "package", "path")
+
+_DURATION_UNITS = {"h": 3600, "d": 86400, "w": 7 * 86400}
+
+_TOKEN_RE = re.compile(
+    r"""\s*(?:
+        (?P<paren>[()])
+      | (?P<field>[A-Za-z_]+)\s*(?P<op>!=|!~|<=|>=|=|~|<|>)\s*
+        (?P<value>"(?:[^"\\]|\\.)*"|'[^']*'|[^\s()]+)
+      | (?P<word>[A-Za-z]+)
+    )""",
+    re.VERBOSE,
+)
+
+
+class QueryError(ValueError):
+    """Raised for a malformed ``--where`` expression."""
+
+
+def _glob_prefix(pattern: str) -> str:
+    """The literal text before the first wildcard of ``pattern``."""
+    return re.split(r"[*?\[]", pattern, maxsplit=1)[0]
+
+
+def _parse_duration(value: str) -> int:
+    m = re.fullmatch(r"(\d+)([hdw]?)", value)
+    if not m:
+        raise QueryError(f"invalid age '{value}' (use e.g. 30d, 12h or 2w)")
+    return int(m.group(1)) * _DURATION_UNITS[m.group(2) or "d"]
+
+
+class AlertIndex:
+    """Lookup tables over a list of records, each built on first use.
+
+    ``positions`` are indexes into ``records``. String fields get a
+    value -> positions table; paths are kept sorted so a glob's literal
+    prefix is found by bisection.
+    """
+
+    def __init__(self, records: list[AlertRecord]) -> None:
+        self.records = records
+        self._tables: dict[str, dict[str, list[int]]] = {}
+        self._paths: list[tuple[str, int]] | None = None
+
+    def _table(self, field: str) -> dict[str, list[int]]:
+        table = self._tables.get(field)
+        if table is None:
+            table = defaultdict(list)
+            for i, rec in enumerate(self.records):
+                table[getattr(rec, field) or ""].append(i)
+            self._tables[field] = table
+        return table
+
+    def _path_range(self, prefix: str) -> list[tuple[str, int]]:
+        if self._paths is None:
+            self._paths = sorted((rec.path or "", i) for i, rec in enumerate(self.records))
+        lo = bisect.bisect_left(self._paths, (prefix,))
+        hi = lo
+        while hi < len(self._paths) and self._paths[hi][0].startswith(prefix):
+            hi += 1
+        return self._paths[lo:hi]
+
+    def equal(self, field: str, value: str) -> set[int]:
+        if field == "path":
+            return {i for path, i in self._path_range(value) if path == value}
+        return set(self._table(field).get(value, ()))
+
+    def glob(self, field: str, pattern: str) -> set[int]:
+        if field == "path":
+            return {i for path, i in self._path_range(_glob_prefix(pattern)) if fnmatchcase(path, pattern)}
+        return {i for key, ids in self._table(field).items() if fnmatchcase(key, pattern) for i in ids}
+
+
+class _Cmp:
+    def __init__(self, field: str, op: str, value: str) -> None:
+        self.field, self.op, self.value = field, op, value
+        if field == "age":
+            self.attr, self.test = "created_at", self._age_test(op, value)
+        elif field == "number":
+            self.attr, self.test = "number", self._ordered_test(op, self._int(value), lambda v: v)
+        elif field == "severity" and op in ("<", "<=", ">", ">="):
+            if value not in SEVERITY_RANK:
+                raise QueryError(f"unknown severity '{value}'")
+            self.attr = "severity"
+            self.test = self._ordered_test(op, SEVERITY_RANK[value], lambda v: SEVERITY_RANK.get(v or ""))
+        elif field in STRING_FIELDS:
+            self.attr, self.test = field, self._string_test(op, value)
+        else:
+            raise QueryError(f"unknown field '{field}' (known: {', '.join((*STRING_FIELDS, 'number', 'age'))})")
+
+    def _int(self, value: str) -> int:
+        try:
+            return int(value)
+        except ValueError:
+            raise QueryError(f"{self.field} needs a number, got '{value}'") from None
+
+    def _string_test(self, op: str, value: str):
+        if op == "=":
+            return lambda v: (v or "") == value
+        if op == "!=":
+            return lambda v: (v or "") != value
+        if op == "~":
+            return lambda v: fnmatchcase(v or "", value)
+        if op == "!~":
+            return lambda v: not fnmatchcase(v or "", value)
+        raise QueryError(f"{self.field} can't be compared with '{op}'")
+
+    def _ordered_test(self, op: str, bound, key):
+        compare = {
+            "=": lambda k: k == bound,
+            "!=": lambda k: k != bound,
+            "<": lambda k: k < bound,
+            "<=": lambda k: k <= bound,
+            ">": lambda k: k > bound,
+            ">=": lambda k: k >= bound,
+        }.get(op)
+        if compare is None:
+            raise QueryError(f"{self.field} can't be matched with '{op}'")
+        # Alerts without a value (e.g. secrets have no severity) never match.
+        return lambda v: (k := key(v)) is not None and compare(k)
+
+    def _age_test(self, op: str, value: str):
+        # Older than N means created before now - N; ISO-8601 UTC strings sort by time.
+        cutoff = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(time.time() - _parse_duration(value)))
+        tests = {
+            ">": lambda v: bool(v) and v < cutoff,
+            ">=": lambda v: bool(v) and v <= cutoff,
+            "<": lambda v: bool(v) and v > cutoff,
+            "<=": lambda v: bool(v) and v >= cutoff,
+        }
+        if op not in tests:
+            raise QueryError("age only supports <, <=, > and >=")
+        return tests[op]
+
+    def match(self, rec: AlertRecord) -> bool:
+        return self.test(getattr(rec, self.attr))
+
+    def candidates(self, index: AlertIndex) -> set[int] | None:
+        if self.field not in STRING_FIELDS:
+            return None
+        if self.op == "=":
+            return index.equal(self.field, self.value)
+        if self.op == "~":
+            return index.glob(self.field, self.value)
+        return None
+
+    def sql(self) -> list[tuple[str, list]]:
+        if self.field not in SQL_FIELDS:
+            return []
+        if self.op == "=":
+            return [(f"{self.field} = ?", [self.value])]
+        prefix = _glob_prefix(self.value) if self.op == "~" else ""
+        if not prefix:
+            return []
+        upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+        return [(f"{self.field} >= ? AND {self.field} < ?", [prefix, upper])]
+
+
+class _Not:
+    def __init__(self, item) -> None:
+        self.item = item
+
+    def match(self, rec: AlertRecord) -> bool:
+        return not self.item.match(rec)
+
+    def candidates(self, index: AlertIndex) -> set[int] | None:
+        return None
+
+    def sql(self) -> list[tuple[str, list]]:
+        return []
+
+
+class _And:
+    def __init__(self, items: list) -> None:
+        self.items = items
+
+    def match(self, rec: AlertRecord) -> bool:
+        return all(item.match(rec) for item in self.items)
+
+    def candidates(self, index: AlertIndex) -> set[int] | None:
+        result = None
+        for item in self.items:
+            found = item.candidates(index)
+            if found is not None:
+                result = found if result is None else result & found
+        return result
+
+    def sql(self) -> list[tuple[str, list]]:
+        return [term for item in self.items for term in item.sql()]
+
+
+class _Or:
+    def __init__(self, items: list) -> None:
+        self.items = items
+
+    def match(self, rec: AlertRecord) -> bool:
+        return any(item.match(rec) for item in self.items)
+
+    def candidates(self, index: AlertIndex) -> set[int] | None:
+        result: set[int] = set()
+        for item in self.items:
+            found = item.candidates(index)
+            if found is None:
+                return None  # one side needs a full scan anyway
+            result |= found
+        return result
+
+    def sql(self) -> list[tuple[str, list]]:
+        return []
+
+
+def _tokenize(text: str) -> list[tuple[str, ...]]:
+    tokens = []
+    pos = 0
+    text = text.rstrip()
+    while pos < len(text):
+        m = _TOKEN_RE.match(text, pos)
+        if not m or m.end() == pos:
+            raise QueryError(f"can't parse '{text[pos:].strip()}'")
+        if m.group("paren"):
+            tokens.append(("paren", m.group("paren")))
+        elif m.group("field"):
+            value = m.group("value")
+            if value[0] in "\"'":
+                value = re.sub(r"\\(.)", r"\1", value[1:-1]) if value[0] == '"' else value[1:-1]
+            tokens.append(("cmp", m.group("field").lower(), m.group("op"), value))
+        else:
+            word = m.group("word").lower()
+            if word not in ("and", "or", "not"):
+                raise QueryError(f"expected a comparison like field=value, got '{m.group('word')}'")
+            tokens.append(("word", word))
+        pos = m.end()
+    return tokens
+
+
+class _Parser:
+    def __init__(self, text: str) -> None:
+        self.tokens = _tokenize(text)
+        self.pos = 0
+
+    def _peek(self) -> tuple[str, ...] | None:
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def _accept(self, kind: str, value: str) -> bool:
+        tok = self._peek()
+        if tok is not None and tok[0] == kind and tok[1] == value:
+            self.pos += 1
+            return True
+        return False
+
+    def parse(self):
+        if not self.tokens:
+            raise QueryError("empty query")
+        expr = self._or()
+        if self._peek() is not None:
+            raise QueryError(f"unexpected '{self._peek()[1]}'")
+        return expr
+
+    def _or(self):
+        items = [self._and()]
+        while self._accept("word", "or"):
+            items.append(self._and())
+        return items[0] if len(items) == 1 else _Or(items)
+
+    def _and(self):
+        items = [self._unary()]
+        while True:
+            if self._accept("word", "and"):
+                items.append(self._unary())
+            elif (tok := self._peek()) is not None and (tok[0] == "cmp" or tok == ("paren", "(") or tok == ("word", "not")):
+                items.append(self._unary())  # juxtaposition means "and"
+            else:
+                break
+        return items[0] if len(items) == 1 else _And(items)
+
+    def _unary(self):
+        if self._accept("word", "not"):
+            return _Not(self._unary())
+        if self._accept("paren", "("):
+            expr = self._or()
+            if not self._accept("paren", ")"):
+                raise QueryError("missing ')'")
+            return expr
+        tok = self._peek()
+        if tok is None or tok[0] != "cmp":
+            raise QueryError("expected a comparison like field=value" + (f", got '{tok[1]}'" if tok else ""))
+        self.pos += 1
+        return _Cmp(*tok[1:])
+
+
+class Query:
+    """A parsed ``--where`` expression."""
+
+    def __init__(self, text: str) -> None:
+        self.text = text
+        self._expr = _Parser(text).parse()
+
+    def __repr__(self) -> str:
+        return f"Query({self.text!r})"
+
+    def matches(self, rec: AlertRecord) -> bool:
+        return self._expr.match(rec)
+
+    def select(self, index: AlertIndex) -> list[int]:
+        """Positions of the matching records, in their original order."""
+        candidates = self._expr.candidates(index)
+        records = index.records
+        if candidates is None:
+            return [i for i, rec in enumerate(records) if self._expr.match(rec)]
+        return [i for i in sorted(candidates) if self._expr.match(records[i])]
+
+    def sql(self) -> tuple[str, list]:
+        """A SQL condition on the store's indexed columns that every match satisfies.
+
+        Returns ``("", [])`` when no term can be pushed down.
+        """
+        terms = self._expr.sql()
+        return " AND ".join(clause for clause, _ in terms), [p for _, params in terms for p in params]
+
+
+def parse_query(text: str) -> Query:
+    """argparse ``type=`` for ``--where``."""
+    try:
+        return Query(text)
+    except QueryError as e:
+        raise argparse.ArgumentTypeError(f"invalid --where expression: {e}") from None
@@ -0,0 +1,131 @@
+"""Rate-limit-aware scheduling for API requests.
+
+Every request goes through one process-wide ``Scheduler``. It:
+
+- caps requests in flight with an adaptive limit: halved when GitHub
+  throttles us, grown by one after a run of clean responses (AIMD);
+- tracks ``X-RateLimit-Remaining``/``X-RateLimit-Reset`` and holds all new
+  requests until the reset once the budget is spent;
+- retries throttled requests (403/429 with ``Retry-After``, an exhausted
+  budget, or a secondary-rate-limit message), waiting ``Retry-After``
+  when given and otherwise backing off exponentially with full jitter.
+"""
+
+import threading
+import time
+from collections.abc import Callable
+
+from ghsec.transport import Response
+
+MAX_BACKOFF = 60.0
+
+
+def _jitter(upper: float) -> float:
+    import random  # only needed once we're throttled; keeps startup lean
+
+    return random.uniform(0, upper)
+
+
+class Scheduler:
+    """Admission control and retry policy shared by all API calls."""
+
+    def __init__(
+        self,
+        concurrency: int = 8,
+        min_concurrency: int = 1,
+        max_concurrency: int = 32,
+        max_retries: int = 5,
+        base_delay: float = 1.0,
+        sleep: Callable[[float], None] = time.sleep,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.limit = concurrency
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.remaining: int | None = None
+        self.reset_at: float | None = None
+        self.throttled = 0
+        self._sleep = sleep
+        self._clock = clock
+        self._cond = threading.Condition()
+        self._active = 0
+        self._clean = 0
+        self._paused_until = 0.0
+
+    def _acquire(self) -> None:
+        with self._cond:
+            while True:
+                wait = self._paused_until - self._clock()
+                if wait <= 0 and self._active < self.limit:
+                    self._active += 1
+                    return
+                if wait > 0:
+                    self._cond.release()
+                    try:
+                        self._sleep(wait)
+                    finally:
+                        self._cond.acquire()
+                else:
+                    self._cond.wait()
+
+    def _release(self) -> None:
+        with self._cond:
+            self._active -= 1
+            self._cond.notify_all()
+
+    def _throttle_delay(self, resp: Response, attempt: int) -> float | None:
+        """Seconds to wait before retrying ``resp``, or ``None`` if it isn't throttled."""
+        if resp.status not in (403, 429):
+            return None
+        retry_after = resp.headers.get("retry-after")
+        if retry_after and retry_after.isdigit():
+            return float(retry_after) + _jitter(1)
+        if resp.headers.get("x-ratelimit-remaining") == "0" and self.reset_at is not None:
+            return max(0.0, self.reset_at - self._clock()) + _jitter(1)
+        if resp.status == 429 or b"rate limit" in resp.body.lower():
+            return _jitter(min(MAX_BACKOFF, self.base_delay * 2 ** attempt))
+        return None  # an ordinary permission error
+
+    def _observe(self, resp: Response) -> None:
+        remaining = resp.headers.get("x-ratelimit-remaining")
+        reset = resp.headers.get("x-ratelimit-reset")
+        with self._cond:
+            if remaining is not None and remaining.isdigit():
+                self.remaining = int(remaining)
+            if reset is not None and reset.isdigit():
+                self.reset_at = float(reset)
+            if self.remaining == 0 and self.reset_at is not None:
+                self._paused_until = max(self._paused_until, self.reset_at)
+
+    def _on_throttled(self, delay: float) -> None:
+        with self._cond:
+            self.throttled += 1
+            self._clean = 0
+            self.limit = max(self.min_concurrency, self.limit // 2)
+            self._paused_until = max(self._paused_until, self._clock() + delay)
+
+    def _on_success(self) -> None:
+        with self._cond:
+            self._clean += 1
+            if self._clean >= self.limit and self.limit < self.max_concurrency:
+                self.limit += 1
+                self._clean = 0
+                self._cond.notify_all()
+
+    def run(self, send: Callable[[], Response]) -> Response:
+        """Send a request via ``send()`` once admitted, retrying while throttled."""
+        for attempt in range(self.max_retries + 1):
+            self._acquire()
+            try:
+                resp = send()
+            finally:
+                self._release()
+            self._observe(resp)
+            delay = self._throttle_delay(resp, attempt)
+            if delay is None:
+                self._on_success()
+                return resp
+            self._on_throttled(delay)
+        return resp
@@ -0,0 +1,139 @@
+"""Compact, normalized alert records.
+
+The three alert APIs put the same facts (severity, a description, where the
+problem is) in different places of a deeply nested payload. ``AlertRecord``
+pulls them out once per alert into a fixed set of slots, so tables and
+filters read plain attributes instead of walking raw dicts per row, and the
+raw payload can be dropped once it has been converted. Strings that repeat
+across alerts (repo, state, severity, rule, package, tool...) are interned.
+"""
+
+import sys
+from collections.abc import Iterable
+
+_intern = sys.intern
+
+
+def extract_severity(alert: dict, alert_type: str) -> str | None:
+    """Pull severity from the type-specific location in the alert JSON."""
+    if alert_type == "code":
+        rule = alert.get("rule", {})
+        return rule.get("security_severity_level") or rule.get("severity")
+    if alert_type == "dep":
+        vuln = (alert.get("security_vulnerability") or alert.get("security_advisory", {}))
+        return vuln.get("severity")
+    return None  # secret scanning has no severity
+
+
+def extract_description(alert: dict, alert_type: str) -> str:
+    """Pull a short description from the alert."""
+    if alert_type == "code":
+        rule = alert.get("rule", {})
+        return rule.get("description", rule.get("id", ""))
+    if alert_type == "dep":
+        adv = alert.get("security_advisory", {})
+        return adv.get("summary", alert.get("dependency", {}).get("package", {}).get("name", ""))
+    if alert_type == "secret":
+        return alert.get("secret_type_display_name", alert.get("secret_type", ""))
+    return ""
+
+
+def _rule(alert: dict, alert_type: str) -> str:
+    """Rule ID, advisory GHSA ID or secret type: what produced the alert."""
+    if alert_type == "code":
+        return (alert.get("rule") or {}).get("id", "")
+    if alert_type == "dep":
+        return (alert.get("security_advisory") or {}).get("ghsa_id", "")
+    return alert.get("secret_type", "")
+
+
+def _package(alert: dict) -> dict:
+    """The ``{ecosystem, name}`` package of a Dependabot alert."""
+    return (alert.get("security_vulnerability") or alert.get("dependency") or {}).get("package") or {}
+
+
+class AlertRecord:
+    """One alert reduced to the fields ghsec displays and filters on."""
+
+    __slots__ = (
+        "repo", "type", "number", "state", "severity", "description", "rule",
+        "path", "package", "ecosystem", "tool", "validity", "created_at", "updated_at",
+    )
+
+    def __init__(
+        self,
+        repo: str,
+        type: str,
+        number: int,
+        state: str,
+        severity: str | None,
+        description: str,
+        rule: str = "",
+        path: str = "",
+        package: str = "",
+        ecosystem: str = "",
+        tool: str = "",
+        validity: str = "",
+        created_at: str = "",
+        updated_at: str = "",
+    ) -> None:
+        self.repo = _intern(repo)
+        self.type = _intern(type)
+        self.number = number
+        self.state = _intern(state)
+        self.severity = _intern(severity) if severity else None
+        self.description = _intern(description)
+        self.rule = _intern(rule)
+        self.path = path
+        self.package = _intern(package)
+        self.ecosystem = _intern(ecosystem)
+        self.tool = _intern(tool)
+        self.validity = _intern(validity)
+        self.created_at = created_at
+        self.updated_at = updated_at
+
+    @classmethod
+    def from_api(cls, alert: dict, alert_type: str, repo: str = "") -> "AlertRecord":
+        """Build a record from a raw API payload.
+
+        ``repo`` is used when the payload doesn't name its repository
+        (repo-level endpoints); org-level alerts carry ``repository.full_name``.
+        """
+        pkg = _package(alert) if alert_type == "dep" else {}
+        return cls(
+            repo=(alert.get("repository") or {}).get("full_name") or repo,
+            type=alert_type,
+            number=alert.get("number", 0),
+            state=alert.get("state") or "",
+            severity=extract_severity(alert, alert_type),
+            description=extract_description(alert, alert_type) or "",
+            rule=_rule(alert, alert_type) or "",
+            path=((alert.get("most_recent_instance") or {}).get("location") or {}).get("path") or "",
+            package=pkg.get("name") or "",
+            ecosystem=pkg.get("ecosystem") or "",
+            tool=(alert.get("tool") or {}).get("name") or "",
+            validity=alert.get("validity") or "",
+            created_at=alert.get("created_at") or "",
+            updated_at=alert.get("updated_at") or "",
+        )
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "AlertRecord":
+        """Inverse of ``to_dict``; unknown keys are ignored."""
+        return cls(**{k: v for k, v in data.items() if k in cls.__slots__})
+
+    def to_dict(self) -> dict:
+        return {f: getattr(self, f) for f in self.__slots__}
+
+    def __repr__(self) -> str:
+        return f"AlertRecord({self.repo!r}, {self.type!r}, #{self.number}, {self.state!r})"
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, AlertRecord):
+            return NotImplemented
+        return all(getattr(self, f) == getattr(other, f) for f in self.__slots__)
+
+
+def to_records(alerts: Iterable[dict | AlertRecord], alert_type: str, repo: str = "") -> list[AlertRecord]:
+    """Normalize raw alerts (records pass through unchanged)."""
+    return [a if isinstance(a, AlertRecord) else AlertRecord.from_api(a, alert_type, repo) for a in alerts]
@@ -0,0 +1,198 @@
+"""Record API responses to a cassette file and replay them offline.
+
+A cassette is JSON: a list of interactions (method, endpoint, fields ->
+status, headers, body). Replays are matched on method, path and fields;
+repeated requests replay their recordings in order. ``Faults`` layers
+latency, injected errors and a rate-limit budget over a replay (or the fake
+server in ``ghsec.fakegithub``) to show how ghsec behaves under load:
+
+    GHSEC_RECORD=crawl.json ghsec list --org acme          # record real responses
+    GHSEC_REPLAY=crawl.json GHSEC_REPLAY_LATENCY=0.2 ghsec list --org acme
+"""
+
+import atexit
+import json
+import math
+import os
+import random
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from ghsec.transport import Response
+
+CASSETTE_VERSION = 1
+
+_ERROR_MESSAGES = {
+    403: "API rate limit exceeded",
+    429: "You have exceeded a secondary rate limit",
+}
+
+
+def _normalize(endpoint: str) -> str:
+    """Path and query of ``endpoint``, whether relative or an absolute Link URL."""
+    if "://" in endpoint:
+        parts = urlsplit(endpoint)
+        path = parts.path
+        if path.startswith("/api/v3/"):  # GitHub Enterprise Server prefix
+            path = path[len("/api/v3"):]
+        return f"{path}?{parts.query}" if parts.query else path
+    return endpoint if endpoint.startswith("/") else f"/{endpoint}"
+
+
+def _key(method: str, endpoint: str, fields: dict | None) -> tuple[str, str, str]:
+    return method.upper(), _normalize(endpoint), json.dumps(fields or {}, sort_keys=True)
+
+
+class Faults:
+    """Per-request latency, random errors and a primary rate-limit budget.
+
+    ``errors`` maps a status code to the fraction of requests that fail with
+    it (429s carry ``Retry-After: 1``). With ``rate_limit`` set, every
+    response carries ``X-RateLimit-*`` headers, and once the budget is spent
+    requests get a 403 until the window of ``reset_after`` seconds ends.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        errors: dict[int, float] | None = None,
+        rate_limit: int | None = None,
+        reset_after: float = 60.0,
+        seed: int | None = None,
+        sleep: Callable[[float], None] = time.sleep,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.latency = latency
+        self.jitter = jitter
+        self.errors = errors or {}
+        self.rate_limit = rate_limit
+        self.reset_after = reset_after
+        self._random = random.Random(seed)
+        self._sleep = sleep
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._used = 0
+        self._reset_at: float | None = None
+
+    def _budget(self) -> tuple[int, int]:
+        """Take one request from the budget; return (remaining, reset epoch)."""
+        with self._lock:
+            now = self._clock()
+            if self._reset_at is None or now >= self._reset_at:
+                self._reset_at = now + self.reset_after
+                self._used = 0
+            self._used += 1
+            return self.rate_limit - self._used, math.ceil(self._reset_at)
+
+    def apply(self, respond: Callable[[], Response]) -> Response:
+        """Delay, then return an injected failure or ``respond()`` with rate-limit headers."""
+        delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay:
+            self._sleep(delay)
+        headers = {}
+        if self.rate_limit is not None:
+            remaining, reset = self._budget()
+            headers = {
+                "x-ratelimit-limit": str(self.rate_limit),
+                "x-ratelimit-remaining": str(max(remaining, 0)),
+                "x-ratelimit-reset": str(reset),
+            }
+            if remaining < 0:
+                return Response(403, headers, json.dumps({"message": _ERROR_MESSAGES[403]}).encode())
+        with self._lock:
+            roll = self._random.random()
+        for status, rate in self.errors.items():
+            if roll < rate:
+                if status == 429:
+                    headers["retry-after"] = "1"
+                message = _ERROR_MESSAGES.get(status, "Server Error")
+                return Response(status, headers, json.dumps({"message": message}).encode())
+            roll -= rate
+        resp = respond()
+        return Response(resp.status, {**resp.headers, **headers}, resp.body)
+
+
+class RecordingTransport:
+    """Pass requests through to ``inner`` and save every exchange to ``path``.
+
+    The cassette is written when ``save()`` or ``close()`` is called, and at exit.
+    """
+
+    def __init__(self, inner, path: str | Path) -> None:
+        self.inner = inner
+        self.path = Path(path)
+        self.interactions: list[dict] = []
+        self._lock = threading.Lock()
+        atexit.register(self.save)
+
+    def request(self, method: str, endpoint: str, fields=None, headers=None, include: bool = False) -> Response:
+        resp = self.inner.request(method, endpoint, fields=fields, headers=headers, include=include)
+        entry = {
+            "method": method.upper(),
+            "endpoint": _normalize(endpoint),
+            "fields": fields or {},
+            "status": resp.status,
+            "headers": resp.headers,
+            "body": resp.body.decode(errors="replace"),
+        }
+        with self._lock:
+            self.interactions.append(entry)
+        return resp
+
+    def save(self) -> None:
+        with self._lock:
+            data = {"version": CASSETTE_VERSION, "interactions": list(self.interactions)}
+        # Cassettes hold whole responses, secret scanning secrets included: keep them 0600.
+        fd = os.open(self.path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        os.fchmod(fd, 0o600)  # tighten a cassette written by an older version
+        with os.fdopen(fd, "w") as f:
+            f.write(json.dumps(data, indent=1))
+
+    def close(self) -> None:
+        self.save()
+        atexit.unregister(self.save)
+        if hasattr(self.inner, "close"):
+            self.inner.close()
+
+
+class ReplayTransport:
+    """Answer requests from a cassette, optionally through ``Faults``.
+
+    Unrecorded requests get a 404. When a request was recorded several times
+    the recordings are replayed in order, and the last one repeats.
+    """
+
+    def __init__(self, path: str | Path, faults: Faults | None = None) -> None:
+        data = json.loads(Path(path).read_text())
+        if not isinstance(data, dict) or data.get("version") != CASSETTE_VERSION:
+            raise ValueError(f"{path} is not a ghsec cassette")
+        self.faults = faults
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._tapes: dict[tuple[str, str, str], list[Response]] = {}
+        self._played: dict[tuple[str, str, str], int] = {}
+        for entry in data["interactions"]:
+            key = _key(entry["method"], entry["endpoint"], entry["fields"])
+            resp = Response(entry["status"], entry["headers"], entry["body"].encode())
+            self._tapes.setdefault(key, []).append(resp)
+
+    def _lookup(self, key: tuple[str, str, str]) -> Response:
+        tape = self._tapes.get(key)
+        if not tape:
+            return Response(404, {}, json.dumps({"message": f"Not recorded: {key[0]} {key[1]}"}).encode())
+        with self._lock:
+            played = self._played.get(key, 0)
+            self._played[key] = played + 1
+        return tape[min(played, len(tape) - 1)]
+
+    def request(self, method: str, endpoint: str, fields=None, headers=None, include: bool = False) -> Response:
+        with self._lock:
+            self.requests += 1
+        key = _key(method, endpoint, fields)
+        if self.faults is None:
+            return self._lookup(key)
+        return self.faults.apply(lambda: self._lookup(key))
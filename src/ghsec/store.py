@@ -0,0 +1,182 @@
+"""Local SQLite store of alerts kept up to date by ``ghsec sync``.
+
+Unlike the response cache, the store is the merged state of every alert
+seen so far, plus a per-repo, per-type high-water mark (the newest
+``updated_at`` already merged). A sync requests alerts newest-updated first
+and stops paging once it reaches alerts older than the mark.
+"""
+
+import json
+import threading
+import time
+from collections.abc import Iterator
+from pathlib import Path
+
+from ghsec.api import iter_alert_pages
+from ghsec.cache import connect_private
+from ghsec.query import Query
+from ghsec.records import AlertRecord
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS alerts (
+    repo TEXT NOT NULL,
+    type TEXT NOT NULL,
+    number INTEGER NOT NULL,
+    state TEXT,
+    updated_at TEXT,
+    data TEXT NOT NULL,
+    rule TEXT,
+    package TEXT,
+    path TEXT,
+    PRIMARY KEY (repo, type, number)
+);
+CREATE TABLE IF NOT EXISTS sync_state (
+    repo TEXT NOT NULL,
+    type TEXT NOT NULL,
+    high_water TEXT,
+    synced_at REAL NOT NULL,
+    PRIMARY KEY (repo, type)
+);
+"""
+
+# Created after the column migration so older stores get them too.
+_INDEXES = """
+CREATE INDEX IF NOT EXISTS alerts_rule ON alerts (repo, type, rule);
+CREATE INDEX IF NOT EXISTS alerts_package ON alerts (repo, type, package);
+CREATE INDEX IF NOT EXISTS alerts_path ON alerts (repo, type, path);
+"""
+
+_INDEXED = ("rule", "package", "path")
+
+
+def _indexed_values(repo: str, alert_type: str, alert: dict) -> tuple[str, str, str]:
+    rec = AlertRecord.from_api(alert, alert_type, repo)
+    return rec.rule, rec.package, rec.path
+
+
+class AlertStore:
+    """Thread-safe handle on the alert store database."""
+
+    def __init__(self, path: str | Path | None = None) -> None:
+        self._lock = threading.Lock()
+        self._conn = connect_private(path, "store.db")
+        self._conn.executescript(_SCHEMA)
+        self._migrate()
+        self._conn.executescript(_INDEXES)
+
+    def _migrate(self) -> None:
+        """Add and backfill the indexed columns in stores written before they existed."""
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(alerts)")}
+        missing = [c for c in _INDEXED if c not in columns]
+        if not missing:
+            return
+        self._conn.execute("BEGIN")
+        for column in missing:
+            self._conn.execute(f"ALTER TABLE alerts ADD COLUMN {column} TEXT")
+        rows = self._conn.execute("SELECT repo, type, number, data FROM alerts").fetchall()
+        self._conn.executemany(
+            "UPDATE alerts SET rule = ?, package = ?, path = ? WHERE repo = ? AND type = ? AND number = ?",
+            [(*_indexed_values(repo, t, json.loads(data)), repo, t, n) for repo, t, n, data in rows],
+        )
+        self._conn.execute("COMMIT")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def high_water(self, repo: str, alert_type: str) -> str | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT high_water FROM sync_state WHERE repo = ? AND type = ?", (repo, alert_type)
+            ).fetchone()
+        return row[0] if row else None
+
+    def upsert(self, repo: str, alert_type: str, alerts: list[dict]) -> None:
+        rows = [
+            (repo, alert_type, a["number"], a.get("state"), a.get("updated_at"), json.dumps(a),
+             *_indexed_values(repo, alert_type, a))
+            for a in alerts
+        ]
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO alerts (repo, type, number, state, updated_at, data, rule, package, path)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    rows,
+                )
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def set_high_water(self, repo: str, alert_type: str, high_water: str | None) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sync_state VALUES (?, ?, ?, ?)", (repo, alert_type, high_water, time.time())
+            )
+
+    def alerts(self, repo: str, alert_type: str) -> Iterator[dict]:
+        """Yield stored alerts of one type, highest number first."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT data FROM alerts WHERE repo = ? AND type = ? ORDER BY number DESC", (repo, alert_type)
+            ).fetchall()
+        for (data,) in rows:
+            yield json.loads(data)
+
+    def query(self, repo: str, alert_type: str, where: Query | None = None) -> list[dict]:
+        """Stored alerts of one type matching ``where``, highest number first.
+
+        Rule, package and path terms are answered from the SQLite indexes, so
+        only candidate rows are decoded before the full expression is checked.
+        """
+        sql, params = where.sql() if where is not None else ("", [])
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT data FROM alerts WHERE repo = ? AND type = ?" + (f" AND {sql}" if sql else "")
+                + " ORDER BY number DESC",
+                (repo, alert_type, *params),
+            ).fetchall()
+        alerts = [json.loads(data) for (data,) in rows]
+        if where is None:
+            return alerts
+        return [a for a in alerts if where.matches(AlertRecord.from_api(a, alert_type, repo))]
+
+    def count(self, repo: str, alert_type: str) -> int:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM alerts WHERE repo = ? AND type = ?", (repo, alert_type)
+            ).fetchone()[0]
+
+
+def sync_alerts(store: AlertStore, repo: str, alert_type: str) -> dict:
+    """Fetch alerts changed since the last sync and merge them into ``store``.
+
+    Returns a summary dict: type, changed, pages (requests made) and total.
+    """
+    mark = store.high_water(repo, alert_type)
+    newest = mark
+    changed = pages = 0
+    # No prefetch: the first page is usually the last one we need.
+    for page in iter_alert_pages(repo, alert_type, sort="updated", prefetch=False):
+        pages += 1
+        fresh = []
+        for alert in page:
+            updated = alert.get("updated_at") or ""
+            # ISO-8601 UTC timestamps compare correctly as strings. Alerts at the
+            # mark itself are re-merged in case several share that timestamp.
+            if mark and updated < mark:
+                break
+            fresh.append(alert)
+            if not mark or updated > mark:
+                changed += 1
+            if newest is None or updated > newest:
+                newest = updated
+        store.upsert(repo, alert_type, fresh)
+        if len(fresh) < len(page):
+            break
+    # Only advance the mark once every page above it has been merged, so an
+    # interrupted sync is retried from the old mark.
+    store.set_high_water(repo, alert_type, newest)
+    return {"type": alert_type, "changed": changed, "pages": pages, "total": store.count(repo, alert_type)}
@@ -0,0 +1,157 @@
+"""Synthetic alert payloads shaped like the GitHub REST API's.
+
+Each alert is derived from its number alone, so any page of any size can be
+generated on demand without holding the whole set in memory. Used by the
+fake server in ``ghsec.fakegithub`` and the benchmarks in ``bench/``.
+"""
+
+import random
+from collections.abc import Iterator
+
+_RULES = [
+    ("py/sql-injection", "SQL query built from user-controlled sources", "error", "high"),
+    ("py/path-injection", "Uncontrolled data used in path expression", "error", "high"),
+    ("js/xss", "Client-side cross-site scripting", "error", "critical"),
+    ("js/unused-local-variable", "Unused variable, import, function or class", "note", None),
+    ("java/weak-cryptographic-algorithm", "Use of a broken or risky cryptographic algorithm", "warning", "medium"),
+    ("go/log-injection", "Log entries created from user input", "error", "medium"),
+]
+_PACKAGES = [
+    ("npm", "lodash"), ("npm", "minimist"), ("npm", "axios"), ("pip", "requests"), ("pip", "urllib3"),
+    ("pip", "jinja2"), ("maven", "org.apache.logging.log4j:log4j-core"), ("go", "golang.org/x/net"),
+]
+_SECRETS = [
+    ("github_personal_access_token", "GitHub Personal Access Token"),
+    ("aws_access_key_id", "Amazon AWS Access Key ID"),
+    ("slack_incoming_webhook_url", "Slack Incoming Webhook URL"),
+    ("stripe_api_key", "Stripe API Key"),
+]
+_STATES = {
+    "code": ["open"] * 6 + ["dismissed", "fixed"],
+    "dep": ["open"] * 6 + ["dismissed", "fixed", "auto_dismissed"],
+    "secret": ["open"] * 6 + ["resolved"],
+}
+_DIRS = ["src/api", "src/web", "src/core/db", "lib", "cmd/server", "internal/auth", "tests"]
+_LOREM = (
+    "An attacker who controls this input can influence the behaviour of the affected component. "
+    "Upgrade to a patched release or apply the mitigations listed in the advisory. "
+)
+
+
+def _timestamp(rng: random.Random, number: int) -> tuple[str, str]:
+    # Higher numbers are newer, as on GitHub.
+    day = 1 + number % 28
+    month = 1 + (number // 28) % 12
+    created = f"2024-{month:02d}-{day:02d}T{rng.randrange(24):02d}:{rng.randrange(60):02d}:00Z"
+    updated = f"2025-{month:02d}-{day:02d}T{rng.randrange(24):02d}:{rng.randrange(60):02d}:00Z"
+    return created, updated
+
+
+def _code_alert(repo: str, number: int, rng: random.Random) -> dict:
+    rule_id, description, severity, security = rng.choice(_RULES)
+    path = f"{rng.choice(_DIRS)}/module_{rng.randrange(500)}.py"
+    line = rng.randrange(1, 2000)
+    return {
+        "rule": {
+            "id": rule_id,
+            "severity": severity,
+            "security_severity_level": security,
+            "description": description,
+            "name": rule_id.split("/")[-1],
+            "tags": ["security", f"external/cwe/cwe-{rng.randrange(20, 900):03d}"],
+        },
+        "tool": {"name": "CodeQL", "guid": None, "version": "2.19.3"},
+        "most_recent_instance": {
+            "ref": "refs/heads/main",
+            "analysis_key": ".github/workflows/codeql.yml:analyze",
+            "environment": "{\"language\":\"python\"}",
+            "category": ".github/workflows/codeql.yml:analyze/language:python",
+            "state": "open",
+            "commit_sha": f"{rng.getrandbits(160):040x}",
+            "message": {"text": f"This query depends on a user-provided value at line {line}."},
+            "location": {"path": path, "start_line": line, "end_line": line, "start_column": 5, "end_column": 42},
+            "classifications": [],
+        },
+        "instances_url": f"https://api.github.com/repos/{repo}/code-scanning/alerts/{number}/instances",
+    }
+
+
+def _dep_alert(repo: str, number: int, rng: random.Random) -> dict:
+    ecosystem, name = rng.choice(_PACKAGES)
+    severity = rng.choice(["low", "medium", "high", "critical"])
+    ghsa = "GHSA-" + "-".join(f"{rng.getrandbits(20):04x}"[:4] for _ in range(3))
+    package = {"ecosystem": ecosystem, "name": name}
+    vulnerability = {
+        "package": package,
+        "severity": severity,
+        "vulnerable_version_range": f"< {rng.randrange(1, 5)}.{rng.randrange(20)}.0",
+        "first_patched_version": {"identifier": f"{rng.randrange(1, 5)}.{rng.randrange(20)}.1"},
+    }
+    return {
+        "dependency": {"package": package, "manifest_path": "package-lock.json", "scope": "runtime"},
+        "security_advisory": {
+            "ghsa_id": ghsa,
+            "cve_id": f"CVE-2024-{rng.randrange(10000, 99999)}",
+            "summary": f"{rng.choice(['Prototype pollution', 'ReDoS', 'Request smuggling', 'Path traversal'])} in {name}",
+            "description": _LOREM * rng.randrange(2, 6),
+            "severity": severity,
+            "identifiers": [{"type": "GHSA", "value": ghsa}, {"type": "CVE", "value": f"CVE-2024-{number:05d}"}],
+            "references": [{"url": f"https://github.com/advisories/{ghsa}"}],
+            "published_at": "2024-06-01T00:00:00Z",
+            "updated_at": "2024-06-02T00:00:00Z",
+            "withdrawn_at": None,
+            "vulnerabilities": [vulnerability],
+            "cvss": {"vector_string": "CVSS:3.1/AV:N/AC:L/PR:N/UI:N/S:U/C:H/I:H/A:H", "score": rng.randrange(10, 100) / 10},
+            "cwes": [{"cwe_id": "CWE-1321", "name": "Prototype Pollution"}],
+        },
+        "security_vulnerability": vulnerability,
+    }
+
+
+def _secret_alert(repo: str, number: int, rng: random.Random) -> dict:
+    secret_type, display = rng.choice(_SECRETS)
+    return {
+        "secret_type": secret_type,
+        "secret_type_display_name": display,
+        "secret": f"{rng.getrandbits(128):032x}",
+        "validity": rng.choice(["active", "inactive", "unknown"]),
+        "publicly_leaked": rng.random() < 0.1,
+        "multi_repo": False,
+        "push_protection_bypassed": rng.random() < 0.2,
+        "locations_url": f"https://api.github.com/repos/{repo}/secret-scanning/alerts/{number}/locations",
+    }
+
+
+_BUILDERS = {"code": _code_alert, "dep": _dep_alert, "secret": _secret_alert}
+_PATHS = {"code": "code-scanning", "dep": "dependabot", "secret": "secret-scanning"}
+
+
+def make_alert(alert_type: str, number: int, repo: str = "bench/repo", seed: int = 0) -> dict:
+    """One alert of ``alert_type``; the same arguments always give the same payload."""
+    rng = random.Random(f"{seed}:{alert_type}:{number}")
+    created, updated = _timestamp(rng, number)
+    state = rng.choice(_STATES[alert_type])
+    alert = {
+        "number": number,
+        "created_at": created,
+        "updated_at": updated,
+        "url": f"https://api.github.com/repos/{repo}/{_PATHS[alert_type]}/alerts/{number}",
+        "html_url": f"https://github.com/{repo}/security/{_PATHS[alert_type]}/{number}",
+        "state": state,
+    }
+    if state in ("dismissed", "auto_dismissed"):
+        alert.update(dismissed_at=updated, dismissed_reason="tolerable_risk", dismissed_comment=None)
+    elif state in ("fixed", "resolved"):
+        alert["fixed_at" if state == "fixed" else "resolved_at"] = updated
+    alert.update(_BUILDERS[alert_type](repo, number, rng))
+    return alert
+
+
+def iter_alerts(alert_type: str, count: int, repo: str = "bench/repo", seed: int = 0, start: int = 0) -> Iterator[dict]:
+    """Yield alerts ``count - start`` down to 1, newest first like the list endpoints."""
+    for number in range(count - start, 0, -1):
+        yield make_alert(alert_type, number, repo, seed)
+
+
+def make_alerts(alert_type: str, count: int, repo: str = "bench/repo", seed: int = 0) -> list[dict]:
+    return list(iter_alerts(alert_type, count, repo, seed))
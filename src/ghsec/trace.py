@@ -0,0 +1,204 @@
+"""Lightweight spans for ``--trace`` and ``--timings``.
+
+Code marks phases with ``span(name, category)`` (or the ``traced`` decorator)
+and reports totals with ``count``/``gauge``. Nothing is recorded until
+``enable()`` is called, and a disabled span costs one global lookup.
+
+Traces are written in the Chrome trace event format, which
+https://ui.perfetto.dev and chrome://tracing open directly.
+"""
+
+import functools
+import json
+import sys
+import threading
+import time
+from collections.abc import Callable
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        return None
+
+    def set(self, **args) -> None:
+        return None
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "cat", "args", "start")
+
+    def __init__(self, tracer: "Tracer", name: str, cat: str, args: dict) -> None:
+        self.tracer = tracer
+        self.name = name
+        self.cat = cat
+        self.args = args
+
+    def __enter__(self) -> "_Span":
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+        self.tracer._complete(self, time.perf_counter_ns())
+
+    def set(self, **args) -> None:
+        """Attach results known only once the span's work is done (status, bytes...)."""
+        self.args.update(args)
+
+
+class Tracer:
+    """Collects complete-span ("X"), counter ("C") and thread-name events."""
+
+    def __init__(self) -> None:
+        self.origin = time.perf_counter_ns()
+        self.events: list[dict] = []
+        self.totals: dict[str, int] = {}
+        self.gauges: dict[str, list[int]] = {}
+        self._threads: dict[int, str] = {}
+        self._lock = threading.Lock()
+
+    def _ts(self, ns: int) -> float:
+        return (ns - self.origin) / 1000
+
+    def _complete(self, span: _Span, end: int) -> None:
+        tid = threading.get_ident()
+        event = {
+            "name": span.name, "cat": span.cat, "ph": "X", "pid": 1, "tid": tid,
+            "ts": self._ts(span.start), "dur": (end - span.start) / 1000,
+        }
+        if span.args:
+            event["args"] = span.args
+        with self._lock:
+            if tid not in self._threads:
+                self._threads[tid] = threading.current_thread().name
+            self.events.append(event)
+
+    def span(self, name: str, cat: str, args: dict) -> _Span:
+        return _Span(self, name, cat, args)
+
+    def count(self, name: str, n: int) -> None:
+        with self._lock:
+            self.totals[name] = self.totals.get(name, 0) + n
+
+    def gauge(self, name: str, value: int) -> None:
+        event = {"name": name, "ph": "C", "pid": 1, "ts": self._ts(time.perf_counter_ns()), "args": {"value": value}}
+        with self._lock:
+            self.gauges.setdefault(name, []).append(value)
+            self.events.append(event)
+
+    def chrome_trace(self) -> dict:
+        with self._lock:
+            threads = [
+                {"name": "thread_name", "ph": "M", "pid": 1, "tid": tid, "args": {"name": name}}
+                for tid, name in self._threads.items()
+            ]
+            return {
+                "traceEvents": threads + list(self.events),
+                "displayTimeUnit": "ms",
+                "otherData": {"totals": dict(self.totals)},
+            }
+
+    def summary(self) -> str:
+        """A few lines of per-category time plus request/byte/rate-limit totals."""
+        wall = (time.perf_counter_ns() - self.origin) / 1e9
+        by_cat: dict[str, list[float]] = {}
+        with self._lock:
+            for event in self.events:
+                if event["ph"] == "X":
+                    by_cat.setdefault(event["cat"], []).append(event["dur"] / 1e6)
+        lines = [f"ghsec timings: {wall:.3f} s wall (spans overlap across threads)"]
+        for cat, durations in sorted(by_cat.items(), key=lambda item: -sum(item[1])):
+            lines.append(f"  {cat:<10} {sum(durations):8.3f} s  {len(durations):6d} span{'s' if len(durations) != 1 else ''}")
+        requests = self.totals.get("requests", 0)
+        received = self.totals.get("bytes_in", 0)
+        tail = f"  {requests} request{'s' if requests != 1 else ''}, {_human_bytes(received)} received"
+        remaining = self.gauges.get("ratelimit.remaining")
+        if remaining:
+            tail += f", rate limit {remaining[-1]} remaining (min {min(remaining)})"
+        lines.append(tail)
+        return "\n".join(lines)
+
+
+def _human_bytes(n: int) -> str:
+    if n < 1024:
+        return f"{n} B"
+    if n < 1024 * 1024:
+        return f"{n / 1024:.1f} KB"
+    return f"{n / (1024 * 1024):.1f} MB"
+
+
+_tracer: Tracer | None = None
+
+
+def enable() -> Tracer:
+    """Start recording (process-wide) and return the tracer."""
+    global _tracer
+    _tracer = Tracer()
+    return _tracer
+
+
+def disable() -> None:
+    global _tracer
+    _tracer = None
+
+
+def get_tracer() -> Tracer | None:
+    return _tracer
+
+
+def span(name: str, cat: str, **args) -> "_Span | _NullSpan":
+    """Context manager timing one phase; a no-op while tracing is off."""
+    tracer = _tracer
+    if tracer is None:
+        return _NULL_SPAN
+    return tracer.span(name, cat, args)
+
+
+def traced(cat: str) -> Callable[[Callable], Callable]:
+    """Decorator form of ``span`` named after the function."""
+    def decorate(fn: Callable) -> Callable:
+        name = fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            tracer = _tracer
+            if tracer is None:
+                return fn(*args, **kwargs)
+            with tracer.span(name, cat, {}):
+                return fn(*args, **kwargs)
+
+        return wrapper
+    return decorate
+
+
+def count(name: str, n: int = 1) -> None:
+    """Add ``n`` to a run total (requests, bytes...)."""
+    if _tracer is not None:
+        _tracer.count(name, n)
+
+
+def gauge(name: str, value: int) -> None:
+    """Record a sampled value, shown as a counter track in the trace."""
+    if _tracer is not None:
+        _tracer.gauge(name, value)
+
+
+def write_chrome_trace(path: str) -> None:
+    if _tracer is None:
+        raise RuntimeError("tracing is not enabled")
+    with open(path, "w") as f:
+        json.dump(_tracer.chrome_trace(), f)
+
+
+def print_summary() -> None:
+    if _tracer is not None:
+        print(_tracer.summary(), file=sys.stderr)
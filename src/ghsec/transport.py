@@ -0,0 +1,391 @@
+"""Transports that carry GitHub REST API requests.
+
+Transports share one interface: ``request(method, endpoint, fields=None,
+headers=None, include=False) -> Response``. The built-in ones also offer
+``stream(method, endpoint, fields=None, headers=None)``, which returns a
+``StreamedResponse`` for a 200 and leaves its body to be read chunk by chunk.
+
+- ``HTTPTransport`` talks HTTPS directly, authenticating once and reusing
+  keep-alive connections from a small pool.
+- ``GhCliTransport`` shells out to ``gh api`` per request. It is the fallback
+  when no token can be found.
+
+``ghsec.replay`` adds recording and replaying transports for load tests.
+"""
+
+import json
+import os
+import queue
+import subprocess
+import sys
+from collections.abc import Iterator
+from typing import TYPE_CHECKING
+from urllib.parse import urlencode, urlsplit
+
+from ghsec import __version__, trace
+
+if TYPE_CHECKING:
+    import http.client
+
+DEFAULT_API_URL = "https://api.github.com"
+API_VERSION = "2022-11-28"
+CHUNK_SIZE = 64 * 1024
+
+
+class Response:
+    """Status code, lower-cased headers and raw body of one API response."""
+
+    __slots__ = ("status", "headers", "body")
+
+    def __init__(self, status: int, headers: dict[str, str], body: bytes) -> None:
+        self.status = status
+        self.headers = headers
+        self.body = body
+
+    def json(self) -> dict | list:
+        if not self.body.strip():
+            return {}
+        return json.loads(self.body)
+
+
+class StreamedResponse:
+    """Status and headers of a 200 response whose body hasn't been read yet.
+
+    ``chunks`` yields the body as bytes; iterate it once. The connection (or
+    ``gh`` process) is released when it is used up or closed.
+    """
+
+    __slots__ = ("status", "headers", "chunks")
+
+    def __init__(self, status: int, headers: dict[str, str], chunks: Iterator[bytes]) -> None:
+        self.status = status
+        self.headers = headers
+        self.chunks = chunks
+
+
+def get_token() -> str | None:
+    """Return an API token from GH_TOKEN/GITHUB_TOKEN or ``gh auth token``."""
+    token = os.environ.get("GH_TOKEN") or os.environ.get("GITHUB_TOKEN")
+    if token:
+        return token
+    try:
+        result = subprocess.run(["gh", "auth", "token"], capture_output=True, text=True, check=True)
+    except (FileNotFoundError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip() or None
+
+
+class HTTPTransport:
+    """Direct HTTPS transport with a pool of keep-alive connections."""
+
+    def __init__(self, token: str, base_url: str = DEFAULT_API_URL, pool_size: int = 8, timeout: float = 30.0) -> None:
+        parts = urlsplit(base_url)
+        self._secure = parts.scheme != "http"
+        self._host = parts.hostname or "api.github.com"
+        self._port = parts.port
+        self._prefix = parts.path.rstrip("/")  # e.g. /api/v3 on GitHub Enterprise Server
+        self._timeout = timeout
+        self._pool: queue.LifoQueue = queue.LifoQueue(maxsize=pool_size)
+        self._headers = {
+            "Authorization": f"Bearer {token}",
+            "Accept": "application/vnd.github+json",
+            "X-GitHub-Api-Version": API_VERSION,
+            "User-Agent": f"ghsec/{__version__}",
+        }
+
+    def _connect(self) -> "http.client.HTTPConnection":
+        # Imported here: http.client (and ssl) dominate import time otherwise.
+        import http.client
+
+        if self._secure:
+            return http.client.HTTPSConnection(self._host, self._port, timeout=self._timeout)
+        return http.client.HTTPConnection(self._host, self._port, timeout=self._timeout)
+
+    def _acquire(self) -> "tuple[http.client.HTTPConnection, bool]":
+        """Return a connection and whether it was reused from the pool."""
+        try:
+            return self._pool.get_nowait(), True
+        except queue.Empty:
+            return self._connect(), False
+
+    def _release(self, conn: "http.client.HTTPConnection") -> None:
+        try:
+            self._pool.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                return
+
+    def _prepare(
+        self, method: str, endpoint: str, fields: dict | None, headers: dict | None
+    ) -> tuple[str, bytes | None, dict[str, str]]:
+        """Return the request path, body and headers for one API call."""
+        if "://" in endpoint:  # absolute URL, e.g. a Link header cursor
+            parts = urlsplit(endpoint)
+            path = f"{parts.path}?{parts.query}" if parts.query else parts.path
+        else:
+            path = self._prefix + (endpoint if endpoint.startswith("/") else f"/{endpoint}")
+            if endpoint == "graphql" and self._prefix.endswith("/v3"):
+                path = f"{self._prefix[:-3]}/graphql"  # GHES serves GraphQL at /api/graphql
+        body = None
+        req_headers = dict(self._headers)
+        if fields and method == "GET":
+            path += ("&" if "?" in path else "?") + urlencode(fields)
+        elif fields:
+            body = json.dumps(fields).encode()
+            req_headers["Content-Type"] = "application/json"
+        if headers:
+            req_headers.update(headers)
+        return path, body, req_headers
+
+    def _open(
+        self, method: str, path: str, body: bytes | None, headers: dict[str, str]
+    ) -> "tuple[http.client.HTTPConnection, http.client.HTTPResponse, bool]":
+        """Send the request and return the connection, its response and whether it was reused."""
+        while True:
+            conn, reused = self._acquire()
+            try:
+                conn.request(method, path, body=body, headers=headers)
+                return conn, conn.getresponse(), reused
+            except (ConnectionResetError, BrokenPipeError):  # includes http.client.RemoteDisconnected
+                conn.close()
+                if reused:
+                    continue  # server dropped an idle keep-alive connection; retry on a fresh one
+                raise
+            except BaseException:
+                conn.close()
+                raise
+
+    def _finish(self, conn: "http.client.HTTPConnection", resp: "http.client.HTTPResponse") -> None:
+        if resp.will_close:
+            conn.close()
+        else:
+            self._release(conn)
+
+    def request(
+        self,
+        method: str,
+        endpoint: str,
+        fields: dict | None = None,
+        headers: dict | None = None,
+        include: bool = False,
+    ) -> Response:
+        path, body, req_headers = self._prepare(method, endpoint, fields, headers)
+        while True:
+            conn, resp, reused = self._open(method, path, body, req_headers)
+            try:
+                data = resp.read()
+            except (ConnectionResetError, BrokenPipeError):
+                conn.close()
+                if reused:
+                    continue
+                raise
+            except BaseException:
+                conn.close()
+                raise
+            self._finish(conn, resp)
+            return Response(resp.status, {k.lower(): v for k, v in resp.getheaders()}, data)
+
+    def stream(
+        self, method: str, endpoint: str, fields: dict | None = None, headers: dict | None = None
+    ) -> Response | StreamedResponse:
+        """Like ``request``, but a 200 body is read in ``CHUNK_SIZE`` pieces as the caller asks for them."""
+        path, body, req_headers = self._prepare(method, endpoint, fields, headers)
+        conn, resp, _ = self._open(method, path, body, req_headers)
+        resp_headers = {k.lower(): v for k, v in resp.getheaders()}
+        if resp.status != 200:
+            try:
+                data = resp.read()
+            except BaseException:
+                conn.close()
+                raise
+            self._finish(conn, resp)
+            return Response(resp.status, resp_headers, data)
+        return StreamedResponse(200, resp_headers, self._chunks(conn, resp))
+
+    def _chunks(self, conn: "http.client.HTTPConnection", resp: "http.client.HTTPResponse") -> Iterator[bytes]:
+        finished = False
+        try:
+            while chunk := resp.read(CHUNK_SIZE):
+                yield chunk
+            finished = True
+        finally:
+            if finished:
+                self._finish(conn, resp)
+            else:  # abandoned mid-body; the connection can't be reused
+                conn.close()
+
+
+def _parse_head(head: bytes) -> tuple[int, dict[str, str]] | None:
+    """Parse the status line and headers ``gh api --include`` prints before the body."""
+    lines = head.decode("latin-1").replace("\r\n", "\n").split("\n")
+    try:
+        status = int(lines[0].split()[1])
+    except (IndexError, ValueError):
+        return None
+    headers = {}
+    for line in lines[1:]:
+        key, sep, value = line.partition(":")
+        if sep:
+            headers[key.strip().lower()] = value.strip()
+    return status, headers
+
+
+def _split_head(output: bytes) -> tuple[bytes, bytes] | None:
+    """Split ``gh api --include`` output at the blank line after the headers."""
+    for separator in (b"\r\n\r\n", b"\n\n"):
+        head, sep, body = output.partition(separator)
+        if sep:
+            return head, body
+    return None
+
+
+def _parse_included(output: bytes) -> Response:
+    """Split ``gh api --include`` output into status line, headers and body."""
+    split = _split_head(output)
+    parsed = _parse_head(split[0]) if split else None
+    if parsed is None:
+        return Response(200, {}, output)
+    return Response(*parsed, split[1])
+
+
+def _gh_missing() -> None:
+    print("Error: 'gh' CLI not found. Install it from https://cli.github.com/", file=sys.stderr)
+    sys.exit(1)
+
+
+def _gh_failure(returncode: int, stderr: bytes | None) -> Response:
+    message = (stderr or b"").decode(errors="replace").strip()
+    if returncode == 4:
+        # gh returns 4 for 404 — usually means feature not enabled
+        return Response(404, {}, message.encode())
+    return Response(0, {}, (message or f"gh api failed with exit code {returncode}").encode())
+
+
+class GhCliTransport:
+    """Fallback transport that runs ``gh api --include`` once per request.
+
+    Status and headers are always parsed, whatever ``include`` says, so
+    rate-limit responses reach the scheduler like they do over HTTPS.
+    """
+
+    @staticmethod
+    def _command(method: str, endpoint: str, fields: dict | None, headers: dict | None) -> list[str]:
+        # Always --include: without the status line a 403/429 is just a failed
+        # exit, and the scheduler could never tell throttling apart.
+        cmd = ["gh", "api", endpoint, "--method", method]
+        if fields:
+            for key, value in fields.items():
+                cmd.extend(["-f", f"{key}={value}"])
+        for key, value in (headers or {}).items():
+            cmd.extend(["-H", f"{key}: {value}"])
+        cmd.append("--include")
+        return cmd
+
+    def request(
+        self,
+        method: str,
+        endpoint: str,
+        fields: dict | None = None,
+        headers: dict | None = None,
+        include: bool = False,
+    ) -> Response:
+        cmd = self._command(method, endpoint, fields, headers)
+        try:
+            with trace.span("gh api", "spawn", endpoint=endpoint):
+                result = subprocess.run(cmd, capture_output=True, check=True)
+        except FileNotFoundError:
+            _gh_missing()
+        except subprocess.CalledProcessError as e:
+            if e.stdout:
+                resp = _parse_included(e.stdout)
+                if resp.status != 200:
+                    return resp
+            return _gh_failure(e.returncode, e.stderr)
+        return _parse_included(result.stdout)
+
+    def stream(
+        self, method: str, endpoint: str, fields: dict | None = None, headers: dict | None = None
+    ) -> Response | StreamedResponse:
+        """Like ``request``, but a 200 body is read from ``gh``'s stdout as the caller asks for it."""
+        cmd = self._command(method, endpoint, fields, headers)
+        try:
+            with trace.span("gh api", "spawn", endpoint=endpoint):
+                proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        except FileNotFoundError:
+            _gh_missing()
+        try:
+            output = b""
+            while (split := _split_head(output)) is None and (chunk := proc.stdout.read1(CHUNK_SIZE)):
+                output += chunk
+            parsed = _parse_head(split[0]) if split else None
+            if parsed is not None and parsed[0] == 200:
+                return StreamedResponse(200, parsed[1], self._chunks(proc, split[1]))
+            # Errors, and output without a status line, are small: read them whole.
+            output += proc.stdout.read()
+            stderr = proc.stderr.read()
+            returncode = proc.wait()
+        except BaseException:
+            proc.kill()
+            proc.wait()
+            raise
+        finally:
+            if proc.returncode is not None:
+                proc.stdout.close()
+                proc.stderr.close()
+        if output:
+            resp = _parse_included(output)
+            if returncode == 0 or resp.status != 200:
+                return resp
+        if returncode == 0:
+            return Response(200, {}, output)
+        return _gh_failure(returncode, stderr)
+
+    @staticmethod
+    def _chunks(proc: subprocess.Popen, first: bytes) -> Iterator[bytes]:
+        finished = False
+        try:
+            if first:
+                yield first
+            while chunk := proc.stdout.read1(CHUNK_SIZE):
+                yield chunk
+            finished = True
+        finally:
+            if not finished:
+                proc.kill()  # abandoned mid-body
+            proc.stdout.close()
+            proc.stderr.close()
+            proc.wait()
+
+
+def default_transport():
+    """Pick a transport: direct HTTPS when a token is available, else ``gh api``.
+
+    ``GHSEC_TRANSPORT=gh`` forces the subprocess path and ``GHSEC_API_URL``
+    points the HTTP transport at another server (GHES or a local stand-in).
+    ``GHSEC_REPLAY=FILE`` answers from a recorded cassette instead (with
+    ``GHSEC_REPLAY_LATENCY`` seconds per request), and ``GHSEC_RECORD=FILE``
+    records whatever transport was picked; see ``ghsec.replay``.
+    """
+    replay = os.environ.get("GHSEC_REPLAY")
+    if replay:
+        from ghsec.replay import Faults, ReplayTransport
+
+        latency = float(os.environ.get("GHSEC_REPLAY_LATENCY") or 0)
+        return ReplayTransport(replay, Faults(latency=latency) if latency else None)
+    transport: HTTPTransport | GhCliTransport = GhCliTransport()
+    if os.environ.get("GHSEC_TRANSPORT", "auto") != "gh":
+        token = get_token()
+        if token:
+            transport = HTTPTransport(token, base_url=os.environ.get("GHSEC_API_URL", DEFAULT_API_URL))
+    record = os.environ.get("GHSEC_RECORD")
+    if record:
+        from ghsec.replay import RecordingTransport
+
+        return RecordingTransport(transport, record)
+    return transport
@@ -0,0 +1,79 @@
+"""Polling loop and interval policy for ``ghsec watch``.
+
+Each poll re-lists the alerts with conditional requests, so an unchanged
+page costs a 304 (which GitHub doesn't count against the rate limit). The
+result is diffed against the previous poll with ``ghsec.diff``. The
+interval halves after a poll that found changes and grows by half after a
+quiet one. It is also stretched whenever polling at the current rate would
+use more than ``share`` of the rate-limit budget left before the reset.
+"""
+
+import time
+from collections.abc import Callable
+
+from ghsec.diff import diff_alerts
+from ghsec.records import AlertRecord
+
+
+class PollInterval:
+    """Adaptive delay between polls, bounded by ``minimum`` and ``maximum`` seconds."""
+
+    def __init__(
+        self, initial: float = 60.0, minimum: float = 15.0, maximum: float = 600.0, share: float = 0.5
+    ) -> None:
+        self.minimum = minimum
+        self.maximum = maximum
+        self.share = share
+        self.current = min(max(initial, minimum), maximum)
+
+    def update(
+        self,
+        changed: bool,
+        remaining: int | None = None,
+        reset_in: float | None = None,
+        cost: int = 1,
+    ) -> float:
+        """Return the next delay after a poll that did or didn't find changes.
+
+        ``remaining`` and ``reset_in`` describe the rate-limit budget, and
+        ``cost`` is how many points one poll used.
+        """
+        delay = self.current / 2 if changed else self.current * 1.5
+        delay = min(max(delay, self.minimum), self.maximum)
+        if remaining is not None and reset_in is not None and reset_in > 0:
+            polls_left = max(remaining * self.share / max(cost, 1), 1)
+            delay = max(delay, min(reset_in / polls_left, reset_in))
+        self.current = delay
+        return delay
+
+
+def watch(
+    poll: Callable[[], list[AlertRecord]],
+    report: Callable[[dict[str, list[AlertRecord]]], None],
+    interval: PollInterval,
+    budget: Callable[[], tuple[int | None, float | None]],
+    polls: int | None = None,
+    sleep: Callable[[float], None] = time.sleep,
+) -> None:
+    """Poll until interrupted (or ``polls`` times), reporting each non-empty diff.
+
+    ``poll()`` returns the current alerts; the first call sets the baseline.
+    ``budget()`` returns ``(remaining, seconds until reset)``, either of which
+    may be ``None`` when unknown.
+    """
+    previous = poll()
+    delay = interval.current
+    done = 1
+    while polls is None or done < polls:
+        sleep(delay)
+        before = budget()[0]
+        current = poll()
+        done += 1
+        changes = diff_alerts(previous, current)
+        previous = current
+        changed = any(changes.values())
+        if changed:
+            report(changes)
+        remaining, reset_in = budget()
+        cost = before - remaining if before is not None and remaining is not None else 1
+        delay = interval.update(changed, remaining, reset_in, cost)
@@ -0,0 +1,67 @@
+"""Shared pytest fixtures."""
+
+import pytest
+
+from ghsec import api, trace
+from ghsec.ratelimit import Scheduler
+from ghsec.transport import StreamedResponse
+
+
+@pytest.fixture(autouse=True)
+def _gh_cli_transport(monkeypatch):
+    """Pin tests to the gh CLI transport so nothing picks up a real token or cache."""
+    monkeypatch.setenv("GHSEC_TRANSPORT", "gh")
+    monkeypatch.setenv("GHSEC_NO_CACHE", "1")
+    monkeypatch.setenv("GHSEC_NO_DAEMON", "1")
+    api.set_transport(None)
+    api.set_scheduler(Scheduler())
+    api.configure_cache()
+    api._detected.clear()
+    yield
+    api.set_transport(None)
+    api.configure_cache()
+    trace.disable()
+
+
+class FakeTransport:
+    """Answers from queued responses, or from ``handler(method, endpoint, headers)``.
+
+    ``requests`` records ``(method, endpoint, headers)`` for each call. ``stream``
+    hands 200 bodies out ``chunk_size`` bytes at a time, so incremental decoding
+    sees values split across chunks.
+    """
+
+    def __init__(self, responses=(), handler=None, chunk_size=7):
+        self.responses = list(responses)
+        self.handler = handler
+        self.chunk_size = chunk_size
+        self.requests = []
+
+    @property
+    def endpoints(self):
+        return [endpoint for _, endpoint, _ in self.requests]
+
+    def request(self, method, endpoint, fields=None, headers=None, include=False):
+        self.requests.append((method, endpoint, dict(headers or {})))
+        if self.handler is not None:
+            return self.handler(method, endpoint, headers or {})
+        return self.responses.pop(0)
+
+    def stream(self, method, endpoint, fields=None, headers=None):
+        resp = self.request(method, endpoint, fields, headers)
+        if resp.status != 200:
+            return resp
+        body, size = resp.body, self.chunk_size
+        return StreamedResponse(200, resp.headers, (body[i:i + size] for i in range(0, len(body), size)))
+
+
+@pytest.fixture
+def fake_transport():
+    """Install a ``FakeTransport``: ``fake_transport(*responses, handler=None)``."""
+
+    def install(*responses, handler=None):
+        transport = FakeTransport(responses, handler)
+        api.set_transport(transport)
+        return transport
+
+    return install
@@ -1,4 +1,10 @@
-"""Canned API responses for testing."""
+"""Canned API responses for testing, and builders for responses and records."""
+
+import json
+
+from ghsec.records import AlertRecord
+from ghsec.synthetic import make_alert
+from ghsec.transport import Response
 
 CODE_ALERT = {
     "number": 1,
@@ -96,3 +102,25 @@ SECRET_ALERT_MINIMAL = {
     "created_at": "2025-01-12T11:00:00Z",
     "secret_type": "custom_secret",
 }
+
+
+def json_response(payload, status=200, **headers):
+    """A response with a JSON body; ``last_modified=...`` becomes the ``last-modified`` header."""
+    return Response(status, {k.replace("_", "-"): v for k, v in headers.items()}, json.dumps(payload).encode())
+
+
+def page_response(items, next_url=None):
+    """One page of a list endpoint, linking to ``next_url`` when given."""
+    if next_url is None:
+        return json_response(items)
+    return json_response(items, link=f'<{next_url}>; rel="next", <https://x/last>; rel="last"')
+
+
+def alert_record(number, state="open", updated="2025-01-01T00:00:00Z", atype="code", repo="o/r"):
+    return AlertRecord(repo, atype, number, state, "high", f"alert {number}", updated_at=updated)
+
+
+def synthetic_pages(alert_type, pages, per_page=100, repo="acme/web"):
+    """Yield ``pages`` full pages of generated alerts, numbered from 1."""
+    for p in range(pages):
+        yield [make_alert(alert_type, p * per_page + n, repo) for n in range(1, per_page + 1)]
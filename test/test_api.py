@@ -1,12 +1,30 @@
 """Tests for ghsec.api module."""
 
 import json
+import re
 import subprocess
+import threading
+import time
 from unittest.mock import patch
 
 import pytest
 
-from ghsec.api import APIError, detect_repo, get_alert, gh_api, list_alerts, update_alert
+from ghsec import api
+from ghsec.api import (
+    APIError,
+    detect_repo,
+    get_alert,
+    gh_api,
+    iter_alert_instances,
+    iter_alert_pages,
+    iter_item_batches,
+    iter_items,
+    iter_org_alert_pages,
+    list_alerts,
+    update_alert,
+)
+from ghsec.transport import Response, StreamedResponse
+from test.fixtures import page_response
 
 
 # --- gh_api ---
@@ -25,15 +43,15 @@ def _mock_run(stdout="", returncode=0, stderr=""):
 class TestGhApi:
     @patch("ghsec.api.subprocess.run")
     def test_get_request(self, mock_run):
-        mock_run.return_value = subprocess.CompletedProcess([], 0, stdout='[{"number": 1}]', stderr="")
+        mock_run.return_value = subprocess.CompletedProcess([], 0, stdout=b'[{"number": 1}]', stderr=b"")
         result = gh_api("/repos/owner/repo/code-scanning/alerts")
         assert result == [{"number": 1}]
         cmd = mock_run.call_args[0][0]
-        assert cmd == ["gh", "api", "/repos/owner/repo/code-scanning/alerts", "--method", "GET"]
+        assert cmd == ["gh", "api", "/repos/owner/repo/code-scanning/alerts", "--method", "GET", "--include"]
 
     @patch("ghsec.api.subprocess.run")
     def test_patch_with_fields(self, mock_run):
-        mock_run.return_value = subprocess.CompletedProcess([], 0, stdout='{"state": "dismissed"}', stderr="")
+        mock_run.return_value = subprocess.CompletedProcess([], 0, stdout=b'{"state": "dismissed"}', stderr=b"")
         result = gh_api("/repos/o/r/alerts/1", method="PATCH", fields={"state": "dismissed", "reason": "wont_fix"})
         assert result == {"state": "dismissed"}
         cmd = mock_run.call_args[0][0]
@@ -45,12 +63,12 @@ class TestGhApi:
 
     @patch("ghsec.api.subprocess.run")
     def test_empty_response(self, mock_run):
-        mock_run.return_value = subprocess.CompletedProcess([], 0, stdout="", stderr="")
+        mock_run.return_value = subprocess.CompletedProcess([], 0, stdout=b"", stderr=b"")
         assert gh_api("/repos/o/r/alerts") == {}
 
     @patch("ghsec.api.subprocess.run")
     def test_whitespace_response(self, mock_run):
-        mock_run.return_value = subprocess.CompletedProcess([], 0, stdout="  \n  ", stderr="")
+        mock_run.return_value = subprocess.CompletedProcess([], 0, stdout=b"  \n  ", stderr=b"")
         assert gh_api("/repos/o/r/alerts") == {}
 
     @patch("ghsec.api.subprocess.run", side_effect=FileNotFoundError)
@@ -60,19 +78,30 @@ class TestGhApi:
 
     @patch("ghsec.api.subprocess.run")
     def test_404_raises_api_error(self, mock_run):
-        mock_run.side_effect = subprocess.CalledProcessError(4, "gh", stderr="gh: Not Found (HTTP 404)")
+        mock_run.side_effect = subprocess.CalledProcessError(4, "gh", stderr=b"gh: Not Found (HTTP 404)")
         with pytest.raises(APIError, match="Not found"):
             gh_api("/repos/o/r/alerts")
 
     @patch("ghsec.api.subprocess.run")
     def test_other_error_raises_api_error(self, mock_run):
-        mock_run.side_effect = subprocess.CalledProcessError(1, "gh", stderr="gh: some error")
+        mock_run.side_effect = subprocess.CalledProcessError(1, "gh", stderr=b"gh: some error")
         with pytest.raises(APIError, match="some error"):
             gh_api("/repos/o/r/alerts")
 
+    @patch("ghsec.api.subprocess.run")
+    def test_patch_throttling_reaches_scheduler(self, mock_run):
+        throttled = subprocess.CalledProcessError(
+            1, "gh", output=b'HTTP/2.0 429 Too Many Requests\r\nRetry-After: 0\r\n\r\n{"message": "slow down"}',
+            stderr=b"gh: slow down (HTTP 429)",
+        )
+        done = subprocess.CompletedProcess([], 0, stdout=b'HTTP/2.0 200 OK\r\n\r\n{"state": "dismissed"}', stderr=b"")
+        mock_run.side_effect = [throttled, done]
+        assert gh_api("/repos/o/r/alerts/1", method="PATCH", fields={"state": "dismissed"}) == {"state": "dismissed"}
+        assert mock_run.call_count == 2
+
     @patch("ghsec.api.subprocess.run")
     def test_error_empty_stderr(self, mock_run):
-        mock_run.side_effect = subprocess.CalledProcessError(1, "gh", stderr="")
+        mock_run.side_effect = subprocess.CalledProcessError(1, "gh", stderr=b"")
         with pytest.raises(APIError, match="exit code 1"):
             gh_api("/repos/o/r/alerts")
 
@@ -81,6 +110,12 @@ class TestGhApi:
 
 
 class TestDetectRepo:
+    @pytest.fixture(autouse=True)
+    def _outside_git(self, tmp_path, monkeypatch):
+        # No .git above tmp_path, so detection falls through to gh
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.delenv("GH_REPO", raising=False)
+
     @patch("ghsec.api.subprocess.run")
     def test_success(self, mock_run):
         mock_run.return_value = subprocess.CompletedProcess([], 0, stdout="owner/repo\n", stderr="")
@@ -97,48 +132,240 @@ class TestDetectRepo:
         with pytest.raises(SystemExit):
             detect_repo()
 
+    @patch("ghsec.api.subprocess.run")
+    def test_local_config_skips_gh(self, mock_run, tmp_path):
+        (tmp_path / ".git").mkdir()
+        (tmp_path / ".git" / "config").write_text('[remote "origin"]\n\turl = git@github.com:acme/web.git\n')
+        assert detect_repo() == "acme/web"
+        mock_run.assert_not_called()
+
+    @patch("ghsec.api.detect_repo_local")
+    @patch("ghsec.api.subprocess.run")
+    def test_gh_repo_env_wins(self, mock_run, mock_local, monkeypatch):
+        monkeypatch.setenv("GH_REPO", "github.example.com/acme/api")
+        assert detect_repo() == "acme/api"
+        mock_local.assert_not_called()
+        mock_run.assert_not_called()
+
 
 # --- list_alerts ---
 
 
 class TestListAlerts:
-    @patch("ghsec.api.gh_api")
-    def test_basic_call(self, mock_gh):
-        mock_gh.return_value = [{"number": 1}]
+    @patch("ghsec.api.gh_request")
+    def test_basic_call(self, mock_req):
+        mock_req.return_value = page_response([{"number": 1}])
         result = list_alerts("owner/repo", "code")
-        mock_gh.assert_called_once_with("/repos/owner/repo/code-scanning/alerts?per_page=100")
+        mock_req.assert_called_once_with("/repos/owner/repo/code-scanning/alerts?per_page=100", include=True)
         assert result == [{"number": 1}]
 
-    @patch("ghsec.api.gh_api")
-    def test_with_state_filter(self, mock_gh):
-        mock_gh.return_value = []
+    @patch("ghsec.api.gh_request")
+    def test_with_state_filter(self, mock_req):
+        mock_req.return_value = page_response([])
         list_alerts("owner/repo", "dep", state="open")
-        endpoint = mock_gh.call_args[0][0]
+        endpoint = mock_req.call_args[0][0]
         assert "state=open" in endpoint
 
-    @patch("ghsec.api.gh_api")
-    def test_with_severity_filter(self, mock_gh):
-        mock_gh.return_value = []
+    @patch("ghsec.api.gh_request")
+    def test_with_severity_filter(self, mock_req):
+        mock_req.return_value = page_response([])
         list_alerts("owner/repo", "secret", severity="critical")
-        endpoint = mock_gh.call_args[0][0]
+        endpoint = mock_req.call_args[0][0]
         assert "severity=critical" in endpoint
 
-    @patch("ghsec.api.gh_api")
-    def test_with_both_filters(self, mock_gh):
-        mock_gh.return_value = []
+    @patch("ghsec.api.gh_request")
+    def test_with_both_filters(self, mock_req):
+        mock_req.return_value = page_response([])
         list_alerts("owner/repo", "code", state="dismissed", severity="high")
-        endpoint = mock_gh.call_args[0][0]
+        endpoint = mock_req.call_args[0][0]
         assert "state=dismissed" in endpoint
         assert "severity=high" in endpoint
 
-    @patch("ghsec.api.gh_api")
-    def test_all_alert_types(self, mock_gh):
-        mock_gh.return_value = []
+    @patch("ghsec.api.gh_request")
+    def test_all_alert_types(self, mock_req):
+        mock_req.return_value = page_response([])
         for atype, path in [("code", "code-scanning"), ("dep", "dependabot"), ("secret", "secret-scanning")]:
             list_alerts("o/r", atype)
-            endpoint = mock_gh.call_args[0][0]
+            endpoint = mock_req.call_args[0][0]
             assert path in endpoint
 
+    @patch("ghsec.api.gh_request")
+    def test_follows_link_header(self, mock_req):
+        next_url = "https://api.github.com/repos/o/r/dependabot/alerts?per_page=100&after=abc"
+        mock_req.side_effect = [page_response([{"number": 1}, {"number": 2}], next_url), page_response([{"number": 3}])]
+        assert [a["number"] for a in list_alerts("o/r", "dep")] == [1, 2, 3]
+        assert mock_req.call_args_list[1][0][0] == next_url
+
+
+class TestIterAlertPages:
+    @patch("ghsec.api.gh_request")
+    def test_yields_pages(self, mock_req):
+        mock_req.side_effect = [page_response([{"number": 1}], "/p2"), page_response([{"number": 2}], "/p3"), page_response([])]
+        assert list(iter_alert_pages("o/r", "code")) == [[{"number": 1}], [{"number": 2}], []]
+
+    @patch("ghsec.api.gh_request")
+    def test_prefetches_nextpage_response(self, mock_req):
+        fetched_second = threading.Event()
+
+        def fetch(endpoint, include=False):
+            if endpoint == "/p2":
+                fetched_second.set()
+                return page_response([{"number": 2}])
+            return page_response([{"number": 1}], "/p2")
+
+        mock_req.side_effect = fetch
+        pages = iter_alert_pages("o/r", "code")
+        assert next(pages) == [{"number": 1}]
+        # Page 2 is requested while the caller still holds page 1
+        assert fetched_second.wait(timeout=5)
+        assert next(pages) == [{"number": 2}]
+
+    @patch("ghsec.api.gh_request")
+    def test_early_stop_skips_prefetch_wait(self, mock_req):
+        release = threading.Event()
+
+        def fetch(endpoint, include=False):
+            if endpoint == "/p2":
+                release.wait(timeout=5)
+                return page_response([{"number": 2}])
+            return page_response([{"number": 1}], "/p2")
+
+        mock_req.side_effect = fetch
+        pages = iter_alert_pages("o/r", "code")
+        assert next(pages) == [{"number": 1}]
+        started = time.monotonic()
+        pages.close()
+        assert time.monotonic() - started < 1
+        release.set()
+
+    @patch("ghsec.api.gh_request")
+    def test_org_endpoint(self, mock_req):
+        mock_req.return_value = page_response([])
+        list(iter_org_alert_pages("acme", "secret", state="open"))
+        assert mock_req.call_args[0][0] == "/orgs/acme/secret-scanning/alerts?per_page=100&state=open"
+
+    @patch("ghsec.api.gh_request")
+    def test_error_on_later_page_propagates(self, mock_req):
+        mock_req.side_effect = [page_response([{"number": 1}], "/p2"), APIError("boom")]
+        pages = iter_alert_pages("o/r", "code")
+        assert next(pages) == [{"number": 1}]
+        with pytest.raises(APIError, match="boom"):
+            next(pages)
+
+
+class _FakeRequestOnly:
+    """A transport with only ``request``, like the replay transports."""
+
+    def __init__(self, resp):
+        self.resp = resp
+
+    def request(self, method, endpoint, fields=None, headers=None, include=False):
+        return self.resp
+
+
+class TestStreamedPages:
+    def test_items_across_pages(self, fake_transport):
+        transport = fake_transport(page_response([{"number": 1}, {"number": 2}], "/p2"), page_response([{"number": 3}]))
+        assert [a["number"] for a in iter_items("/p1")] == [1, 2, 3]
+        assert transport.endpoints == ["/p1", "/p2"]
+
+    def test_batches_stay_within_pages(self, fake_transport):
+        fake_transport(page_response([{"number": n} for n in range(1, 6)], "/p2"), page_response([{"number": 6}]))
+        batches = list(iter_item_batches("/p1", size=2))
+        assert [[a["number"] for a in b] for b in batches] == [[1, 2], [3, 4], [5], [6]]
+
+    def test_alert_pages_stream_flag(self, fake_transport):
+        transport = fake_transport(page_response([{"number": 1}]))
+        assert list(iter_alert_pages("o/r", "dep", state="open", stream=True)) == [[{"number": 1}]]
+        assert transport.endpoints == ["/repos/o/r/dependabot/alerts?per_page=100&state=open"]
+
+    def test_error_status_raises(self, fake_transport):
+        fake_transport(Response(404, {}, b'{"message": "Not Found"}'))
+        with pytest.raises(APIError, match="Not found"):
+            list(iter_items("/p1"))
+
+    def test_truncated_body_raises(self, fake_transport):
+        fake_transport(Response(200, {}, b'[{"number": 1}, {"num'))
+        items = iter_items("/p1")
+        assert next(items) == {"number": 1}
+        with pytest.raises(APIError, match="Invalid JSON"):
+            next(items)
+
+    def test_early_stop_releases_prefetched_page(self, fake_transport):
+        transport = fake_transport(page_response([{"number": 1}, {"number": 2}], "/p2"), page_response([{"number": 3}]))
+        released = []
+        prefetched = threading.Event()
+        stream = transport.stream
+
+        def tracked(method, endpoint, fields=None, headers=None):
+            resp = stream(method, endpoint, fields, headers)
+            if endpoint == "/p2":
+                prefetched.set()
+
+            def chunks():
+                try:
+                    yield from resp.chunks
+                finally:
+                    released.append(endpoint)
+
+            return StreamedResponse(200, resp.headers, chunks())
+
+        transport.stream = tracked
+        items = iter_items("/p1")
+        assert next(items) == {"number": 1}
+        assert prefetched.wait(timeout=5)
+        items.close()
+        assert sorted(released) == ["/p1", "/p2"]
+
+    def test_transport_without_stream(self):
+        api.set_transport(_FakeRequestOnly(page_response([{"number": 1}])))
+        assert list(iter_items("/p1")) == [{"number": 1}]
+
+
+def _numbered(items, page, last):
+    base = "https://api.github.com/repos/o/r/code-scanning/alerts/1/instances?per_page=100"
+    links = [f'<{base}&page={page + 1}>; rel="next"', f'<{base}&page={last}>; rel="last"'] if page < last else []
+    return Response(200, {"link": ", ".join(links)} if links else {}, json.dumps(items).encode())
+
+
+class TestIterPagesParallel:
+    @patch("ghsec.api.gh_request")
+    def test_fetches_remaining_pages_together(self, mock_req):
+        in_flight, peak, lock = [0], [0], threading.Lock()
+        release = threading.Barrier(3, timeout=5)
+
+        def fetch(endpoint, include=False):
+            match = re.search(r"[?&]page=(\d+)", endpoint)
+            page = int(match.group(1)) if match else 1
+            if page > 1:
+                with lock:
+                    in_flight[0] += 1
+                    peak[0] = max(peak[0], in_flight[0])
+                release.wait()  # pages 2-4 only return once all three are in flight
+                with lock:
+                    in_flight[0] -= 1
+            return _numbered([{"n": page}], page, 4)
+
+        mock_req.side_effect = fetch
+        pages = list(iter_alert_instances("o/r", "code", 1, max_workers=3))
+        assert pages == [[{"n": 1}], [{"n": 2}], [{"n": 3}], [{"n": 4}]]
+        assert peak[0] == 3
+        assert mock_req.call_args_list[0].args[0] == "/repos/o/r/code-scanning/alerts/1/instances?per_page=100"
+
+    @patch("ghsec.api.gh_request")
+    def test_cursor_pagination_falls_back_to_sequential(self, mock_req):
+        mock_req.side_effect = [
+            Response(200, {"link": '<https://x/locations?cursor=abc>; rel="next"'}, b'[{"n": 1}]'),
+            Response(200, {}, b'[{"n": 2}]'),
+        ]
+        assert list(iter_alert_instances("o/r", "secret", 9)) == [[{"n": 1}], [{"n": 2}]]
+        assert mock_req.call_args_list[0].args[0] == "/repos/o/r/secret-scanning/alerts/9/locations?per_page=100"
+
+    def test_with_page(self):
+        from ghsec.api import _with_page
+
+        assert _with_page("https://x/a?per_page=100&page=2", 7) == "https://x/a?per_page=100&page=7"
+
 
 # --- get_alert / update_alert ---
 
@@ -148,7 +375,7 @@ class TestGetAlert:
     def test_get(self, mock_gh):
         mock_gh.return_value = {"number": 42}
         result = get_alert("owner/repo", "code", 42)
-        mock_gh.assert_called_once_with("/repos/owner/repo/code-scanning/alerts/42")
+        mock_gh.assert_called_once_with("/repos/owner/repo/code-scanning/alerts/42", max_age=None)
         assert result["number"] == 42
 
 
@@ -0,0 +1,53 @@
+"""Smoke tests for the benchmark suite in bench/ (kept tiny; see bench/run.py)."""
+
+import json
+
+from bench.run import BENCHMARKS, compare, main, run_benchmarks
+from bench.transport import LatencyTransport
+from ghsec import api
+from ghsec.records import AlertRecord
+from ghsec.synthetic import make_alert
+
+
+class TestGenerators:
+    def test_deterministic(self):
+        assert make_alert("dep", 7) == make_alert("dep", 7)
+        assert make_alert("dep", 7) != make_alert("dep", 8)
+
+    def test_normalizes(self):
+        for atype in ("code", "dep", "secret"):
+            rec = AlertRecord.from_api(make_alert(atype, 3), atype)
+            assert rec.number == 3 and rec.description
+
+
+class TestLatencyTransport:
+    def test_pages_through_list_alerts(self):
+        transport = LatencyTransport({"code": 250})
+        api.set_transport(transport)
+        alerts = api.list_alerts("o/r", "code")
+        assert [a["number"] for a in alerts] == list(range(250, 0, -1))
+        assert transport.requests == 3
+
+    def test_single_alert(self):
+        api.set_transport(LatencyTransport({"secret": 5}))
+        assert api.get_alert("o/r", "secret", 2)["number"] == 2
+
+
+class TestRun:
+    def test_every_benchmark_reports(self):
+        report = run_benchmarks([20], types=["dep"], repeat=1)
+        assert {r["name"] for r in report["results"]} == set(BENCHMARKS)
+        assert all(r["seconds"]["min"] > 0 for r in report["results"])
+        json.dumps(report)
+
+    def test_compare_flags_slowdowns(self):
+        def report(seconds):
+            return {"results": [{"name": "parse", "type": "code", "size": 100, "seconds": {"min": seconds}}]}
+
+        assert compare(report(1.0), report(1.2), threshold=0.25) == []
+        assert len(compare(report(1.0), report(1.5), threshold=0.25)) == 1
+
+    def test_cli_writes_json(self, tmp_path):
+        out = tmp_path / "bench.json"
+        main(["--sizes", "10", "--types", "secret", "--only", "parse,records", "--repeat", "1", "--output", str(out)])
+        assert len(json.loads(out.read_text())["results"]) == 2
@@ -0,0 +1,153 @@
+"""Tests for ghsec.cache and the cached request path in ghsec.api."""
+
+import pytest
+
+from ghsec import api
+from ghsec.api import APIError, gh_api, list_alerts
+from ghsec.cache import Cache, cache_dir
+from ghsec.transport import Response
+from test.fixtures import json_response
+
+
+@pytest.fixture
+def cache(tmp_path):
+    c = Cache(tmp_path / "cache.db")
+    api.set_cache(c)
+    yield c
+    c.close()
+
+
+# --- Cache ---
+
+
+class TestCache:
+    def test_roundtrip(self, tmp_path):
+        c = Cache(tmp_path / "c.db")
+        c.put("/k", json_response([{"number": 1}], etag='"abc"', last_modified="Wed, 01 Jan 2025 00:00:00 GMT"))
+        entry = c.get("/k")
+        assert entry.response.json() == [{"number": 1}]
+        assert entry.conditional_headers() == {
+            "If-None-Match": '"abc"',
+            "If-Modified-Since": "Wed, 01 Jan 2025 00:00:00 GMT",
+        }
+
+    def test_missing_key(self, tmp_path):
+        assert Cache(tmp_path / "c.db").get("/nope") is None
+
+    def test_persists_across_handles(self, tmp_path):
+        Cache(tmp_path / "c.db").put("/k", json_response({"number": 3}))
+        assert Cache(tmp_path / "c.db").get("/k").response.json() == {"number": 3}
+
+    def test_private_permissions(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("GHSEC_CACHE_DIR", str(tmp_path / "ghsec"))
+        c = Cache()
+        c.put("/k", json_response({"secret": "ghp_x"}))
+        assert (tmp_path / "ghsec").stat().st_mode & 0o777 == 0o700
+        for name in ("cache.db", "cache.db-wal", "cache.db-shm"):
+            assert (tmp_path / "ghsec" / name).stat().st_mode & 0o777 == 0o600
+        c.close()
+
+    def test_existing_database_tightened(self, tmp_path):
+        (tmp_path / "c.db").touch(mode=0o644)
+        Cache(tmp_path / "c.db").close()
+        assert (tmp_path / "c.db").stat().st_mode & 0o777 == 0o600
+
+    def test_cache_dir_env(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("GHSEC_CACHE_DIR", str(tmp_path / "x"))
+        assert cache_dir() == tmp_path / "x"
+
+    def test_cache_dir_xdg(self, tmp_path, monkeypatch):
+        monkeypatch.delenv("GHSEC_CACHE_DIR", raising=False)
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+        assert cache_dir() == tmp_path / "ghsec"
+
+
+# --- Conditional requests ---
+
+
+class TestConditionalRequests:
+    def test_first_request_stored(self, cache, fake_transport):
+        fake_transport(json_response({"number": 1}, etag='"v1"'))
+        assert gh_api("/repos/o/r/code-scanning/alerts/1") == {"number": 1}
+        assert cache.get("/repos/o/r/code-scanning/alerts/1").etag == '"v1"'
+
+    def test_304_served_from_cache(self, cache, fake_transport):
+        transport = fake_transport(json_response({"number": 1}, etag='"v1"'), Response(304, {}, b""))
+        gh_api("/repos/o/r/code-scanning/alerts/1")
+        assert gh_api("/repos/o/r/code-scanning/alerts/1") == {"number": 1}
+        assert transport.requests[1][2]["If-None-Match"] == '"v1"'
+
+    def test_changed_response_replaces_entry(self, cache, fake_transport):
+        fake_transport(json_response({"state": "open"}, etag='"v1"'), json_response({"state": "fixed"}, etag='"v2"'))
+        gh_api("/a")
+        assert gh_api("/a") == {"state": "fixed"}
+        assert cache.get("/a").etag == '"v2"'
+
+    def test_patch_not_cached(self, cache, fake_transport):
+        fake_transport(json_response({"state": "dismissed"}))
+        gh_api("/a", method="PATCH", fields={"state": "dismissed"})
+        assert cache.get("/a") is None
+
+    def test_paginated_list_replayed_with_links(self, cache, fake_transport):
+        first = json_response([{"number": 1}], etag='"p1"', link='</p2>; rel="next"')
+        second = json_response([{"number": 2}], etag='"p2"')
+        fake_transport(first, second, Response(304, {}, b""), Response(304, {}, b""))
+        assert [a["number"] for a in list_alerts("o/r", "code")] == [1, 2]
+        assert [a["number"] for a in list_alerts("o/r", "code")] == [1, 2]
+
+    def test_streamed_page_stored_and_replayed(self, cache, fake_transport):
+        transport = fake_transport(json_response([{"number": 1}], etag='"v1"'), Response(304, {}, b""))
+        assert list(api.iter_items("/a")) == [{"number": 1}]
+        assert cache.get("/a").etag == '"v1"'
+        assert list(api.iter_items("/a")) == [{"number": 1}]
+        assert transport.requests[1][2]["If-None-Match"] == '"v1"'
+
+    def test_fresh_entry_served_without_request(self, cache, fake_transport):
+        transport = fake_transport(json_response({"number": 1}, etag='"v1"'))
+        gh_api("/a")
+        assert gh_api("/a", max_age=60) == {"number": 1}
+        assert len(transport.requests) == 1
+
+    def test_patch_drops_fresh_entry(self, cache, fake_transport):
+        transport = fake_transport(
+            json_response({"state": "open"}, etag='"v1"'), json_response({"state": "dismissed"}), json_response({"state": "dismissed"}, etag='"v2"')
+        )
+        gh_api("/a")
+        gh_api("/a", method="PATCH", fields={"state": "dismissed"})
+        assert gh_api("/a", max_age=60) == {"state": "dismissed"}
+        assert len(transport.requests) == 3
+
+    def test_stale_entry_revalidated(self, cache, fake_transport):
+        transport = fake_transport(json_response({"number": 1}, etag='"v1"'), Response(304, {}, b""))
+        gh_api("/a")
+        assert gh_api("/a", max_age=0) == {"number": 1}
+        assert len(transport.requests) == 2
+
+
+# --- Offline mode ---
+
+
+class TestOffline:
+    def test_served_without_transport(self, cache, fake_transport):
+        fake_transport(json_response({"number": 1}, etag='"v1"'))
+        gh_api("/a")
+        fake_transport()
+        api.configure_cache(offline=True)
+        api.set_cache(cache)
+        assert gh_api("/a") == {"number": 1}
+
+    def test_missing_entry_raises(self, cache):
+        api.configure_cache(offline=True)
+        api.set_cache(cache)
+        with pytest.raises(APIError, match="not in the cache"):
+            gh_api("/a")
+
+    def test_mutations_refused(self, cache):
+        api.configure_cache(offline=True)
+        api.set_cache(cache)
+        with pytest.raises(APIError, match="Offline"):
+            gh_api("/a", method="PATCH", fields={"state": "open"})
+
+    def test_offline_requires_cache(self):
+        with pytest.raises(ValueError):
+            api.configure_cache(enabled=False, offline=True)
@@ -1,13 +1,19 @@
 """Tests for ghsec.cli module."""
 
+import argparse
+import io
 import json
+import threading
+import time
 from unittest.mock import patch
 
 import pytest
 
 from ghsec.api import APIError
-from ghsec.cli import build_parser, main
-from test.fixtures import CODE_ALERT, DEP_ALERT, SECRET_ALERT
+from ghsec.cli import build_parser, main, parse_id_spec, parse_show_targets
+from ghsec.records import to_records
+from ghsec.transport import Response
+from test.fixtures import CODE_ALERT, DEP_ALERT, SECRET_ALERT, json_response
 
 
 # --- Argument parsing ---
@@ -32,13 +38,12 @@ class TestParser:
     def test_show_args(self):
         args = self.parser.parse_args(["show", "dep", "42"])
         assert args.command == "show"
-        assert args.type == "dep"
-        assert args.id == 42
+        assert args.targets == ["dep", "42"]
 
     def test_dismiss_args(self):
         args = self.parser.parse_args(["dismiss", "code", "1", "--reason", "wont_fix", "--comment", "not relevant"])
         assert args.type == "code"
-        assert args.id == 1
+        assert args.ids == ["1"]
         assert args.reason == "wont_fix"
         assert args.comment == "not relevant"
 
@@ -49,7 +54,12 @@ class TestParser:
     def test_reopen_args(self):
         args = self.parser.parse_args(["reopen", "secret", "7"])
         assert args.type == "secret"
-        assert args.id == 7
+        assert args.ids == ["7"]
+
+    def test_dismiss_bulk_args(self):
+        args = self.parser.parse_args(["dismiss", "code", "1-300,412", "500", "--reason", "false_positive"])
+        assert args.ids == ["1-300,412", "500"]
+        assert args.concurrency == 8
 
     def test_global_repo_flag(self):
         args = self.parser.parse_args(["--repo", "owner/repo", "list"])
@@ -63,10 +73,30 @@ class TestParser:
         with pytest.raises(SystemExit):
             self.parser.parse_args(["show", "invalid", "1"])
 
+    def test_stream_flag(self):
+        args = self.parser.parse_args(["list-code", "--stream"])
+        assert args.stream is True
+
+    def test_json_and_jsonl_exclusive(self):
+        with pytest.raises(SystemExit):
+            self.parser.parse_args(["--json", "--jsonl", "list"])
+
     def test_invalid_state_rejected(self):
         with pytest.raises(SystemExit):
             self.parser.parse_args(["list", "--state", "bogus"])
 
+    @pytest.mark.parametrize("argv", [
+        ["list", "--repos-file", "r.txt", "--concurrency", "0"],
+        ["export", "--repos-file", "r.txt", "--concurrency", "-2"],
+        ["show", "code", "1", "--concurrency", "0"],
+        ["dismiss", "code", "1", "--reason", "wont_fix", "--concurrency", "x"],
+    ])
+    def test_concurrency_must_be_positive(self, argv, capsys):
+        with pytest.raises(SystemExit) as exc:
+            self.parser.parse_args(argv)
+        assert exc.value.code == 2
+        assert "--concurrency" in capsys.readouterr().err
+
 
 # --- Command handlers ---
 
@@ -84,6 +114,24 @@ class TestCmdList:
         assert mock_api.call_count == 3
         assert mock_table.call_count == 3
 
+    @patch("ghsec.cli.list_alerts")
+    @patch("ghsec.cli.print_json")
+    @patch("ghsec.cli.detect_repo", return_value="owner/repo")
+    def test_list_all_concurrent_fixed_order(self, mock_detect, mock_json, mock_api):
+        # All three fetches must be in flight together to get past the barrier
+        barrier = threading.Barrier(3, timeout=5)
+
+        def fetch(repo, atype, state=None, severity=None):
+            barrier.wait()
+            return [{"type": atype}]
+
+        mock_api.side_effect = fetch
+        parser = build_parser()
+        args = parser.parse_args(["--json", "list"])
+        args.func(args)
+        printed = [c.args[0][0]["type"] for c in mock_json.call_args_list]
+        assert printed == ["code", "dep", "secret"]
+
     @patch("ghsec.cli.list_alerts")
     @patch("ghsec.cli.print_alerts_table")
     @patch("ghsec.cli.detect_repo", return_value="owner/repo")
@@ -113,6 +161,7 @@ class TestCmdList:
         args = parser.parse_args(["list"])
         args.func(args)  # should not raise
         assert mock_err.call_count == 3  # one error per type
+        assert [c.args[0].split("]")[0] for c in mock_err.call_args_list] == ["[code", "[dep", "[secret"]
 
     @patch("ghsec.cli.list_alerts")
     @patch("ghsec.cli.print_alerts_table")
@@ -134,6 +183,399 @@ class TestCmdList:
         mock_api.assert_called_once_with("owner/repo", "code", state="dismissed", severity="critical")
 
 
+class TestCmdListWhere:
+    @patch("ghsec.cli.list_alerts")
+    @patch("ghsec.cli.print_json")
+    @patch("ghsec.cli.detect_repo", return_value="owner/repo")
+    def test_where_filters_json(self, mock_detect, mock_json, mock_api):
+        other = dict(CODE_ALERT, number=9, rule={"id": "py/unused-import"})
+        mock_api.return_value = [CODE_ALERT, other]
+        parser = build_parser()
+        args = parser.parse_args(["--json", "list-code", "--where", "rule~py/sql* and path~src/*"])
+        args.func(args)
+        mock_json.assert_called_once_with([CODE_ALERT])
+
+    @patch("ghsec.cli.iter_alert_pages")
+    @patch("ghsec.cli.detect_repo", return_value="owner/repo")
+    def test_where_filters_jsonl_pages(self, mock_detect, mock_pages, capsys):
+        mock_pages.return_value = iter([[DEP_ALERT], [dict(DEP_ALERT, number=6, state="dismissed")]])
+        parser = build_parser()
+        args = parser.parse_args(["--jsonl", "list-deps", "--where", "package=lodash state=dismissed"])
+        args.func(args)
+        assert [json.loads(line)["number"] for line in capsys.readouterr().out.splitlines()] == [6]
+
+    def test_bad_expression_rejected(self, capsys):
+        with pytest.raises(SystemExit):
+            build_parser().parse_args(["list", "--where", "colour=red"])
+        assert "unknown field" in capsys.readouterr().err
+
+    @patch("ghsec.cli.list_alerts")
+    @patch("ghsec.cli.print_alerts_table")
+    @patch("ghsec.cli.detect_repo", return_value="owner/repo")
+    def test_local_reads_store(self, mock_detect, mock_table, mock_api, tmp_path, monkeypatch):
+        from ghsec.store import AlertStore
+
+        monkeypatch.setenv("GHSEC_CACHE_DIR", str(tmp_path))
+        store = AlertStore()
+        store.upsert("owner/repo", "dep", [DEP_ALERT, dict(DEP_ALERT, number=6, state="fixed")])
+        store.close()
+        parser = build_parser()
+        args = parser.parse_args(["list-deps", "--local", "--state", "open", "--where", "ecosystem=npm"])
+        args.func(args)
+        mock_api.assert_not_called()
+        records = mock_table.call_args[0][0]
+        assert [r.number for r in records] == [5]
+
+    @patch("ghsec.cli.print_error")
+    def test_local_rejects_org(self, mock_err):
+        parser = build_parser()
+        args = parser.parse_args(["list", "--local", "--org", "acme"])
+        with pytest.raises(SystemExit):
+            args.func(args)
+
+
+class TestCmdListStream:
+    @patch("ghsec.cli.iter_alert_pages")
+    @patch("ghsec.cli.print_alerts_stream")
+    @patch("ghsec.cli.detect_repo", return_value="owner/repo")
+    def test_stream_renders_pages(self, mock_detect, mock_stream, mock_pages):
+        mock_pages.side_effect = lambda repo, atype, **kw: iter([[{"type": atype}], [{"type": atype}]])
+        rendered = []
+        mock_stream.side_effect = lambda pages, atype, **kw: rendered.append((atype, list(pages)))
+        parser = build_parser()
+        args = parser.parse_args(["list", "--stream"])
+        args.func(args)
+        assert [atype for atype, _ in rendered] == ["code", "dep", "secret"]
+        assert all(len(pages) == 2 for _, pages in rendered)
+
+    @patch("ghsec.cli.iter_alert_pages")
+    @patch("ghsec.cli.print_error")
+    @patch("ghsec.cli.detect_repo", return_value="owner/repo")
+    def test_stream_api_error_continues(self, mock_detect, mock_err, mock_pages):
+        def pages(repo, atype, **kw):
+            if atype == "dep":
+                raise APIError("not enabled")
+            yield []
+
+        mock_pages.side_effect = pages
+        parser = build_parser()
+        args = parser.parse_args(["list", "--stream"])
+        args.func(args)
+        mock_err.assert_called_once()
+        assert mock_err.call_args[0][0].startswith("[dep]")
+
+    @pytest.mark.parametrize("error", [ValueError("malformed JSON"), OSError("reset"), SystemExit(1)])
+    @patch("ghsec.cli.iter_alert_pages")
+    @patch("ghsec.cli.detect_repo", return_value="owner/repo")
+    def test_other_errors_reach_the_caller(self, mock_detect, mock_pages, error):
+        def pages(repo, atype, **kw):
+            yield [{"number": 1}]
+            raise error
+
+        mock_pages.side_effect = pages
+        args = build_parser().parse_args(["--jsonl", "list-code"])
+        with pytest.raises(type(error)):
+            args.func(args)
+
+
+class TestCmdListJsonl:
+    @patch("ghsec.cli.iter_alert_pages")
+    @patch("ghsec.cli.detect_repo", return_value="owner/repo")
+    def test_lines_per_alert_in_type_order(self, mock_detect, mock_pages, capsys):
+        mock_pages.side_effect = lambda repo, atype, **kw: iter([[{"t": atype, "n": 1}], [{"t": atype, "n": 2}]])
+        parser = build_parser()
+        args = parser.parse_args(["--jsonl", "list"])
+        args.func(args)
+        rows = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+        assert [(r["t"], r["n"]) for r in rows] == [
+            ("code", 1), ("code", 2), ("dep", 1), ("dep", 2), ("secret", 1), ("secret", 2),
+        ]
+
+    @patch("ghsec.cli.get_alert", return_value=CODE_ALERT)
+    @patch("ghsec.cli.detect_repo", return_value="owner/repo")
+    def test_show_jsonl(self, mock_detect, mock_get, capsys):
+        parser = build_parser()
+        args = parser.parse_args(["--jsonl", "show", "code", "1"])
+        args.func(args)
+        out = capsys.readouterr().out
+        assert out.count("\n") == 1
+        assert json.loads(out) == CODE_ALERT
+
+
+class TestCmdListOrg:
+    @patch("ghsec.cli.iter_org_alert_pages")
+    @patch("ghsec.cli.print_alerts_table")
+    @patch("ghsec.cli.detect_repo")
+    def test_org_uses_org_endpoint(self, mock_detect, mock_table, mock_pages):
+        org_alert = dict(CODE_ALERT, repository={"full_name": "acme/web"})
+        mock_pages.return_value = iter([[org_alert], [org_alert]])
+        parser = build_parser()
+        args = parser.parse_args(["list-code", "--org", "acme", "--state", "open"])
+        args.func(args)
+        mock_detect.assert_not_called()
+        mock_pages.assert_called_once_with("acme", "code", state="open", severity=None, stream=True)
+        expected = to_records([org_alert, org_alert], "code")
+        mock_table.assert_called_once_with(expected, "code", show_repo=True)
+        assert expected[0].repo == "acme/web"
+
+    @patch("ghsec.cli.list_alerts")
+    @patch("ghsec.cli.print_json")
+    def test_repos_file_fans_out(self, mock_json, mock_api, tmp_path):
+        repos_file = tmp_path / "repos.txt"
+        repos_file.write_text("# platform\nacme/web\n\nacme/api  # backend\nacme/cli\n")
+        mock_api.side_effect = lambda repo, atype, **kw: [{"number": 1}]
+        parser = build_parser()
+        args = parser.parse_args(["--json", "list-deps", "--repos-file", str(repos_file), "--concurrency", "2"])
+        args.func(args)
+        assert sorted(c.args[0] for c in mock_api.call_args_list) == ["acme/api", "acme/cli", "acme/web"]
+        printed = mock_json.call_args[0][0]
+        assert sorted(a["repository"]["full_name"] for a in printed) == ["acme/api", "acme/cli", "acme/web"]
+
+    @patch("ghsec.cli.list_alerts")
+    @patch("ghsec.cli.print_alerts_table")
+    @patch("ghsec.cli.print_error")
+    def test_repos_file_skips_failing_repo(self, mock_err, mock_table, mock_api, tmp_path):
+        repos_file = tmp_path / "repos.txt"
+        repos_file.write_text("acme/web\nacme/legacy\n")
+
+        def fetch(repo, atype, **kw):
+            if repo == "acme/legacy":
+                raise APIError("not enabled")
+            return [{"number": 7}]
+
+        mock_api.side_effect = fetch
+        parser = build_parser()
+        args = parser.parse_args(["list-secrets", "--repos-file", str(repos_file)])
+        args.func(args)
+        assert "acme/legacy" in mock_err.call_args[0][0]
+        assert len(mock_table.call_args[0][0]) == 1
+
+    @patch("ghsec.graphql.gh_request")
+    @patch("ghsec.cli.list_alerts")
+    @patch("ghsec.cli.print_json")
+    def test_repos_file_graphql(self, mock_json, mock_rest, mock_gql, tmp_path):
+        repos_file = tmp_path / "repos.txt"
+        repos_file.write_text("acme/web\nacme/api\n")
+        node = {"number": 3, "state": "OPEN", "securityVulnerability": {"severity": "HIGH"}}
+        page = {"pageInfo": {"hasNextPage": False}, "nodes": [node]}
+        body = {"data": {"r0": {"vulnerabilityAlerts": page}, "r1": {"vulnerabilityAlerts": page}}}
+        mock_gql.return_value = json_response(body)
+        args = build_parser().parse_args(["--json", "list-deps", "--repos-file", str(repos_file), "--graphql"])
+        args.func(args)
+        mock_rest.assert_not_called()
+        assert mock_gql.call_count == 1
+        printed = mock_json.call_args[0][0]
+        assert [a["repository"]["full_name"] for a in printed] == ["acme/web", "acme/api"]
+
+    @patch("ghsec.cli.print_error")
+    def test_graphql_needs_repos_file(self, mock_err):
+        args = build_parser().parse_args(["--repo", "o/r", "list-deps", "--graphql"])
+        with pytest.raises(SystemExit):
+            args.func(args)
+
+    def test_org_and_repos_file_exclusive(self):
+        with pytest.raises(SystemExit):
+            build_parser().parse_args(["list", "--org", "acme", "--repos-file", "x"])
+
+    @patch("ghsec.cli.print_error")
+    def test_repo_and_org_conflict(self, mock_err):
+        args = build_parser().parse_args(["--repo", "o/r", "list", "--org", "acme"])
+        with pytest.raises(SystemExit):
+            args.func(args)
+
+    @patch("ghsec.cli.print_error")
+    def test_empty_repos_file(self, mock_err, tmp_path):
+        repos_file = tmp_path / "repos.txt"
+        repos_file.write_text("# nothing here\n")
+        args = build_parser().parse_args(["list", "--repos-file", str(repos_file)])
+        with pytest.raises(SystemExit):
+            args.func(args)
+
+
+class TestCmdSync:
+    @patch("ghsec.store.sync_alerts")
+    @patch("ghsec.store.AlertStore")
+    @patch("ghsec.cli.print_success")
+    @patch("ghsec.cli.detect_repo", return_value="owner/repo")
+    def test_sync_all_types(self, mock_detect, mock_success, mock_store, mock_sync):
+        mock_sync.side_effect = lambda store, repo, atype: {"type": atype, "changed": 1, "pages": 1, "total": 5}
+        parser = build_parser()
+        args = parser.parse_args(["sync"])
+        args.func(args)
+        assert sorted(c.args[2] for c in mock_sync.call_args_list) == ["code", "dep", "secret"]
+        assert [c.args[0].split("]")[0] for c in mock_success.call_args_list] == ["[code", "[dep", "[secret"]
+
+    @patch("ghsec.store.sync_alerts", side_effect=APIError("not enabled"))
+    @patch("ghsec.store.AlertStore")
+    @patch("ghsec.cli.print_json")
+    @patch("ghsec.cli.print_error")
+    @patch("ghsec.cli.detect_repo", return_value="owner/repo")
+    def test_sync_one_type_json(self, mock_detect, mock_err, mock_json, mock_store, mock_sync):
+        parser = build_parser()
+        args = parser.parse_args(["--json", "sync", "--type", "secret"])
+        args.func(args)
+        mock_err.assert_called_once()
+        mock_json.assert_called_once_with([])
+
+
+class TestCmdExport:
+    @patch("ghsec.cli.iter_alert_pages")
+    @patch("ghsec.cli.print_success")
+    @patch("ghsec.cli.detect_repo", return_value="owner/repo")
+    def test_streams_each_type(self, mock_detect, mock_success, mock_pages, tmp_path):
+        import sqlite3
+
+        pages = {"code": [[CODE_ALERT], [dict(CODE_ALERT, number=2)]], "dep": [[DEP_ALERT]], "secret": [[SECRET_ALERT]]}
+        mock_pages.side_effect = lambda repo, atype, **kw: iter(pages[atype])
+        out = tmp_path / "alerts.db"
+        args = build_parser().parse_args(["export", "--format", "sqlite", "-o", str(out), "--state", "open"])
+        args.func(args)
+        mock_pages.assert_any_call("owner/repo", "dep", state="open", severity=None, stream=True)
+        rows = sqlite3.connect(out).execute("SELECT type, number FROM alerts ORDER BY type, number").fetchall()
+        assert rows == [("code", 1), ("code", 2), ("dep", DEP_ALERT["number"]), ("secret", SECRET_ALERT["number"])]
+        mock_success.assert_called_once_with(f"Exported 4 alerts to {out}")
+
+    @patch("ghsec.cli.iter_org_alert_pages")
+    @patch("ghsec.cli.print_error")
+    @patch("ghsec.cli.print_success")
+    def test_org_csv_skips_failed_type(self, mock_success, mock_err, mock_pages, tmp_path):
+        def pages(org, atype, **kw):
+            if atype == "secret":
+                raise APIError("not enabled")
+            return iter([[dict(CODE_ALERT if atype == "code" else DEP_ALERT, repository={"full_name": "acme/web"})]])
+
+        mock_pages.side_effect = pages
+        out = tmp_path / "alerts.csv"
+        args = build_parser().parse_args(["export", "--org", "acme", "-o", str(out)])
+        args.func(args)
+        lines = out.read_text().splitlines()
+        assert len(lines) == 3 and all(line.startswith("acme/web,") for line in lines[1:])
+        assert "[secret]" in mock_err.call_args[0][0]
+
+    @patch("ghsec.cli.print_error")
+    @patch("ghsec.cli.detect_repo", return_value="owner/repo")
+    def test_parquet_to_stdout_rejected(self, mock_detect, mock_err):
+        args = build_parser().parse_args(["export", "--format", "parquet", "-o", "-"])
+        with pytest.raises(SystemExit):
+            args.func(args)
+
+
+class TestCmdDiff:
+    @patch("ghsec.cli.list_alerts")
+    @patch("ghsec.cli.print_json")
+    @patch("ghsec.cli.detect_repo", return_value="owner/repo")
+    def test_against_snapshot_and_save(self, mock_detect, mock_json, mock_api, tmp_path):
+        from ghsec.diff import load_snapshot, save_snapshot
+
+        old = tmp_path / "old.json"
+        save_snapshot(old, "owner/repo", to_records([CODE_ALERT, dict(CODE_ALERT, number=2)], "code", "owner/repo"))
+        mock_api.return_value = [dict(CODE_ALERT, state="fixed", updated_at="2025-03-01T00:00:00Z"),
+                                 dict(CODE_ALERT, number=2), dict(CODE_ALERT, number=3)]
+        new = tmp_path / "new.json"
+        parser = build_parser()
+        args = parser.parse_args(["--json", "diff", "--type", "code", "--against", str(old), "--save", str(new)])
+        args.func(args)
+        mock_api.assert_called_once_with("owner/repo", "code")
+        report = mock_json.call_args[0][0]
+        assert [a["number"] for a in report["new"]] == [3]
+        assert [a["number"] for a in report["fixed"]] == [1]
+        assert report["reopened"] == report["dismissed"] == report["removed"] == []
+        assert [r.number for r in load_snapshot(new)] == [1, 2, 3]
+
+    @patch("ghsec.cli.list_alerts")
+    @patch("ghsec.cli.print_alerts_table")
+    @patch("ghsec.cli.print_success")
+    @patch("ghsec.cli.detect_repo", return_value="owner/repo")
+    def test_against_last_sync(self, mock_detect, mock_success, mock_table, mock_api, tmp_path, monkeypatch):
+        from ghsec.store import AlertStore
+
+        monkeypatch.setenv("GHSEC_CACHE_DIR", str(tmp_path))
+        store = AlertStore()
+        store.upsert("owner/repo", "dep", [dict(DEP_ALERT, state="dismissed")])
+        store.set_high_water("owner/repo", "dep", "2025-01-01T00:00:00Z")
+        store.close()
+        mock_api.return_value = [DEP_ALERT]
+        parser = build_parser()
+        args = parser.parse_args(["diff", "--type", "dep"])
+        args.func(args)
+        assert [r.number for r in mock_table.call_args[0][0]] == [5]
+        mock_success.assert_called_once_with("[dep] 0 new, 0 fixed, 0 dismissed, 1 reopened")
+
+    @patch("ghsec.cli.print_error")
+    @patch("ghsec.cli.detect_repo", return_value="owner/repo")
+    def test_no_baseline(self, mock_detect, mock_err, tmp_path, monkeypatch):
+        monkeypatch.setenv("GHSEC_CACHE_DIR", str(tmp_path))
+        parser = build_parser()
+        args = parser.parse_args(["diff"])
+        with pytest.raises(SystemExit):
+            args.func(args)
+        assert "ghsec sync" in mock_err.call_args[0][0]
+
+
+class TestCmdWatch:
+    @patch("ghsec.cli.list_alerts")
+    @patch("ghsec.cli.print_jsonl")
+    @patch("ghsec.cli.detect_repo", return_value="owner/repo")
+    def test_prints_only_deltas(self, mock_detect, mock_jsonl, mock_api):
+        polls = iter([
+            [CODE_ALERT],
+            [CODE_ALERT],
+            [dict(CODE_ALERT, state="dismissed", updated_at="2025-03-01T00:00:00Z"), dict(CODE_ALERT, number=9)],
+        ])
+        mock_api.side_effect = lambda *a, **kw: next(polls)
+        args = build_parser().parse_args(
+            ["--jsonl", "watch", "--type", "code", "--polls", "3", "--interval", "0.01", "--min-interval", "0.01"]
+        )
+        args.func(args)
+        assert mock_api.call_count == 3
+        mock_api.assert_called_with("owner/repo", "code", state=None, severity=None)
+        lines = list(mock_jsonl.call_args[0][0])
+        assert [(line["change"], line["number"]) for line in lines] == [("new", 9), ("dismissed", 1)]
+        mock_jsonl.assert_called_once()
+
+    @patch("ghsec.cli.list_alerts")
+    @patch("ghsec.cli.print_alerts_table")
+    @patch("ghsec.cli.print_heading")
+    @patch("ghsec.cli.print_error")
+    @patch("ghsec.cli.detect_repo", return_value="owner/repo")
+    def test_failed_poll_keeps_baseline(self, mock_detect, mock_err, mock_heading, mock_table, mock_api):
+        polls = iter([[DEP_ALERT], APIError("boom"), [DEP_ALERT]])
+
+        def fetch(*a, **kw):
+            result = next(polls)
+            if isinstance(result, Exception):
+                raise result
+            return result
+
+        mock_api.side_effect = fetch
+        args = build_parser().parse_args(
+            ["watch", "--type", "dep", "--polls", "3", "--interval", "0.01", "--min-interval", "0.01"]
+        )
+        args.func(args)
+        mock_err.assert_called_once()
+        mock_table.assert_not_called()  # neither "removed" nor "new" after the blip
+
+    @patch("ghsec.cli.print_error")
+    @patch("ghsec.cli.detect_repo", return_value="owner/repo")
+    def test_bad_intervals(self, mock_detect, mock_err):
+        args = build_parser().parse_args(["watch", "--interval", "5", "--min-interval", "10"])
+        with pytest.raises(SystemExit):
+            args.func(args)
+
+    def test_polls_are_conditional_without_disk_cache(self, fake_transport):
+        def answer(method, endpoint, headers):
+            if headers.get("If-None-Match") == '"v1"':
+                return Response(304, {}, b"")
+            return json_response([CODE_ALERT], etag='"v1"')
+
+        transport = fake_transport(handler=answer)
+        args = build_parser().parse_args(
+            ["--repo", "o/r", "watch", "--type", "code", "--polls", "3", "--interval", "0.01", "--min-interval", "0.01"]
+        )
+        args.func(args)
+        assert ["If-None-Match" in headers for _, _, headers in transport.requests] == [False, True, True]
+
+
 class TestCmdShow:
     @patch("ghsec.cli.get_alert", return_value=CODE_ALERT)
     @patch("ghsec.cli.print_alert_detail")
@@ -142,7 +584,7 @@ class TestCmdShow:
         parser = build_parser()
         args = parser.parse_args(["show", "code", "1"])
         args.func(args)
-        mock_api.assert_called_once_with("owner/repo", "code", 1)
+        mock_api.assert_called_once_with("owner/repo", "code", 1, max_age=60)
         mock_detail.assert_called_once_with(CODE_ALERT, "code")
 
     @patch("ghsec.cli.get_alert", return_value=DEP_ALERT)
@@ -162,6 +604,125 @@ class TestCmdShow:
         with pytest.raises(SystemExit):
             args.func(args)
 
+    def test_parse_targets(self):
+        targets = parse_show_targets(["code", "3-4,1", "dep:7", "2", "secret", "5", "code:3"])
+        assert targets == [("code", 3), ("code", 4), ("code", 1), ("dep", 7), ("code", 2), ("secret", 5)]
+
+    def test_parse_targets_needs_type(self):
+        with pytest.raises(argparse.ArgumentTypeError, match="needs a type"):
+            parse_show_targets(["5"])
+
+    def test_bad_token_rejected_by_parser(self):
+        with pytest.raises(SystemExit):
+            build_parser().parse_args(["show", "vuln:5"])
+
+    @patch("ghsec.cli.get_alert")
+    @patch("ghsec.cli.print_json")
+    @patch("ghsec.cli.detect_repo", return_value="owner/repo")
+    def test_batch_json_in_input_order(self, mock_detect, mock_json, mock_api):
+        def fetch(repo, atype, alert_id, max_age=None):
+            time.sleep(0.02 if alert_id == 3 else 0)  # the first alert finishes last
+            return {"number": alert_id, "type": atype}
+
+        mock_api.side_effect = fetch
+        args = build_parser().parse_args(["--json", "show", "code", "3", "dep:1", "secret:2"])
+        args.func(args)
+        assert mock_json.call_args[0][0] == [
+            {"number": 3, "type": "code"}, {"number": 1, "type": "dep"}, {"number": 2, "type": "secret"},
+        ]
+
+    @patch("ghsec.cli.get_alert")
+    @patch("ghsec.cli.print_alert_detail")
+    @patch("ghsec.cli.print_error")
+    @patch("ghsec.cli.detect_repo", return_value="owner/repo")
+    def test_batch_failure_keeps_others(self, mock_detect, mock_err, mock_detail, mock_api):
+        def fetch(repo, atype, alert_id, max_age=None):
+            if alert_id == 2:
+                raise APIError("not found")
+            return CODE_ALERT
+
+        mock_api.side_effect = fetch
+        args = build_parser().parse_args(["show", "code", "1-3"])
+        with pytest.raises(SystemExit):
+            args.func(args)
+        assert mock_detail.call_count == 2
+        assert "code alert #2: not found" in mock_err.call_args_list[0][0][0]
+        assert "2 of 3" in mock_err.call_args_list[1][0][0]
+
+
+class TestShowInstances:
+    @patch("ghsec.cli.iter_alert_instances")
+    @patch("ghsec.cli.get_alert", return_value=CODE_ALERT)
+    @patch("ghsec.cli.print_json")
+    @patch("ghsec.cli.detect_repo", return_value="owner/repo")
+    def test_json_embeds_instances(self, mock_detect, mock_json, mock_get, mock_instances):
+        mock_instances.return_value = iter([[{"ref": "refs/heads/main"}], [{"ref": "refs/heads/dev"}]])
+        args = build_parser().parse_args(["--json", "show", "code", "1", "--instances"])
+        args.func(args)
+        mock_instances.assert_called_once_with("owner/repo", "code", 1)
+        printed = mock_json.call_args[0][0]
+        assert printed["number"] == CODE_ALERT["number"]
+        assert [i["ref"] for i in printed["instances"]] == ["refs/heads/main", "refs/heads/dev"]
+
+    @patch("ghsec.cli.iter_alert_instances")
+    @patch("ghsec.cli.get_alert", return_value=SECRET_ALERT)
+    @patch("ghsec.cli.print_alert_detail")
+    @patch("ghsec.cli.print_instances_stream")
+    @patch("ghsec.cli.detect_repo", return_value="owner/repo")
+    def test_table_streams_pages(self, mock_detect, mock_stream, mock_detail, mock_get, mock_instances):
+        mock_instances.return_value = iter([[{"type": "commit"}], [{"type": "commit"}]])
+        mock_stream.side_effect = lambda pages, atype: mock_stream.pages.extend(pages)
+        mock_stream.pages = []
+        args = build_parser().parse_args(["show", "secret", "2", "--instances"])
+        args.func(args)
+        mock_detail.assert_called_once_with(SECRET_ALERT, "secret")
+        assert mock_stream.pages == [[{"type": "commit"}], [{"type": "commit"}]]
+
+    @patch("ghsec.cli.iter_alert_instances")
+    @patch("ghsec.cli.get_alert", return_value=CODE_ALERT)
+    @patch("ghsec.cli.print_json")
+    @patch("ghsec.cli.detect_repo", return_value="owner/repo")
+    def test_instance_failure_raised(self, mock_detect, mock_json, mock_get, mock_instances):
+        def pages():
+            yield [{"ref": "refs/heads/main"}]
+            raise ValueError("malformed JSON")
+
+        mock_instances.return_value = pages()
+        args = build_parser().parse_args(["--json", "show", "code", "1", "--instances"])
+        with pytest.raises(ValueError):
+            args.func(args)
+
+    @patch("ghsec.cli.iter_alert_instances")
+    @patch("ghsec.cli.get_alert", side_effect=APIError("Not Found"))
+    @patch("ghsec.cli.print_error")
+    @patch("ghsec.cli.detect_repo", return_value="owner/repo")
+    def test_alert_failure_stops_crawl(self, mock_detect, mock_err, mock_get, mock_instances):
+        crawled = []
+        closed = threading.Event()
+
+        def pages():
+            try:
+                for n in range(1000):
+                    crawled.append(n)
+                    time.sleep(0.001)
+                    yield [{"ref": f"refs/heads/b{n}"}]
+            finally:
+                closed.set()
+
+        mock_instances.return_value = pages()
+        args = build_parser().parse_args(["show", "code", "1", "--instances"])
+        with pytest.raises(SystemExit):
+            args.func(args)
+        assert closed.is_set()
+        assert len(crawled) < 1000
+
+    @patch("ghsec.cli.print_error")
+    @patch("ghsec.cli.detect_repo", return_value="owner/repo")
+    def test_dep_has_no_instances(self, mock_detect, mock_err):
+        args = build_parser().parse_args(["show", "dep", "1", "--instances"])
+        with pytest.raises(SystemExit):
+            args.func(args)
+
 
 class TestCmdDismiss:
     @patch("ghsec.cli.update_alert", return_value={})
@@ -215,6 +776,82 @@ class TestCmdDismiss:
             args.func(args)
 
 
+class TestParseIdSpec:
+    def test_single(self):
+        assert parse_id_spec("7") == [7]
+
+    def test_ranges_and_lists(self):
+        assert parse_id_spec("1-3,7,10-11") == [1, 2, 3, 7, 10, 11]
+
+    def test_invalid(self):
+        with pytest.raises(argparse.ArgumentTypeError):
+            parse_id_spec("abc")
+
+    def test_reversed_range(self):
+        with pytest.raises(argparse.ArgumentTypeError):
+            parse_id_spec("5-2")
+
+
+class TestBulkUpdate:
+    @patch("ghsec.cli.update_alert", return_value={})
+    @patch("ghsec.cli.print_success")
+    @patch("ghsec.cli.detect_repo", return_value="owner/repo")
+    def test_dismiss_range(self, mock_detect, mock_success, mock_update):
+        parser = build_parser()
+        args = parser.parse_args(["dismiss", "code", "1-3,5", "3", "--reason", "false_positive"])
+        args.func(args)
+        assert sorted(c.args[2] for c in mock_update.call_args_list) == [1, 2, 3, 5]
+        assert all(c.args[3]["dismissed_reason"] == "false positive" for c in mock_update.call_args_list)
+        mock_success.assert_called_once_with("Dismissed 4 code alerts")
+
+    @patch("ghsec.cli.update_alert")
+    @patch("ghsec.cli.print_error")
+    @patch("ghsec.cli.detect_repo", return_value="owner/repo")
+    def test_partial_failure_summary(self, mock_detect, mock_err, mock_update):
+        def patch_alert(repo, atype, alert_id, fields):
+            if alert_id == 2:
+                raise APIError("not found")
+            return {}
+
+        mock_update.side_effect = patch_alert
+        parser = build_parser()
+        args = parser.parse_args(["reopen", "dep", "1-3"])
+        with pytest.raises(SystemExit):
+            args.func(args)
+        messages = [c.args[0] for c in mock_err.call_args_list]
+        assert messages == ["dep alert #2: not found", "Reopened 2 of 3 dep alerts; 1 failed"]
+
+    @patch("ghsec.cli.update_alert", return_value={})
+    @patch("ghsec.cli.print_success")
+    @patch("ghsec.cli.detect_repo", return_value="owner/repo")
+    def test_ids_from_stdin(self, mock_detect, mock_success, mock_update, monkeypatch):
+        monkeypatch.setattr("sys.stdin", io.StringIO("4\n8,9\n"))
+        parser = build_parser()
+        args = parser.parse_args(["reopen", "secret"])
+        args.func(args)
+        assert sorted(c.args[2] for c in mock_update.call_args_list) == [4, 8, 9]
+
+    @patch("ghsec.cli.update_alert")
+    @patch("ghsec.cli.print_error")
+    @patch("ghsec.cli.detect_repo", return_value="owner/repo")
+    def test_empty_stdin_exits(self, mock_detect, mock_err, mock_update, monkeypatch):
+        monkeypatch.setattr("sys.stdin", io.StringIO(""))
+        args = build_parser().parse_args(["dismiss", "code", "--reason", "false_positive"])
+        with pytest.raises(SystemExit) as exc:
+            args.func(args)
+        assert exc.value.code == 1
+        assert "No alert IDs given" in mock_err.call_args[0][0]
+        mock_update.assert_not_called()
+
+    @patch("ghsec.cli.print_error")
+    @patch("ghsec.cli.detect_repo", return_value="owner/repo")
+    def test_invalid_id_exits(self, mock_detect, mock_err):
+        parser = build_parser()
+        args = parser.parse_args(["reopen", "code", "1-x"])
+        with pytest.raises(SystemExit):
+            args.func(args)
+
+
 class TestCmdReopen:
     @patch("ghsec.cli.update_alert", return_value={})
     @patch("ghsec.cli.print_success")
@@ -243,3 +880,30 @@ class TestMain:
     def test_no_command_exits(self):
         with pytest.raises(SystemExit):
             main()
+
+    @patch("sys.argv", ["ghsec", "--offline", "--no-cache", "list"])
+    def test_offline_conflicts_with_no_cache(self):
+        with pytest.raises(SystemExit):
+            main()
+
+    @patch("sys.argv", ["ghsec", "--offline", "--repo", "o/r", "show", "code", "1"])
+    @patch("ghsec.cli.get_alert", return_value=CODE_ALERT)
+    @patch("ghsec.cli.print_alert_detail")
+    @patch("ghsec.cli.configure_cache")
+    def test_offline_configures_cache(self, mock_configure, mock_detail, mock_get):
+        main()
+        mock_configure.assert_called_once_with(enabled=True, offline=True)
+
+    @patch("ghsec.cli.print_alert_detail")
+    def test_trace_and_timings(self, mock_detail, tmp_path, capsys, fake_transport):
+        fake_transport(json_response(CODE_ALERT, x_ratelimit_remaining="4990"))
+        out = tmp_path / "trace.json"
+        with patch("sys.argv", ["ghsec", "--repo", "o/r", "--trace", str(out), "--timings", "show", "code", "1"]):
+            main()
+        events = json.loads(out.read_text())["traceEvents"]
+        names = {e["name"] for e in events if e["ph"] == "X"}
+        assert {"ghsec show", "get_alert", "request", "json"} <= names
+        assert any(e["ph"] == "C" and e["args"]["value"] == 4990 for e in events)
+        err = capsys.readouterr().err
+        assert "1 request" in err
+        assert "rate limit 4990 remaining" in err
@@ -0,0 +1,164 @@
+"""Tests for ghsec.daemon and ghsec.client modules."""
+
+import io
+import json
+import os
+import shutil
+import tempfile
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from ghsec import api, client, trace
+from ghsec.daemon import DaemonServer, _claim, run_command
+from ghsec.transport import Response
+from test.fixtures import CODE_ALERT, json_response
+
+
+def _answer(method, endpoint, headers):
+    if endpoint.endswith("/404"):
+        return Response(404, {}, b'{"message": "Not Found"}')
+    return json_response([CODE_ALERT] if "?" in endpoint else CODE_ALERT)
+
+
+@pytest.fixture
+def daemon(monkeypatch, fake_transport):
+    # AF_UNIX paths are limited to ~100 bytes, too short for pytest's tmp_path.
+    directory = tempfile.mkdtemp(prefix="ghsec-", dir="/tmp")
+    path = os.path.join(directory, "d.sock")
+    monkeypatch.setenv("GHSEC_SOCKET", path)
+    monkeypatch.delenv("GHSEC_NO_DAEMON")
+    transport = fake_transport(handler=_answer)
+    server = DaemonServer(path)
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    yield transport
+    server.shutdown()
+    server.server_close()
+    shutil.rmtree(directory, ignore_errors=True)
+
+
+def _forward(argv):
+    out, err = io.StringIO(), io.StringIO()
+    code = client.forward(argv, stdout=out, stderr=err)
+    return code, out.getvalue(), err.getvalue()
+
+
+# --- forwarding ---
+
+
+class TestForward:
+    def test_json_output_and_exit_code(self, daemon):
+        code, out, err = _forward(["--json", "--repo", "o/r", "list-code"])
+        assert code == 0
+        assert json.loads(out)[0]["number"] == CODE_ALERT["number"]
+        assert err == ""
+
+    def test_state_kept_between_commands(self, daemon):
+        for _ in range(2):
+            assert _forward(["--json", "--repo", "o/r", "show", "code", "1"])[0] == 0
+        assert daemon.endpoints == ["/repos/o/r/code-scanning/alerts/1"] * 2
+        assert api.get_transport() is daemon  # the same warm transport answered both
+
+    def test_errors_and_exit_status(self, daemon):
+        code, out, err = _forward(["--repo", "o/r", "show", "code", "404"])
+        assert code == 1
+        assert "Not found" in err
+
+    def test_argparse_errors(self, daemon):
+        code, _, err = _forward(["list", "--state", "bogus"])
+        assert code == 2
+        assert "invalid choice" in err
+
+    def test_runs_in_client_cwd(self, daemon, tmp_path):
+        with patch("ghsec.cli.detect_repo", side_effect=lambda: os.path.basename(os.getcwd())) as detect:
+            with patch("os.getcwd", return_value=str(tmp_path)):
+                code, out, _ = _forward(["--json", "list-code"])
+        assert code == 0
+        assert detect.call_count == 1
+        assert daemon.endpoints[0].startswith(f"/repos/{tmp_path.name}/")
+
+    def test_table_output(self, daemon):
+        code, out, _ = _forward(["--repo", "o/r", "list-code"])
+        assert code == 0
+        assert str(CODE_ALERT["number"]) in out
+
+
+class TestFallback:
+    def test_no_daemon(self, monkeypatch):
+        monkeypatch.delenv("GHSEC_NO_DAEMON")
+        monkeypatch.setenv("GHSEC_SOCKET", "/nonexistent/ghsec.sock")
+        assert client.forward(["list"]) is None
+
+    def test_disabled_by_env(self, daemon, monkeypatch):
+        monkeypatch.setenv("GHSEC_NO_DAEMON", "1")
+        assert client.forward(["list"]) is None
+
+    def test_local_commands_not_forwarded(self, daemon):
+        assert client.forward(["dismiss", "code", "1", "--reason", "wont_fix"]) is None
+        assert client.forward(["list", "--repos-file", "-"]) is None
+        assert daemon.endpoints == []
+
+    def test_watch_runs_standalone(self, monkeypatch):
+        monkeypatch.delenv("GHSEC_NO_DAEMON")
+        assert not client._should_forward(["watch"])
+        assert not client._should_forward(["--repo", "o/r", "watch", "--type", "code"])
+
+    def test_version_mismatch(self, daemon):
+        with patch("ghsec.client.__version__", "0.0.0"):
+            assert client.forward(["--json", "--repo", "o/r", "list-code"]) is None
+        assert daemon.endpoints == []
+
+    def test_different_environment(self, daemon):
+        with patch("ghsec.client.forwarded_env", return_value={"GH_TOKEN": "someone-else"}):
+            assert client.forward(["--json", "--repo", "o/r", "list-code"]) is None
+        assert daemon.endpoints == []
+
+    @patch("ghsec.cli.main")
+    def test_main_runs_standalone(self, mock_main, monkeypatch):
+        monkeypatch.setattr("sys.argv", ["ghsec", "list"])
+        client.main()
+        mock_main.assert_called_once()
+
+
+# --- socket ---
+
+
+class TestSocket:
+    def test_bound_private(self):
+        directory = tempfile.mkdtemp(prefix="ghsec-", dir="/tmp")
+        path = os.path.join(directory, "d.sock")
+        previous = os.umask(0o022)
+        try:
+            server = DaemonServer(path)
+            assert os.stat(path).st_mode & 0o777 == 0o600
+            assert os.umask(0o022) == 0o022  # restored after bind
+            server.server_close()
+        finally:
+            os.umask(previous)
+            shutil.rmtree(directory, ignore_errors=True)
+
+    def test_claim_creates_private_dir(self, tmp_path):
+        _claim(str(tmp_path / "ghsec" / "daemon.sock"))
+        assert (tmp_path / "ghsec").stat().st_mode & 0o777 == 0o700
+
+
+# --- run_command ---
+
+
+class TestRunCommand:
+    def test_no_command(self, capsys):
+        assert run_command([]) == 1
+        assert "usage" in capsys.readouterr().out
+
+    def test_tracing_ends_with_the_command(self, capsys, fake_transport):
+        fake_transport(handler=_answer)
+        assert run_command(["--timings", "--json", "--repo", "o/r", "show", "code", "1"]) == 0
+        assert trace.get_tracer() is None
+
+    def test_no_cache_restores_default(self, fake_transport):
+        fake_transport(handler=_answer)
+        with patch("ghsec.daemon.api.configure_cache") as configure:
+            assert run_command(["--no-cache", "--json", "--repo", "o/r", "show", "code", "1"]) == 0
+        assert [c.kwargs for c in configure.call_args_list] == [{"enabled": False, "offline": False}, {}]
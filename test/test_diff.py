@@ -0,0 +1,67 @@
+"""Tests for ghsec.diff module."""
+
+import json
+
+import pytest
+
+from ghsec.diff import diff_alerts, load_snapshot, save_snapshot
+from test.fixtures import alert_record
+
+
+def _numbers(changes):
+    return {change: [r.number for r in records] for change, records in changes.items() if records}
+
+
+class TestDiffAlerts:
+    def test_classifies_changes(self):
+        before = [alert_record(1), alert_record(2), alert_record(3, "dismissed"), alert_record(4), alert_record(5), alert_record(6, "fixed")]
+        after = [
+            alert_record(1),
+            alert_record(2, "fixed", "2025-01-02T00:00:00Z"),
+            alert_record(3, "open", "2025-01-02T00:00:00Z"),
+            alert_record(4, "dismissed", "2025-01-02T00:00:00Z"),
+            alert_record(6, "fixed"),
+            alert_record(7),
+            alert_record(8, "fixed"),
+        ]
+        assert _numbers(diff_alerts(before, after)) == {
+            "new": [7], "fixed": [2], "dismissed": [4], "reopened": [3], "removed": [5],
+        }
+
+    def test_secret_resolution_counts_as_fixed(self):
+        changes = diff_alerts([alert_record(1, atype="secret")], [alert_record(1, "resolved", "2025-02-01T00:00:00Z", atype="secret")])
+        assert _numbers(changes) == {"fixed": [1]}
+
+    def test_same_number_different_type_or_repo(self):
+        before = [alert_record(1, atype="code"), alert_record(1, repo="o/other")]
+        after = [alert_record(1, atype="dep"), alert_record(1, repo="o/other")]
+        changes = diff_alerts(before, after)
+        assert [(r.type, r.repo) for r in changes["new"]] == [("dep", "o/r")]
+        assert [(r.type, r.repo) for r in changes["removed"]] == [("code", "o/r")]
+
+    def test_touched_without_state_change_is_not_reported(self):
+        assert _numbers(diff_alerts([alert_record(1)], [alert_record(1, updated="2025-03-01T00:00:00Z")])) == {}
+
+    def test_large_sets(self):
+        before = [alert_record(i) for i in range(50_000)]
+        after = [alert_record(i, "fixed", "2025-02-01T00:00:00Z") if i % 10 == 0 and i < 50_000 else alert_record(i)
+                 for i in range(1, 50_001)]
+        changes = diff_alerts(before, after)
+        assert len(changes["fixed"]) == 4_999
+        assert [r.number for r in changes["new"]] == [50_000]
+        assert [r.number for r in changes["removed"]] == [0]
+
+
+class TestSnapshot:
+    def test_round_trip(self, tmp_path):
+        path = tmp_path / "snap.json"
+        records = [alert_record(1), alert_record(2, "dismissed", atype="dep")]
+        save_snapshot(path, "o/r", records)
+        assert load_snapshot(path) == records
+        assert json.loads(path.read_text())["repo"] == "o/r"
+
+    def test_rejects_other_json(self, tmp_path):
+        path = tmp_path / "alerts.json"
+        path.write_text("[]")
+        with pytest.raises(ValueError, match="not a ghsec snapshot"):
+            load_snapshot(path)
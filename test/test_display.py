@@ -1,16 +1,19 @@
 """Tests for ghsec.display module."""
 
+import json
 from io import StringIO
 
 from rich.console import Console
 
 from ghsec.display import (
-    _extract_description,
-    _extract_severity,
     _severity_label,
     print_alert_detail,
+    print_alerts_stream,
     print_alerts_table,
+    print_instances_stream,
+    print_jsonl,
 )
+from ghsec.records import to_records
 from test.fixtures import (
     CODE_ALERT,
     CODE_ALERT_MINIMAL,
@@ -54,57 +57,6 @@ class TestSeverityLabel:
         assert _severity_label("unknown") == "unknown"
 
 
-# --- _extract_severity ---
-
-
-class TestExtractSeverity:
-    def test_code_with_security_level(self):
-        assert _extract_severity(CODE_ALERT, "code") == "high"
-
-    def test_code_fallback_to_severity(self):
-        alert = {"rule": {"severity": "warning"}}
-        assert _extract_severity(alert, "code") == "warning"
-
-    def test_code_empty_rule(self):
-        assert _extract_severity({"rule": {}}, "code") is None
-
-    def test_dep(self):
-        assert _extract_severity(DEP_ALERT, "dep") == "critical"
-
-    def test_dep_fallback_advisory(self):
-        alert = {"security_advisory": {"severity": "medium"}}
-        assert _extract_severity(alert, "dep") == "medium"
-
-    def test_secret_returns_none(self):
-        assert _extract_severity(SECRET_ALERT, "secret") is None
-
-    def test_empty_alert(self):
-        assert _extract_severity({}, "code") is None
-
-
-# --- _extract_description ---
-
-
-class TestExtractDescription:
-    def test_code(self):
-        assert _extract_description(CODE_ALERT, "code") == "SQL query built from user-controlled sources"
-
-    def test_code_fallback_to_id(self):
-        assert _extract_description(CODE_ALERT_MINIMAL, "code") == "py/unused-import"
-
-    def test_dep(self):
-        assert _extract_description(DEP_ALERT, "dep") == "Remote code execution in lodash"
-
-    def test_secret(self):
-        assert _extract_description(SECRET_ALERT, "secret") == "GitHub Personal Access Token"
-
-    def test_secret_fallback(self):
-        assert _extract_description(SECRET_ALERT_MINIMAL, "secret") == "custom_secret"
-
-    def test_empty_alert(self):
-        assert _extract_description({}, "code") == ""
-
-
 # --- print_alerts_table ---
 
 
@@ -131,6 +83,142 @@ class TestPrintAlertsTable:
         assert "GitHub Personal Access Token" in output
 
 
+class TestRepoColumn:
+    def test_table_repo_column(self):
+        alert = dict(CODE_ALERT, repository={"full_name": "acme/web"})
+        output = _capture(print_alerts_table, [alert], "code", show_repo=True)
+        assert "Repo" in output
+        assert "acme/web" in output
+
+    def test_no_repo_column_by_default(self):
+        output = _capture(print_alerts_table, [CODE_ALERT], "code")
+        assert "Repo" not in output
+
+    def test_stream_repo_column(self):
+        alert = dict(DEP_ALERT, repository={"full_name": "acme/api"})
+        output = _capture(print_alerts_stream, iter([[alert]]), "dep", show_repo=True)
+        assert "acme/api" in output
+
+
+# --- print_alerts_stream ---
+
+
+class TestPrintAlertsStream:
+    def test_no_pages(self):
+        output = _capture(print_alerts_stream, iter([]), "code")
+        assert "No alerts found" in output
+
+    def test_empty_pages(self):
+        output = _capture(print_alerts_stream, iter([[], []]), "dep")
+        assert "No alerts found" in output
+
+    def test_header_printed_once(self):
+        output = _capture(print_alerts_stream, iter([[CODE_ALERT], [CODE_ALERT_MINIMAL]]), "code")
+        assert output.count("Severity") == 1
+        assert "SQL query" in output
+        assert "py/unused-import" in output
+
+    def test_rows_emitted_before_later_pages(self):
+        seen = []
+
+        def pages():
+            yield [DEP_ALERT]
+            seen.append("lodash" in buf.getvalue())
+            yield [DEP_ALERT_NO_PATCH]
+
+        buf = StringIO()
+        import ghsec.display as mod
+        orig = mod.console
+        mod.console = Console(file=buf, force_terminal=True, width=120)
+        try:
+            print_alerts_stream(pages(), "dep")
+        finally:
+            mod.console = orig
+        assert seen == [True]
+
+    def test_column_widths_stable(self):
+        short = dict(CODE_ALERT_MINIMAL, number=1)
+        wide = dict(CODE_ALERT_MINIMAL, number=123456)
+        output = _capture(print_alerts_stream, iter([[short], [wide]]), "code")
+        rows = [line for line in output.splitlines() if "py/unused-import" in line]
+        assert len(rows) == 2
+        assert rows[0].index("py/unused-import") == rows[1].index("py/unused-import")
+
+
+# --- print_instances_stream ---
+
+
+class TestPrintInstancesStream:
+    def _instance(self, ref, path, line):
+        return {"ref": ref, "state": "open", "commit_sha": "abcdef1234", "location": {"path": path, "start_line": line}}
+
+    def test_groups_by_ref_and_path(self):
+        page = [
+            self._instance("refs/heads/main", "src/b.py", 3),
+            self._instance("refs/heads/dev", "src/a.py", 1),
+            self._instance("refs/heads/main", "src/b.py", 9),
+            self._instance("refs/heads/main", "src/a.py", 5),
+        ]
+        output = _capture(print_instances_stream, iter([page]), "code")
+        assert output.count("refs/heads/main") == 1
+        assert output.count("src/b.py") == 1
+        assert output.index("refs/heads/dev") < output.index("refs/heads/main")
+        assert "abcdef1" in output and "abcdef12" not in output
+        assert "4 instances in 3 paths across 2 refs" in output
+
+    def test_secret_locations(self):
+        pages = iter([
+            [{"type": "commit", "details": {"path": ".env", "start_line": 2, "commit_sha": "1234567890"}}],
+            [{"type": "issue_comment", "details": {"issue_comment_url": "https://api.github.com/x/comments/1"}}],
+        ])
+        output = _capture(print_instances_stream, pages, "secret")
+        assert ".env" in output and "comments/1" in output
+        assert "2 instances in 2 paths across 2 location types" in output
+
+    def test_empty(self):
+        assert "No instances found" in _capture(print_instances_stream, iter([[]]), "code")
+
+
+# --- AlertRecord input ---
+
+
+class TestRecordsRender:
+    def test_table_from_records(self):
+        records = to_records([CODE_ALERT, CODE_ALERT_MINIMAL], "code")
+        assert _capture(print_alerts_table, records, "code") == _capture(
+            print_alerts_table, [CODE_ALERT, CODE_ALERT_MINIMAL], "code"
+        )
+
+    def test_repo_column_from_record(self):
+        records = to_records([DEP_ALERT], "dep", repo="acme/web")
+        out = _capture(print_alerts_table, records, "dep", show_repo=True)
+        assert "acme/web" in out
+
+
+# --- print_jsonl ---
+
+
+class TestPrintJsonl:
+    def test_one_compact_line_per_alert(self, capsys):
+        print_jsonl([CODE_ALERT, DEP_ALERT])
+        lines = capsys.readouterr().out.splitlines()
+        assert len(lines) == 2
+        assert json.loads(lines[0]) == CODE_ALERT
+        assert json.loads(lines[1]) == DEP_ALERT
+        assert ": " not in lines[0]
+
+    def test_empty(self, capsys):
+        print_jsonl([])
+        assert capsys.readouterr().out == ""
+
+    def test_stdlib_fallback(self, capsys, monkeypatch):
+        import ghsec.display as mod
+        monkeypatch.setitem(__import__("sys").modules, "orjson", None)
+        monkeypatch.setattr(mod, "_encode", None)
+        print_jsonl([{"number": 1, "desc": "caf\u00e9"}])
+        assert capsys.readouterr().out == '{"number":1,"desc":"caf\u00e9"}\n'
+
+
 # --- print_alert_detail ---
 
 
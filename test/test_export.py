@@ -0,0 +1,96 @@
+"""Tests for ghsec.export module."""
+
+import csv
+import io
+import sqlite3
+import tracemalloc
+from unittest.mock import patch
+
+import pytest
+
+from ghsec.export import COLUMNS, ExportError, export_pages, open_writer
+from ghsec.records import AlertRecord
+from ghsec.synthetic import make_alert
+from test.fixtures import CODE_ALERT, DEP_ALERT, synthetic_pages
+
+
+# --- writers ---
+
+
+class TestCsv:
+    def test_columns_match_records(self, tmp_path):
+        path = tmp_path / "alerts.csv"
+        writer = open_writer("csv", str(path))
+        assert export_pages(writer, [[DEP_ALERT]], "dep", "o/r") == 1
+        writer.close()
+        rows = list(csv.DictReader(path.open()))
+        expected = AlertRecord.from_api(DEP_ALERT, "dep", "o/r")
+        assert tuple(rows[0]) == COLUMNS
+        assert rows[0]["severity"] == expected.severity
+        assert rows[0]["description"] == expected.description
+        assert rows[0]["package"] == expected.package
+
+    def test_stdout(self):
+        out = io.StringIO()
+        with patch("sys.stdout", out):
+            writer = open_writer("csv", "-")
+            export_pages(writer, [[CODE_ALERT]], "code", "o/r")
+            writer.close()
+        assert out.getvalue().splitlines()[0].startswith("repo,type,number")
+
+
+class TestSqlite:
+    def test_batched_inserts_and_reexport(self, tmp_path):
+        path = str(tmp_path / "alerts.db")
+        for _ in range(2):  # a second export replaces rows instead of duplicating them
+            writer = open_writer("sqlite", path)
+            assert export_pages(writer, synthetic_pages("code", 3), "code", "acme/web") == 300
+            writer.close()
+        conn = sqlite3.connect(path)
+        assert conn.execute("SELECT count(*) FROM alerts").fetchone() == (300,)
+        row = conn.execute("SELECT repo, type, number, severity, rule FROM alerts WHERE number = 7").fetchone()
+        expected = AlertRecord.from_api(make_alert("code", 7, "acme/web"), "code", "acme/web")
+        assert row == ("acme/web", "code", 7, expected.severity, expected.rule)
+
+    def test_rejects_stdout(self):
+        with pytest.raises(ExportError):
+            open_writer("sqlite", "-")
+
+    def test_unwritable(self, tmp_path):
+        with pytest.raises(ExportError, match="Cannot write"):
+            open_writer("sqlite", str(tmp_path / "missing" / "alerts.db"))
+
+
+class TestParquet:
+    def test_row_groups(self, tmp_path):
+        pq = pytest.importorskip("pyarrow.parquet")
+        from ghsec.export import ParquetWriter
+
+        path = str(tmp_path / "alerts.parquet")
+        writer = ParquetWriter(path, row_group_size=250)
+        export_pages(writer, synthetic_pages("dep", 6), "dep", "acme/web")
+        writer.close()
+        parquet = pq.ParquetFile(path)
+        assert parquet.metadata.num_rows == 600
+        assert parquet.metadata.num_row_groups == 3
+        assert parquet.schema_arrow.names == list(COLUMNS)
+
+    def test_missing_pyarrow(self, tmp_path):
+        with patch.dict("sys.modules", {"pyarrow": None, "pyarrow.parquet": None}):
+            with pytest.raises(ExportError, match="pyarrow"):
+                open_writer("parquet", str(tmp_path / "a.parquet"))
+
+
+def test_memory_stays_flat(tmp_path):
+    """Peak memory is a page or so, far below the export as a whole."""
+    tracemalloc.start()
+    everything = [alert for page in synthetic_pages("dep", 50) for alert in page]
+    held = tracemalloc.get_traced_memory()[0]
+    del everything
+    tracemalloc.reset_peak()
+    writer = open_writer("sqlite", str(tmp_path / "alerts.db"))
+    export_pages(writer, synthetic_pages("dep", 50), "dep", "acme/web")
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    writer.close()
+    assert peak < held / 5
@@ -0,0 +1,134 @@
+"""Tests for ghsec.gitconfig module."""
+
+import os
+
+import pytest
+
+from ghsec.gitconfig import detect_repo_local, github_repo_from_url, parse_git_config
+
+
+@pytest.fixture(autouse=True)
+def _isolated_home(tmp_path, monkeypatch):
+    home = tmp_path / "home"
+    home.mkdir()
+    monkeypatch.setenv("HOME", str(home))
+    monkeypatch.setenv("XDG_CONFIG_HOME", str(home / ".config"))
+    monkeypatch.delenv("GH_HOST", raising=False)
+    return home
+
+
+def _repo(root, config):
+    (root / ".git").mkdir(parents=True)
+    (root / ".git" / "config").write_text(config)
+    return root
+
+
+# --- URL parsing ---
+
+
+class TestGithubRepoFromUrl:
+    @pytest.mark.parametrize("url", [
+        "https://github.com/acme/web.git",
+        "https://github.com/acme/web",
+        "https://github.com/acme/web/",
+        "https://user@github.com/acme/web.git",
+        "git@github.com:acme/web.git",
+        "github.com:acme/web",
+        "ssh://git@github.com/acme/web.git",
+        "ssh://git@ssh.github.com:443/acme/web.git",
+        "git://github.com/acme/web.git",
+    ])
+    def test_github_forms(self, url):
+        assert github_repo_from_url(url) == "acme/web"
+
+    @pytest.mark.parametrize("url", [
+        "https://gitlab.com/acme/web.git",
+        "/srv/git/web.git",
+        "https://github.com/acme",
+    ])
+    def test_not_github(self, url):
+        assert github_repo_from_url(url) is None
+
+    def test_custom_host(self):
+        assert github_repo_from_url("git@ghe.example.com:acme/web.git", host="ghe.example.com") == "acme/web"
+
+
+# --- Config parsing ---
+
+
+class TestParseGitConfig:
+    def test_sections_and_values(self):
+        entries = parse_git_config(
+            '[core]\n\tbare = false\n[remote "origin"]\n\turl = "git@github.com:a/b.git"\n'
+            "\tfetch = +refs/heads/*:refs/remotes/origin/*  # comment\n"
+        )
+        assert ("core", None, "bare", "false") in entries
+        assert ("remote", "origin", "url", "git@github.com:a/b.git") in entries
+        assert ("remote", "origin", "fetch", "+refs/heads/*:refs/remotes/origin/*") in entries
+
+    def test_legacy_dotted_section(self):
+        assert parse_git_config("[remote.origin]\nurl = x\n") == [("remote", "origin", "url", "x")]
+
+
+# --- detect_repo_local ---
+
+
+class TestDetectRepoLocal:
+    def test_walks_up_from_subdirectory(self, tmp_path):
+        root = _repo(tmp_path / "proj", '[remote "origin"]\n\turl = https://github.com/acme/web.git\n')
+        sub = root / "src" / "pkg"
+        sub.mkdir(parents=True)
+        assert detect_repo_local(sub) == "acme/web"
+
+    def test_no_git_dir(self, tmp_path):
+        assert detect_repo_local(tmp_path) is None
+
+    def test_instead_of_rewrite(self, tmp_path):
+        root = _repo(tmp_path / "proj", '[url "git@github.com:"]\n\tinsteadOf = gh:\n[remote "origin"]\n\turl = gh:acme/api\n')
+        assert detect_repo_local(root) == "acme/api"
+
+    def test_global_instead_of(self, tmp_path, _isolated_home):
+        (_isolated_home / ".gitconfig").write_text('[url "https://github.com/"]\n\tinsteadOf = work:\n')
+        root = _repo(tmp_path / "proj", '[remote "origin"]\n\turl = work:acme/cli\n')
+        assert detect_repo_local(root) == "acme/cli"
+
+    def test_ambiguous_remotes(self, tmp_path):
+        root = _repo(
+            tmp_path / "proj",
+            '[remote "origin"]\n\turl = git@github.com:me/web.git\n[remote "upstream"]\n\turl = git@github.com:acme/web.git\n',
+        )
+        assert detect_repo_local(root) is None
+
+    def test_gh_resolved_default_wins(self, tmp_path):
+        root = _repo(
+            tmp_path / "proj",
+            '[remote "origin"]\n\turl = git@github.com:me/web.git\n'
+            '[remote "upstream"]\n\turl = git@github.com:acme/web.git\n\tgh-resolved = base\n',
+        )
+        assert detect_repo_local(root) == "acme/web"
+
+    def test_same_repo_on_several_remotes(self, tmp_path):
+        root = _repo(
+            tmp_path / "proj",
+            '[remote "origin"]\n\turl = git@github.com:acme/web.git\n[remote "https"]\n\turl = https://github.com/acme/web\n',
+        )
+        assert detect_repo_local(root) == "acme/web"
+
+    def test_worktree_gitdir_file(self, tmp_path):
+        main = _repo(tmp_path / "main", '[remote "origin"]\n\turl = git@github.com:acme/web.git\n')
+        wt_gitdir = main / ".git" / "worktrees" / "feature"
+        wt_gitdir.mkdir(parents=True)
+        (wt_gitdir / "commondir").write_text("../..\n")
+        worktree = tmp_path / "feature"
+        worktree.mkdir()
+        (worktree / ".git").write_text(f"gitdir: {wt_gitdir}\n")
+        assert detect_repo_local(worktree) == "acme/web"
+
+    def test_config_change_invalidates_cache(self, tmp_path):
+        root = _repo(tmp_path / "proj", '[remote "origin"]\n\turl = git@github.com:acme/old.git\n')
+        assert detect_repo_local(root) == "acme/old"
+        config = root / ".git" / "config"
+        config.write_text('[remote "origin"]\n\turl = git@github.com:acme/new.git\n')
+        st = config.stat()
+        os.utime(config, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+        assert detect_repo_local(root) == "acme/new"
@@ -0,0 +1,156 @@
+"""Tests for ghsec.graphql module."""
+
+import re
+
+import pytest
+
+from ghsec import api
+from ghsec.api import APIError
+from ghsec.graphql import build_query, estimate_cost, iter_dependabot_pages, list_dependabot_alerts, to_rest_alert
+from ghsec.records import AlertRecord
+from test.fixtures import json_response
+
+_BLOCK_RE = re.compile(r'(r\d+): repository\(owner: "([^"]+)", name: "([^"]+)"\) \{\s*vulnerabilityAlerts\(([^)]*)\)')
+
+
+def _node(number: int, severity: str = "HIGH", state: str = "OPEN") -> dict:
+    return {
+        "number": number,
+        "state": state,
+        "createdAt": "2025-01-01T00:00:00Z",
+        "fixedAt": "2025-03-01T00:00:00Z" if state == "FIXED" else None,
+        "dismissedAt": None,
+        "autoDismissedAt": None,
+        "dismissReason": None,
+        "dismissComment": None,
+        "vulnerableManifestPath": "package-lock.json",
+        "securityAdvisory": {"ghsaId": f"GHSA-{number}", "summary": "Prototype pollution", "severity": severity},
+        "securityVulnerability": {
+            "severity": severity,
+            "vulnerableVersionRange": "< 4.17.21",
+            "firstPatchedVersion": {"identifier": "4.17.21"},
+            "package": {"ecosystem": "NPM", "name": "lodash"},
+        },
+    }
+
+
+class FakeGraphQL:
+    """Answers aliased vulnerabilityAlerts queries from ``alerts[repo]``."""
+
+    def __init__(self, alerts: dict[str, int], page_size: int = 100):
+        self.alerts = alerts
+        self.page_size = page_size
+        self.queries: list[str] = []
+
+    def request(self, method, endpoint, fields=None, headers=None, include=False):
+        assert (method, endpoint) == ("POST", "graphql")
+        query = fields["query"]
+        self.queries.append(query)
+        data, errors = {"rateLimit": {"cost": 1, "remaining": 4999, "resetAt": "2025-01-01T01:00:00Z"}}, []
+        for alias, owner, name, args in _BLOCK_RE.findall(query):
+            repo = f"{owner}/{name}"
+            if repo not in self.alerts:
+                data[alias] = None
+                errors.append({"path": [alias], "message": f"Could not resolve to a Repository with the name '{repo}'."})
+                continue
+            cursor = re.search(r'after: "(\d+)"', args)
+            start = int(cursor.group(1)) if cursor else 0
+            end = min(start + self.page_size, self.alerts[repo])
+            data[alias] = {"vulnerabilityAlerts": {
+                "pageInfo": {"hasNextPage": end < self.alerts[repo], "endCursor": str(end)},
+                "nodes": [_node(n + 1, "MODERATE" if n % 2 else "CRITICAL") for n in range(start, end)],
+            }}
+        body = {"data": data, "errors": errors} if errors else {"data": data}
+        return json_response(body)
+
+
+@pytest.fixture
+def fake():
+    def install(alerts, page_size=100):
+        transport = FakeGraphQL(alerts, page_size)
+        api.set_transport(transport)
+        return transport
+    return install
+
+
+# --- query building ---
+
+
+class TestBuildQuery:
+    def test_aliases_and_cursors(self):
+        query = build_query({"acme/web": None, "acme/api": "Y3Vyc29y"}, ["OPEN"])
+        assert 'r0: repository(owner: "acme", name: "web")' in query
+        assert 'r1: repository(owner: "acme", name: "api")' in query
+        assert 'vulnerabilityAlerts(first: 100, states: [OPEN], after: "Y3Vyc29y")' in query
+        assert "rateLimit { cost remaining resetAt }" in query
+
+    def test_cost_estimate(self):
+        assert estimate_cost(1) == 1
+        assert estimate_cost(50) == 1
+        assert estimate_cost(250) == 2  # rounds to the nearest point
+        assert estimate_cost(100, page_size=250) == 3
+
+
+# --- node conversion ---
+
+
+class TestToRestAlert:
+    def test_matches_rest_shape(self):
+        alert = to_rest_alert(_node(7, "MODERATE", "FIXED"), "acme/web")
+        assert alert["state"] == "fixed"
+        assert alert["updated_at"] == "2025-03-01T00:00:00Z"
+        assert alert["html_url"] == "https://github.com/acme/web/security/dependabot/7"
+        record = AlertRecord.from_api(alert, "dep")
+        assert (record.repo, record.number, record.severity) == ("acme/web", 7, "medium")
+        assert (record.package, record.ecosystem, record.rule) == ("lodash", "npm", "GHSA-7")
+        assert record.description == "Prototype pollution"
+
+
+# --- batched fetching ---
+
+
+class TestIterDependabotPages:
+    def test_batches_repos_into_few_queries(self, fake):
+        transport = fake({f"acme/r{i}": 3 for i in range(120)})
+        alerts = list_dependabot_alerts([f"acme/r{i}" for i in range(120)], batch_size=50)
+        assert len(alerts) == 360
+        assert len(transport.queries) == 3  # 50 + 50 + 20 repos
+        assert alerts[0]["repository"] == {"full_name": "acme/r0"}
+
+    def test_follows_cursors_and_refills_batch(self, fake):
+        transport = fake({"acme/big": 5, "acme/small": 1, "acme/next": 2}, page_size=2)
+        pages = list(iter_dependabot_pages(["acme/big", "acme/small", "acme/next"], batch_size=2, page_size=2))
+        counts = {}
+        for page in pages:
+            for alert in page:
+                repo = alert["repository"]["full_name"]
+                counts[repo] = counts.get(repo, 0) + 1
+        assert counts == {"acme/big": 5, "acme/small": 1, "acme/next": 2}
+        assert len(transport.queries) == 3
+        assert 'name: "next"' in transport.queries[1]  # took acme/small's place after one page
+
+    def test_state_and_severity_filters(self, fake):
+        transport = fake({"acme/web": 4})
+        alerts = list_dependabot_alerts(["acme/web"], state="dismissed", severity="critical")
+        assert "states: [DISMISSED, AUTO_DISMISSED]" in transport.queries[0]
+        assert [a["number"] for a in alerts] == [1, 3]
+
+    def test_missing_repo_reported(self, fake):
+        fake({"acme/web": 1})
+        failed = []
+        alerts = list_dependabot_alerts(["acme/gone", "acme/web"], on_error=lambda repo, msg: failed.append(repo))
+        assert failed == ["acme/gone"]
+        assert len(alerts) == 1
+        with pytest.raises(APIError, match="acme/gone"):
+            list_dependabot_alerts(["acme/gone"])
+
+    def test_budget_stops_crawl(self, fake):
+        transport = fake({f"acme/r{i}": 1 for i in range(10)})
+        with pytest.raises(APIError, match="budget of 2 points"):
+            list_dependabot_alerts([f"acme/r{i}" for i in range(10)], batch_size=3, budget=2)
+        assert len(transport.queries) == 2
+
+    def test_query_errors_raise(self, fake_transport):
+        fake_transport(json_response({"errors": [{"message": "Bad credentials"}]}))
+        with pytest.raises(APIError, match="Bad credentials"):
+            list_dependabot_alerts(["acme/web"])
@@ -0,0 +1,43 @@
+"""Tests for ghsec.jsonstream module."""
+
+import json
+
+import pytest
+
+from ghsec.jsonstream import iter_array
+
+ITEMS = [{"number": n, "path": "src/é" * n, "tags": [n, 1.5, None, True]} for n in range(50)] + [7, "x", None, []]
+
+
+def _chunked(data: bytes, size: int) -> list[bytes]:
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+class TestIterArray:
+    @pytest.mark.parametrize("size", [1, 3, 64, 1 << 20])
+    def test_matches_json_loads_for_any_chunking(self, size):
+        body = json.dumps(ITEMS, indent=1, ensure_ascii=False).encode()
+        assert list(iter_array(_chunked(body, size))) == ITEMS
+
+    def test_number_split_across_chunks(self):
+        assert list(iter_array([b"[1", b"23, 4", b"5]"])) == [123, 45]
+
+    @pytest.mark.parametrize("chunks", [[b"[2.", b"5]"], [b"[-3e", b"10]"], [b"[1.5E", b"+2", b", tr", b"ue]"]])
+    def test_float_and_exponent_split_across_chunks(self, chunks):
+        assert list(iter_array(chunks)) == json.loads(b"".join(chunks))
+
+    def test_yields_before_the_rest_arrives(self):
+        def chunks():
+            yield b'[{"number": 1}, '
+            raise AssertionError("read past the first item")
+
+        assert next(iter_array(chunks())) == {"number": 1}
+
+    def test_empty_body_and_empty_array(self):
+        assert list(iter_array([b"", b" \n"])) == []
+        assert list(iter_array([b"[", b" ]"])) == []
+
+    @pytest.mark.parametrize("body", [b'{"message": "x"}', b"[1, 2", b"[1 2]", b"[1,]", b'[{"a": }]'])
+    def test_malformed(self, body):
+        with pytest.raises(ValueError):
+            list(iter_array([body]))
@@ -0,0 +1,146 @@
+"""Tests for ghsec.query module."""
+
+import argparse
+import time
+
+import pytest
+
+from ghsec.query import AlertIndex, Query, QueryError, parse_query
+from ghsec.records import AlertRecord
+
+
+def _iso(days_ago: float) -> str:
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(time.time() - days_ago * 86400))
+
+
+def _rec(number, **kw):
+    kw.setdefault("type", "code")
+    return AlertRecord(
+        repo=kw.pop("repo", "o/r"), number=number, state=kw.pop("state", "open"),
+        severity=kw.pop("severity", None), description=kw.pop("description", ""), **kw,
+    )
+
+
+RECORDS = [
+    _rec(1, rule="py/sql-injection", path="src/api/db.py", severity="high", tool="CodeQL", created_at=_iso(90)),
+    _rec(2, rule="py/sql-injection", path="src/web/views.py", severity="high", tool="CodeQL", created_at=_iso(5)),
+    _rec(3, rule="py/unused-import", path="tests/test_db.py", severity="low", tool="CodeQL", created_at=_iso(40)),
+    _rec(4, type="dep", package="lodash", ecosystem="npm", severity="critical", state="dismissed", created_at=_iso(200)),
+    _rec(5, type="dep", package="requests", ecosystem="pip", severity="medium", created_at=_iso(1)),
+    _rec(6, type="secret", rule="aws_access_key_id", validity="active", created_at=_iso(10)),
+]
+
+
+def _numbers(text, records=RECORDS):
+    q = Query(text)
+    return [records[i].number for i in q.select(AlertIndex(records))]
+
+
+def _scan(text, records=RECORDS):
+    q = Query(text)
+    return [r.number for r in records if q.matches(r)]
+
+
+# --- Matching ---
+
+
+class TestMatching:
+    @pytest.mark.parametrize("text, expected", [
+        ("rule=py/sql-injection", [1, 2]),
+        ("rule~py/*", [1, 2, 3]),
+        ("path~src/*", [1, 2]),
+        ("path~*db*", [1, 3]),
+        ("path=src/api/db.py", [1]),
+        ("package=lodash or package=requests", [4, 5]),
+        ("ecosystem=pip", [5]),
+        ("tool=CodeQL and not path~tests/*", [1, 2]),
+        ("validity=active", [6]),
+        ("severity>=high", [1, 2, 4]),
+        ("severity<medium", [3]),
+        ("age>30d", [1, 3, 4]),
+        ("age<1w", [2, 5]),
+        ("age>=3000h", [4]),
+        ("number>3 and number<=5", [4, 5]),
+        ("state!=dismissed type=dep", [5]),
+        ("(rule=py/sql-injection or type=dep) and age>60", [1, 4]),
+        ("rule!~py/*", [4, 5, 6]),
+        ('path="src/api/db.py"', [1]),
+    ])
+    def test_index_and_scan_agree(self, text, expected):
+        assert _numbers(text) == expected
+        assert _scan(text) == expected
+
+    def test_results_keep_input_order(self):
+        records = list(reversed(RECORDS))
+        assert _numbers("rule~py/*", records) == [3, 2, 1]
+
+
+class TestErrors:
+    @pytest.mark.parametrize("text", [
+        "",
+        "colour=red",
+        "rule>py",
+        "age=30d",
+        "age>soon",
+        "number=abc",
+        "severity>=urgent",
+        "(rule=x",
+        "rule=x and",
+        "just words",
+        "rule=x )",
+    ])
+    def test_invalid(self, text):
+        with pytest.raises(QueryError):
+            Query(text)
+
+    def test_parse_query_for_argparse(self):
+        with pytest.raises(argparse.ArgumentTypeError, match="unknown field"):
+            parse_query("colour=red")
+        assert parse_query("rule=x").text == "rule=x"
+
+
+# --- Index ---
+
+
+class TestAlertIndex:
+    def test_only_candidates_evaluated(self):
+        calls = []
+
+        class Counting(Query):
+            def __init__(self, text):
+                super().__init__(text)
+                inner = self._expr.match
+                self._expr.match = lambda rec: calls.append(rec.number) or inner(rec)
+
+        records = [_rec(i, rule=f"r{i % 100}", path=f"src/m{i % 7}/f{i}.py") for i in range(5000)]
+        hits = Counting("rule=r7 and path~src/m3/*").select(AlertIndex(records))
+        assert all(records[i].rule == "r7" and records[i].path.startswith("src/m3/") for i in hits)
+        assert len(calls) == len(hits)
+
+    def test_or_with_unindexed_side_scans(self):
+        assert _numbers("package=lodash or age<2d") == [4, 5]
+
+    def test_path_prefix_lookup(self):
+        index = AlertIndex(RECORDS)
+        assert index.glob("path", "src/*") == {0, 1}
+        assert index.equal("path", "src") == set()
+
+    def test_alert_without_path(self):
+        records = RECORDS + [_rec(7, rule="py/hardcoded-credentials", path=None)]
+        assert _numbers("path~src/*", records) == [1, 2]
+        assert _numbers("path~src/* or rule=py/hardcoded-credentials", records) == [1, 2, 7]
+
+
+# --- SQL push-down ---
+
+
+class TestSql:
+    def test_conjunctive_terms(self):
+        sql, params = Query("rule=py/x and path~src/api/* and age>3d").sql()
+        assert sql == "rule = ? AND path >= ? AND path < ?"
+        assert params == ["py/x", "src/api/", "src/api0"]
+
+    def test_nothing_to_push_down(self):
+        assert Query("rule=a or rule=b").sql() == ("", [])
+        assert Query("path~*.py").sql() == ("", [])
+        assert Query("not package=lodash").sql() == ("", [])
@@ -0,0 +1,148 @@
+"""Tests for ghsec.ratelimit module."""
+
+import threading
+import time
+
+import pytest
+
+from ghsec import api
+from ghsec.api import APIError, gh_api
+from ghsec.ratelimit import Scheduler
+from ghsec.transport import Response
+
+
+class _FakeClock:
+    def __init__(self, now=1_700_000_000.0):
+        self.now = now
+        self.sleeps = []
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def _scheduler(clock, **kwargs):
+    return Scheduler(sleep=clock.sleep, clock=clock.time, **kwargs)
+
+
+def _responses(*items):
+    queue = list(items)
+    calls = []
+
+    def send():
+        calls.append(1)
+        return queue.pop(0)
+
+    send.calls = calls
+    return send
+
+
+OK = Response(200, {"x-ratelimit-remaining": "4999"}, b"{}")
+
+
+class TestThrottling:
+    def test_retry_after_honored(self):
+        clock = _FakeClock()
+        sched = _scheduler(clock, concurrency=8)
+        send = _responses(Response(429, {"retry-after": "3"}, b""), OK)
+        assert sched.run(send).status == 200
+        assert len(send.calls) == 2
+        assert 3 <= clock.sleeps[0] <= 4
+        assert sched.limit == 4
+        assert sched.throttled == 1
+
+    def test_exhausted_budget_waits_for_reset(self):
+        clock = _FakeClock()
+        sched = _scheduler(clock)
+        reset = str(int(clock.now) + 30)
+        send = _responses(
+            Response(403, {"x-ratelimit-remaining": "0", "x-ratelimit-reset": reset}, b'{"message": "API rate limit exceeded"}'),
+            OK,
+        )
+        assert sched.run(send).status == 200
+        assert 30 <= sum(clock.sleeps) <= 31
+
+    def test_secondary_limit_backs_off_with_jitter(self):
+        clock = _FakeClock()
+        sched = _scheduler(clock, base_delay=2.0)
+        body = b'{"message": "You have exceeded a secondary rate limit"}'
+        send = _responses(Response(403, {}, body), Response(403, {}, body), OK)
+        assert sched.run(send).status == 200
+        assert len(send.calls) == 3
+        assert 0 <= clock.sleeps[0] <= 2.0
+        assert 0 <= clock.sleeps[-1] <= 4.0
+
+    def test_permission_error_not_retried(self):
+        clock = _FakeClock()
+        sched = _scheduler(clock)
+        send = _responses(Response(403, {}, b'{"message": "Resource not accessible by integration"}'))
+        assert sched.run(send).status == 403
+        assert clock.sleeps == []
+        assert sched.limit == 8
+
+    def test_gives_up_after_max_retries(self):
+        clock = _FakeClock()
+        sched = _scheduler(clock, max_retries=2)
+        send = _responses(*[Response(429, {"retry-after": "1"}, b"")] * 3)
+        assert sched.run(send).status == 429
+        assert len(send.calls) == 3
+        assert sched.limit == 1
+
+    def test_pauses_when_budget_hits_zero(self):
+        clock = _FakeClock()
+        sched = _scheduler(clock)
+        reset = str(int(clock.now) + 20)
+        sched.run(_responses(Response(200, {"x-ratelimit-remaining": "0", "x-ratelimit-reset": reset}, b"{}")))
+        assert clock.sleeps == []
+        sched.run(_responses(OK))
+        assert clock.sleeps == [pytest.approx(20)]
+        assert sched.remaining == 4999
+
+
+class TestAdaptiveConcurrency:
+    def test_grows_after_clean_run(self):
+        sched = _scheduler(_FakeClock(), concurrency=2, max_concurrency=3)
+        for _ in range(2):
+            sched.run(_responses(OK))
+        assert sched.limit == 3
+        for _ in range(10):
+            sched.run(_responses(OK))
+        assert sched.limit == 3
+
+    def test_caps_requests_in_flight(self):
+        sched = Scheduler(concurrency=2, max_concurrency=2)
+        in_flight = []
+        peak = []
+        lock = threading.Lock()
+
+        def send():
+            with lock:
+                in_flight.append(1)
+                peak.append(len(in_flight))
+            time.sleep(0.02)
+            with lock:
+                in_flight.pop()
+            return OK
+
+        threads = [threading.Thread(target=sched.run, args=(send,)) for _ in range(6)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert max(peak) == 2
+
+
+class TestGhApiIntegration:
+    def test_throttled_request_retried_through_gh_api(self, fake_transport):
+        api.set_scheduler(_scheduler(_FakeClock()))
+        fake_transport(Response(429, {"retry-after": "1"}, b""), Response(200, {}, b'{"number": 1}'))
+        assert gh_api("/repos/o/r/code-scanning/alerts/1") == {"number": 1}
+
+    def test_exhausted_retries_raise_api_error(self, fake_transport):
+        api.set_scheduler(_scheduler(_FakeClock(), max_retries=0))
+        fake_transport(Response(429, {"retry-after": "1"}, b'{"message": "slow down"}'))
+        with pytest.raises(APIError, match="HTTP 429"):
+            gh_api("/x")
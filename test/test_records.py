@@ -0,0 +1,142 @@
+"""Tests for ghsec.records module."""
+
+import sys
+
+from ghsec.records import AlertRecord, extract_description, extract_severity, to_records
+from test.fixtures import (
+    CODE_ALERT,
+    CODE_ALERT_MINIMAL,
+    DEP_ALERT,
+    DEP_ALERT_NO_PATCH,
+    SECRET_ALERT,
+    SECRET_ALERT_MINIMAL,
+)
+
+
+# --- extract_severity ---
+
+
+class TestExtractSeverity:
+    def test_code_with_security_level(self):
+        assert extract_severity(CODE_ALERT, "code") == "high"
+
+    def test_code_fallback_to_severity(self):
+        alert = {"rule": {"severity": "warning"}}
+        assert extract_severity(alert, "code") == "warning"
+
+    def test_code_empty_rule(self):
+        assert extract_severity({"rule": {}}, "code") is None
+
+    def test_dep(self):
+        assert extract_severity(DEP_ALERT, "dep") == "critical"
+
+    def test_dep_fallback_advisory(self):
+        alert = {"security_advisory": {"severity": "medium"}}
+        assert extract_severity(alert, "dep") == "medium"
+
+    def test_secret_returns_none(self):
+        assert extract_severity(SECRET_ALERT, "secret") is None
+
+    def test_empty_alert(self):
+        assert extract_severity({}, "code") is None
+
+
+# --- extract_description ---
+
+
+class TestExtractDescription:
+    def test_code(self):
+        assert extract_description(CODE_ALERT, "code") == "SQL query built from user-controlled sources"
+
+    def test_code_fallback_to_id(self):
+        assert extract_description(CODE_ALERT_MINIMAL, "code") == "py/unused-import"
+
+    def test_dep(self):
+        assert extract_description(DEP_ALERT, "dep") == "Remote code execution in lodash"
+
+    def test_secret(self):
+        assert extract_description(SECRET_ALERT, "secret") == "GitHub Personal Access Token"
+
+    def test_secret_fallback(self):
+        assert extract_description(SECRET_ALERT_MINIMAL, "secret") == "custom_secret"
+
+    def test_empty_alert(self):
+        assert extract_description({}, "code") == ""
+
+
+# --- AlertRecord ---
+
+
+class TestAlertRecord:
+    def test_code(self):
+        rec = AlertRecord.from_api(CODE_ALERT, "code", repo="owner/repo")
+        assert (rec.repo, rec.type, rec.number, rec.state) == ("owner/repo", "code", 1, "open")
+        assert rec.severity == "high"
+        assert rec.description == "SQL query built from user-controlled sources"
+        assert rec.rule == "py/sql-injection"
+        assert rec.path == "src/app/db.py"
+        assert rec.tool == "CodeQL"
+        assert rec.created_at == "2025-01-15T10:30:00Z"
+
+    def test_code_minimal(self):
+        rec = AlertRecord.from_api(CODE_ALERT_MINIMAL, "code")
+        assert rec.severity is None
+        assert rec.path == ""
+        assert rec.tool == ""
+
+    def test_dep(self):
+        rec = AlertRecord.from_api(DEP_ALERT_NO_PATCH, "dep")
+        assert rec.severity == "medium"
+        assert (rec.ecosystem, rec.package) == ("pip", "diskcache")
+
+    def test_secret(self):
+        rec = AlertRecord.from_api(SECRET_ALERT, "secret")
+        assert rec.rule == "github_personal_access_token"
+        assert rec.validity == "active"
+        assert rec.severity is None
+
+    def test_null_dep_package_fields(self):
+        alert = {**DEP_ALERT, "security_vulnerability": {"package": {"name": None, "ecosystem": None}}}
+        rec = AlertRecord.from_api(alert, "dep")
+        assert (rec.ecosystem, rec.package) == ("", "")
+
+    def test_null_location_path(self):
+        rec = AlertRecord.from_api({**CODE_ALERT, "most_recent_instance": {"location": {"path": None}}}, "code")
+        assert rec.path == ""
+
+    def test_repository_in_payload_wins(self):
+        rec = AlertRecord.from_api({**DEP_ALERT, "repository": {"full_name": "acme/api"}}, "dep", repo="x/y")
+        assert rec.repo == "acme/api"
+
+    def test_no_instance_dict(self):
+        rec = AlertRecord.from_api(SECRET_ALERT_MINIMAL, "secret")
+        assert not hasattr(rec, "__dict__")
+
+    def test_repeated_strings_shared(self):
+        a, b = to_records([dict(CODE_ALERT), {**CODE_ALERT, "number": 9}], "code", repo="owner/repo")
+        assert a.description is b.description
+        assert a.repo is b.repo
+
+    def test_smaller_than_raw_payload(self):
+        def deep_size(obj, seen=None):
+            seen = seen if seen is not None else set()
+            if id(obj) in seen:
+                return 0
+            seen.add(id(obj))
+            size = sys.getsizeof(obj)
+            if isinstance(obj, dict):
+                size += sum(deep_size(k, seen) + deep_size(v, seen) for k, v in obj.items())
+            elif isinstance(obj, list):
+                size += sum(deep_size(v, seen) for v in obj)
+            return size
+
+        rec = AlertRecord.from_api(DEP_ALERT, "dep")
+        assert sys.getsizeof(rec) * 5 < deep_size(DEP_ALERT)
+
+    def test_to_records_passes_records_through(self):
+        rec = AlertRecord.from_api(CODE_ALERT, "code")
+        assert to_records([rec], "code")[0] is rec
+
+    def test_equality(self):
+        assert AlertRecord.from_api(CODE_ALERT, "code") == AlertRecord.from_api(dict(CODE_ALERT), "code")
+        assert AlertRecord.from_api(CODE_ALERT, "code") != AlertRecord.from_api(CODE_ALERT_MINIMAL, "code")
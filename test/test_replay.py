@@ -0,0 +1,185 @@
+"""Tests for ghsec.replay and ghsec.fakegithub modules."""
+
+import json
+import time
+
+import pytest
+
+from ghsec import api
+from ghsec.api import APIError, list_alerts, update_alert
+from ghsec.fakegithub import FakeGitHub
+from ghsec.replay import Faults, RecordingTransport, ReplayTransport
+from ghsec.transport import HTTPTransport, Response, default_transport
+
+
+class _FakeClock:
+    def __init__(self):
+        self.now = 1_700_000_000.0
+        self.sleeps = []
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def fake():
+    with FakeGitHub() as server:
+        server.populate("acme/web", 250)
+        server.populate("acme/api", 5, alert_types=("dep",))
+        yield server
+
+
+@pytest.fixture
+def http(fake):
+    transport = HTTPTransport("fake-token", base_url=fake.url)
+    api.set_transport(transport)
+    yield transport
+    transport.close()
+
+
+# --- FakeGitHub ---
+
+
+class TestFakeGitHub:
+    def test_paginates(self, fake, http):
+        alerts = list_alerts("acme/web", "code")
+        assert len(alerts) == 250
+        assert len({a["number"] for a in alerts}) == 250
+        assert fake.requests == 3
+
+    def test_filters(self, fake, http):
+        opened = list_alerts("acme/web", "dep", state="open")
+        assert opened and all(a["state"] == "open" for a in opened)
+        critical = list_alerts("acme/web", "dep", severity="critical")
+        assert critical and all(a["security_advisory"]["severity"] == "critical" for a in critical)
+
+    def test_org_scope(self, fake, http):
+        alerts = [a for page in api.iter_org_alert_pages("acme", "dep") for a in page]
+        assert {a["repository"]["full_name"] for a in alerts} == {"acme/web", "acme/api"}
+        assert len(alerts) == 255
+
+    def test_patch_updates_state(self, fake, http):
+        update_alert("acme/web", "secret", 3, {"state": "resolved", "resolution": "revoked"})
+        assert api.get_alert("acme/web", "secret", 3)["resolution"] == "revoked"
+
+    def test_unknown_repo_is_404(self, fake, http):
+        with pytest.raises(APIError, match="404"):
+            list_alerts("acme/missing", "code")
+
+    def test_etag_revalidation(self, fake):
+        first = fake.handle("GET", "/repos/acme/web/code-scanning/alerts?per_page=10")
+        again = fake.handle("GET", "/repos/acme/web/code-scanning/alerts?per_page=10", headers={"if-none-match": first.headers["etag"]})
+        assert again.status == 304
+
+    def test_latency_overlaps_across_types(self):
+        with FakeGitHub(Faults(latency=0.2)) as server:
+            server.populate("acme/web", 10)
+            api.set_transport(HTTPTransport("t", base_url=server.url))
+            from concurrent.futures import ThreadPoolExecutor
+
+            start = time.perf_counter()
+            with ThreadPoolExecutor(3) as pool:
+                results = list(pool.map(lambda t: list_alerts("acme/web", t), ["code", "dep", "secret"]))
+            elapsed = time.perf_counter() - start
+        assert [len(r) for r in results] == [10, 10, 10]
+        assert elapsed < 0.5  # three 0.2 s requests in parallel, not 0.6 s in series
+
+
+# --- Faults ---
+
+
+class TestFaults:
+    def test_rate_limit_budget(self):
+        clock = _FakeClock()
+        faults = Faults(rate_limit=2, reset_after=60, sleep=clock.sleep, clock=clock.time)
+        ok = lambda: Response(200, {}, b"[]")  # noqa: E731
+        first, second, third = (faults.apply(ok) for _ in range(3))
+        assert [r.status for r in (first, second, third)] == [200, 200, 403]
+        assert second.headers["x-ratelimit-remaining"] == "0"
+        assert b"rate limit" in third.body
+        clock.now += 61
+        assert faults.apply(ok).headers["x-ratelimit-remaining"] == "1"
+
+    def test_injected_errors_and_latency(self):
+        clock = _FakeClock()
+        faults = Faults(latency=0.1, errors={429: 1.0}, sleep=clock.sleep, clock=clock.time)
+        resp = faults.apply(lambda: Response(200, {}, b"[]"))
+        assert resp.status == 429
+        assert resp.headers["retry-after"] == "1"
+        assert clock.sleeps == [0.1]
+
+    def test_error_rate_is_a_fraction(self):
+        faults = Faults(errors={502: 0.25}, seed=1)
+        statuses = [faults.apply(lambda: Response(200, {}, b"")).status for _ in range(2000)]
+        assert 400 < statuses.count(502) < 600
+
+
+# --- Record / replay ---
+
+
+class TestRecordReplay:
+    def test_round_trip(self, fake, http, tmp_path):
+        cassette = tmp_path / "crawl.json"
+        recorder = RecordingTransport(http, cassette)
+        api.set_transport(recorder)
+        recorded = list_alerts("acme/web", "dep")
+        recorder.close()
+
+        replay = ReplayTransport(cassette)
+        api.set_transport(replay)
+        assert list_alerts("acme/web", "dep") == recorded
+        assert replay.requests == 3
+        with pytest.raises(APIError, match="Not recorded"):
+            list_alerts("acme/web", "code")
+
+    def test_cassette_private(self, fake, http, tmp_path):
+        cassette = tmp_path / "crawl.json"
+        cassette.touch(mode=0o644)
+        recorder = RecordingTransport(http, cassette)
+        api.set_transport(recorder)
+        list_alerts("acme/web", "secret")
+        recorder.close()
+        assert cassette.stat().st_mode & 0o777 == 0o600
+
+    def test_repeated_requests_replay_in_order(self, tmp_path):
+        cassette = tmp_path / "c.json"
+        entries = [
+            {"method": "GET", "endpoint": "/x", "fields": {}, "status": 200, "headers": {}, "body": json.dumps(n)}
+            for n in (1, 2)
+        ]
+        cassette.write_text(json.dumps({"version": 1, "interactions": entries}))
+        replay = ReplayTransport(cassette)
+        assert [replay.request("GET", "/x").json() for _ in range(3)] == [1, 2, 2]
+        assert replay.request("GET", "https://api.github.com/x").json() == 2
+
+    def test_replay_with_faults_drives_scheduler(self, tmp_path):
+        cassette = tmp_path / "c.json"
+        cassette.write_text(json.dumps({"version": 1, "interactions": [
+            {"method": "GET", "endpoint": "/x", "fields": {}, "status": 200, "headers": {}, "body": "{}"},
+        ]}))
+        clock = _FakeClock()
+        faults = Faults(rate_limit=1, reset_after=30, sleep=clock.sleep, clock=clock.time)
+        replay = ReplayTransport(cassette, faults)
+        assert replay.request("GET", "/x").headers["x-ratelimit-remaining"] == "0"
+        assert replay.request("GET", "/x").status == 403
+
+    def test_rejects_other_json(self, tmp_path):
+        path = tmp_path / "c.json"
+        path.write_text("[]")
+        with pytest.raises(ValueError):
+            ReplayTransport(path)
+
+    def test_env_selects_replay_and_record(self, tmp_path, monkeypatch):
+        cassette = tmp_path / "c.json"
+        cassette.write_text(json.dumps({"version": 1, "interactions": []}))
+        monkeypatch.setenv("GHSEC_REPLAY", str(cassette))
+        assert isinstance(default_transport(), ReplayTransport)
+        monkeypatch.delenv("GHSEC_REPLAY")
+        monkeypatch.setenv("GHSEC_RECORD", str(tmp_path / "out.json"))
+        recorder = default_transport()
+        assert isinstance(recorder, RecordingTransport)
+        recorder.close()
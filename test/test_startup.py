@@ -0,0 +1,57 @@
+"""Startup-time budget for the ghsec CLI.
+
+Measured with ``python -X importtime``; run this file directly to print the
+current numbers (``python test/test_startup.py``) and track them over time.
+"""
+
+import json
+import subprocess
+import sys
+
+# Cumulative import time of ghsec.cli, in microseconds. About 70 ms locally
+# once Rich and http.client are deferred; the slack absorbs slow CI runners.
+STARTUP_BUDGET_US = 150_000
+
+
+def _importtime(code: str) -> dict[str, int]:
+    """Run ``code`` under -X importtime and return cumulative microseconds per module."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True, check=True
+    )
+    cumulative = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cum_us, name = line[len("import time:"):].split("|")
+        cumulative[name.strip()] = int(cum_us)
+    return cumulative
+
+
+def _measure(runs: int = 3) -> int:
+    """Best-of-``runs`` cumulative import time of ghsec.cli."""
+    return min(_importtime("import ghsec.cli")["ghsec.cli"] for _ in range(runs))
+
+
+class TestStartup:
+    def test_cli_import_skips_rich(self):
+        modules = _importtime("import ghsec.cli")
+        assert not [m for m in modules if m.split(".")[0] == "rich"]
+
+    def test_json_and_status_output_skip_rich(self):
+        code = (
+            "from ghsec.display import print_error, print_json, print_success\n"
+            "print_json([{'number': 1}]); print_success('Dismissed code alert #1'); print_error('x')"
+        )
+        modules = _importtime(code)
+        assert not [m for m in modules if m.split(".")[0] == "rich"]
+
+    def test_table_output_loads_rich(self):
+        modules = _importtime("from ghsec.display import print_alerts_table\nprint_alerts_table([], 'code')")
+        assert "rich.console" in modules
+
+    def test_import_budget(self):
+        assert _measure() < STARTUP_BUDGET_US
+
+
+if __name__ == "__main__":
+    print(json.dumps({"ghsec.cli_import_us": _measure(), "budget_us": STARTUP_BUDGET_US}))
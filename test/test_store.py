@@ -0,0 +1,143 @@
+"""Tests for ghsec.store module."""
+
+import json
+import sqlite3
+from unittest.mock import patch
+
+import pytest
+
+from ghsec.query import Query
+from ghsec.store import AlertStore, sync_alerts
+
+
+def _alert(number, updated, state="open"):
+    return {"number": number, "state": state, "updated_at": updated}
+
+
+@pytest.fixture
+def store(tmp_path):
+    s = AlertStore(tmp_path / "store.db")
+    yield s
+    s.close()
+
+
+class TestAlertStore:
+    def test_upsert_and_read(self, store):
+        store.upsert("o/r", "code", [_alert(1, "2025-01-01T00:00:00Z"), _alert(2, "2025-01-02T00:00:00Z")])
+        store.upsert("o/r", "code", [_alert(1, "2025-01-03T00:00:00Z", state="fixed")])
+        alerts = list(store.alerts("o/r", "code"))
+        assert [a["number"] for a in alerts] == [2, 1]
+        assert alerts[1]["state"] == "fixed"
+        assert store.count("o/r", "code") == 2
+
+    def test_high_water_per_repo_and_type(self, store):
+        store.set_high_water("o/r", "code", "2025-01-01T00:00:00Z")
+        assert store.high_water("o/r", "code") == "2025-01-01T00:00:00Z"
+        assert store.high_water("o/r", "dep") is None
+        assert store.high_water("o/other", "code") is None
+
+    def test_private_permissions(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("GHSEC_CACHE_DIR", str(tmp_path / "ghsec"))
+        s = AlertStore()
+        s.upsert("o/r", "secret", [_alert(1, "2025-01-01T00:00:00Z")])
+        assert (tmp_path / "ghsec").stat().st_mode & 0o777 == 0o700
+        for name in ("store.db", "store.db-wal", "store.db-shm"):
+            assert (tmp_path / "ghsec" / name).stat().st_mode & 0o777 == 0o600
+        s.close()
+
+
+def _code(number, rule, path):
+    return {"number": number, "state": "open", "rule": {"id": rule}, "most_recent_instance": {"location": {"path": path}}}
+
+
+class TestQuery:
+    def test_indexed_terms_pushed_down(self, store):
+        store.upsert("o/r", "code", [
+            _code(1, "py/sql-injection", "src/api/db.py"),
+            _code(2, "py/sql-injection", "tests/test_db.py"),
+            _code(3, "py/unused-import", "src/api/util.py"),
+        ])
+        found = store.query("o/r", "code", Query("rule=py/sql-injection and path~src/*"))
+        assert [a["number"] for a in found] == [1]
+        plan = store._conn.execute(
+            "EXPLAIN QUERY PLAN SELECT data FROM alerts WHERE repo = ? AND type = ? AND rule = ?", ("o/r", "code", "x")
+        ).fetchall()
+        assert "alerts_rule" in str(plan)
+
+    def test_unindexed_terms_checked_in_python(self, store):
+        store.upsert("o/r", "code", [_code(1, "a", "x.py"), {**_code(2, "a", "y.py"), "state": "fixed"}])
+        assert [a["number"] for a in store.query("o/r", "code", Query("state=fixed or rule=b"))] == [2]
+        assert [a["number"] for a in store.query("o/r", "code")] == [2, 1]
+
+    def test_migrates_store_without_indexed_columns(self, tmp_path):
+        path = tmp_path / "old.db"
+        conn = sqlite3.connect(str(path))
+        conn.execute(
+            "CREATE TABLE alerts (repo TEXT NOT NULL, type TEXT NOT NULL, number INTEGER NOT NULL, state TEXT,"
+            " updated_at TEXT, data TEXT NOT NULL, PRIMARY KEY (repo, type, number))"
+        )
+        conn.execute("INSERT INTO alerts VALUES ('o/r', 'code', 1, 'open', NULL, ?)", (json.dumps(_code(1, "py/x", "a.py")),))
+        conn.commit()
+        conn.close()
+        store = AlertStore(path)
+        assert [a["number"] for a in store.query("o/r", "code", Query("rule=py/x"))] == [1]
+        store.close()
+
+
+class TestSyncAlerts:
+    @patch("ghsec.store.iter_alert_pages")
+    def test_first_sync_crawls_everything(self, mock_pages, store):
+        mock_pages.return_value = iter([
+            [_alert(3, "2025-01-03T00:00:00Z"), _alert(2, "2025-01-02T00:00:00Z")],
+            [_alert(1, "2025-01-01T00:00:00Z")],
+        ])
+        summary = sync_alerts(store, "o/r", "dep")
+        assert summary == {"type": "dep", "changed": 3, "pages": 2, "total": 3}
+        assert store.high_water("o/r", "dep") == "2025-01-03T00:00:00Z"
+        mock_pages.assert_called_once_with("o/r", "dep", sort="updated", prefetch=False)
+
+    @patch("ghsec.store.iter_alert_pages")
+    def test_incremental_sync_stops_at_mark(self, mock_pages, store):
+        store.upsert("o/r", "code", [_alert(1, "2025-01-01T00:00:00Z"), _alert(2, "2025-01-02T00:00:00Z")])
+        store.set_high_water("o/r", "code", "2025-01-02T00:00:00Z")
+
+        def pages():
+            yield [
+                _alert(1, "2025-01-05T00:00:00Z", state="fixed"),
+                _alert(4, "2025-01-04T00:00:00Z"),
+                _alert(2, "2025-01-02T00:00:00Z"),
+                _alert(3, "2025-01-01T12:00:00Z"),
+            ]
+            pytest.fail("second page should not be requested")
+
+        mock_pages.return_value = pages()
+        summary = sync_alerts(store, "o/r", "code")
+        assert summary["changed"] == 2
+        assert summary["pages"] == 1
+        assert summary["total"] == 3
+        assert store.high_water("o/r", "code") == "2025-01-05T00:00:00Z"
+        states = {a["number"]: a["state"] for a in store.alerts("o/r", "code")}
+        assert states[1] == "fixed"
+
+    @patch("ghsec.store.iter_alert_pages")
+    def test_nothing_changed(self, mock_pages, store):
+        store.set_high_water("o/r", "secret", "2025-01-02T00:00:00Z")
+        mock_pages.return_value = iter([[_alert(9, "2025-01-01T00:00:00Z")]])
+        summary = sync_alerts(store, "o/r", "secret")
+        assert summary["changed"] == 0
+        assert store.high_water("o/r", "secret") == "2025-01-02T00:00:00Z"
+
+    @patch("ghsec.store.iter_alert_pages")
+    def test_interrupted_sync_keeps_old_mark(self, mock_pages, store):
+        from ghsec.api import APIError
+
+        store.set_high_water("o/r", "code", "2025-01-01T00:00:00Z")
+
+        def pages():
+            yield [_alert(5, "2025-02-01T00:00:00Z")]
+            raise APIError("boom")
+
+        mock_pages.return_value = pages()
+        with pytest.raises(APIError):
+            sync_alerts(store, "o/r", "code")
+        assert store.high_water("o/r", "code") == "2025-01-01T00:00:00Z"
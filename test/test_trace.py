@@ -0,0 +1,67 @@
+"""Tests for ghsec.trace module."""
+
+import json
+
+import pytest
+
+from ghsec import trace
+
+
+class TestDisabled:
+    def test_span_is_shared_no_op(self):
+        with trace.span("x", "cat") as span:
+            span.set(a=1)
+        assert trace.span("y", "cat") is span
+        assert trace.get_tracer() is None
+
+    def test_traced_passes_through(self):
+        @trace.traced("cat")
+        def double(x):
+            return x * 2
+
+        assert double(3) == 6
+        assert double.__name__ == "double"
+
+
+class TestTracer:
+    def test_spans_counters_and_gauges(self):
+        tracer = trace.enable()
+
+        @trace.traced("render")
+        def render():
+            with trace.span("inner", "decode", bytes=10) as span:
+                span.set(status=200)
+
+        render()
+        trace.count("requests")
+        trace.count("bytes_in", 2048)
+        trace.gauge("ratelimit.remaining", 42)
+        spans = {e["name"]: e for e in tracer.events if e["ph"] == "X"}
+        assert spans["inner"]["args"] == {"bytes": 10, "status": 200}
+        assert spans["render"]["dur"] >= spans["inner"]["dur"]
+        assert tracer.totals == {"requests": 1, "bytes_in": 2048}
+        summary = tracer.summary()
+        assert "render" in summary and "decode" in summary
+        assert "1 request, 2.0 KB received, rate limit 42 remaining" in summary
+
+    def test_exception_recorded(self):
+        tracer = trace.enable()
+        with pytest.raises(KeyError):
+            with trace.span("boom", "cli"):
+                raise KeyError("x")
+        assert tracer.events[0]["args"] == {"error": "KeyError"}
+
+    def test_chrome_trace_file(self, tmp_path):
+        trace.enable()
+        with trace.span("work", "cli"):
+            pass
+        path = tmp_path / "t.json"
+        trace.write_chrome_trace(str(path))
+        data = json.loads(path.read_text())
+        phases = [e["ph"] for e in data["traceEvents"]]
+        assert phases == ["M", "X"]
+        assert data["displayTimeUnit"] == "ms"
+
+    def test_write_without_enable(self, tmp_path):
+        with pytest.raises(RuntimeError):
+            trace.write_chrome_trace(str(tmp_path / "t.json"))
@@ -0,0 +1,225 @@
+"""Tests for ghsec.transport module."""
+
+import json
+import os
+import subprocess
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import pytest
+
+from ghsec import api
+from ghsec.api import APIError, gh_api
+from ghsec.transport import GhCliTransport, HTTPTransport, StreamedResponse, default_transport, get_token
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    """Minimal stand-in for api.github.com that records what it receives."""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def _reply(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        self.server.seen.append((self.command, self.path, dict(self.headers), self.client_address))
+        if self.path.endswith("/missing"):
+            self._reply(404, {"message": "Not Found"})
+        elif self.path.endswith("/forbidden"):
+            self._reply(403, {"message": "Resource not accessible by integration"})
+        else:
+            self._reply(200, [{"number": 1}])
+
+    def do_PATCH(self):
+        length = int(self.headers.get("Content-Length", 0))
+        payload = json.loads(self.rfile.read(length))
+        self.server.seen.append((self.command, self.path, dict(self.headers), self.client_address))
+        self._reply(200, payload)
+
+
+@pytest.fixture
+def server():
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), _StandInHandler)
+    srv.seen = []
+    thread = threading.Thread(target=srv.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+
+
+@pytest.fixture
+def transport(server):
+    t = HTTPTransport("test-token", base_url=f"http://127.0.0.1:{server.server_port}")
+    api.set_transport(t)
+    yield t
+    t.close()
+
+
+# --- HTTPTransport ---
+
+
+class TestHTTPTransport:
+    def test_get_returns_json(self, server, transport):
+        assert gh_api("/repos/o/r/code-scanning/alerts") == [{"number": 1}]
+        method, path, headers, _ = server.seen[0]
+        assert method == "GET"
+        assert path == "/repos/o/r/code-scanning/alerts"
+        assert headers["Authorization"] == "Bearer test-token"
+        assert headers["Accept"] == "application/vnd.github+json"
+
+    def test_connection_reused(self, server, transport):
+        for _ in range(3):
+            gh_api("/repos/o/r/code-scanning/alerts")
+        client_ports = {addr[1] for *_, addr in server.seen}
+        assert len(client_ports) == 1
+
+    def test_patch_sends_json_body(self, server, transport):
+        result = gh_api("/repos/o/r/dependabot/alerts/5", method="PATCH", fields={"state": "dismissed"})
+        assert result == {"state": "dismissed"}
+        assert server.seen[0][0] == "PATCH"
+
+    def test_404_raises_api_error(self, server, transport):
+        with pytest.raises(APIError, match="Not found"):
+            gh_api("/repos/o/r/missing")
+
+    def test_error_includes_message_and_status(self, server, transport):
+        with pytest.raises(APIError, match=r"not accessible by integration \(HTTP 403\)"):
+            gh_api("/repos/o/r/forbidden")
+
+    def test_base_path_prefix(self, server):
+        t = HTTPTransport("tok", base_url=f"http://127.0.0.1:{server.server_port}/api/v3")
+        t.request("GET", "/repos/o/r/code-scanning/alerts")
+        assert server.seen[0][1] == "/api/v3/repos/o/r/code-scanning/alerts"
+        t.close()
+
+    def test_connection_refused_raises_api_error(self):
+        api.set_transport(HTTPTransport("tok", base_url="http://127.0.0.1:9"))
+        with pytest.raises(APIError, match="failed"):
+            gh_api("/repos/o/r/code-scanning/alerts")
+
+    def test_stream_reads_body_then_reuses_connection(self, server, transport):
+        resp = transport.stream("GET", "/repos/o/r/code-scanning/alerts")
+        assert isinstance(resp, StreamedResponse)
+        assert b"".join(resp.chunks) == b'[{"number": 1}]'
+        transport.request("GET", "/repos/o/r/code-scanning/alerts")
+        assert len({addr[1] for *_, addr in server.seen}) == 1
+
+    def test_streamed_items_release_connection(self, server, transport):
+        assert list(api.iter_items("/repos/o/r/code-scanning/alerts")) == [{"number": 1}]
+        gh_api("/repos/o/r/code-scanning/alerts")
+        assert len({addr[1] for *_, addr in server.seen}) == 1
+
+    def test_stream_error_read_whole(self, server, transport):
+        resp = transport.stream("GET", "/repos/o/r/missing")
+        assert resp.status == 404
+        assert json.loads(resp.body) == {"message": "Not Found"}
+
+
+# --- Token lookup and transport selection ---
+
+
+class TestGetToken:
+    def test_env_token(self, monkeypatch):
+        monkeypatch.setenv("GH_TOKEN", "from-env")
+        assert get_token() == "from-env"
+
+    @patch("ghsec.transport.subprocess.run")
+    def test_gh_auth_token(self, mock_run, monkeypatch):
+        monkeypatch.delenv("GH_TOKEN", raising=False)
+        monkeypatch.delenv("GITHUB_TOKEN", raising=False)
+        mock_run.return_value = subprocess.CompletedProcess([], 0, stdout="gho_abc\n", stderr="")
+        assert get_token() == "gho_abc"
+        assert mock_run.call_args[0][0] == ["gh", "auth", "token"]
+
+    @patch("ghsec.transport.subprocess.run", side_effect=FileNotFoundError)
+    def test_no_token(self, mock_run, monkeypatch):
+        monkeypatch.delenv("GH_TOKEN", raising=False)
+        monkeypatch.delenv("GITHUB_TOKEN", raising=False)
+        assert get_token() is None
+
+
+class TestDefaultTransport:
+    def test_http_when_token(self, monkeypatch):
+        monkeypatch.setenv("GHSEC_TRANSPORT", "auto")
+        monkeypatch.setenv("GH_TOKEN", "tok")
+        assert isinstance(default_transport(), HTTPTransport)
+
+    @patch("ghsec.transport.subprocess.run", side_effect=FileNotFoundError)
+    def test_fallback_without_token(self, mock_run, monkeypatch):
+        monkeypatch.setenv("GHSEC_TRANSPORT", "auto")
+        monkeypatch.delenv("GH_TOKEN", raising=False)
+        monkeypatch.delenv("GITHUB_TOKEN", raising=False)
+        assert isinstance(default_transport(), GhCliTransport)
+
+    def test_forced_gh(self, monkeypatch):
+        monkeypatch.setenv("GH_TOKEN", "tok")
+        assert isinstance(default_transport(), GhCliTransport)
+
+
+# --- GhCliTransport ---
+
+
+class TestGhCliTransport:
+    @patch("ghsec.transport.subprocess.run")
+    def test_include_parses_status_and_headers(self, mock_run):
+        output = b'HTTP/2.0 200 OK\r\nLink: <https://api.github.com/x?page=2>; rel="next"\r\n\r\n[{"number": 1}]'
+        mock_run.return_value = subprocess.CompletedProcess([], 0, stdout=output, stderr=b"")
+        resp = GhCliTransport().request("GET", "/x", include=True)
+        assert mock_run.call_args[0][0][-1] == "--include"
+        assert resp.status == 200
+        assert resp.headers["link"].startswith("<https://api.github.com/x?page=2>")
+        assert resp.json() == [{"number": 1}]
+
+    @patch("ghsec.transport.subprocess.run")
+    def test_include_error_status(self, mock_run):
+        output = b'HTTP/2.0 403 Forbidden\r\nRetry-After: 60\r\n\r\n{"message": "slow down"}'
+        mock_run.side_effect = subprocess.CalledProcessError(1, "gh", output=output, stderr=b"gh: slow down")
+        resp = GhCliTransport().request("GET", "/x", include=True)
+        assert resp.status == 403
+        assert resp.headers["retry-after"] == "60"
+
+
+@pytest.fixture
+def fake_gh(tmp_path, monkeypatch):
+    """Put a ``gh`` on PATH that prints the contents of $FAKE_GH_OUTPUT and exits with $FAKE_GH_EXIT."""
+    script = tmp_path / "gh"
+    script.write_text('#!/bin/sh\ncat "$FAKE_GH_OUTPUT"\nexit "${FAKE_GH_EXIT:-0}"\n')
+    script.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{tmp_path}{os.pathsep}{os.environ['PATH']}")
+
+    def respond(output: bytes, exit_code: int = 0) -> None:
+        (tmp_path / "output").write_bytes(output)
+        monkeypatch.setenv("FAKE_GH_OUTPUT", str(tmp_path / "output"))
+        monkeypatch.setenv("FAKE_GH_EXIT", str(exit_code))
+
+    return respond
+
+
+class TestGhCliStream:
+    def test_streams_body_after_headers(self, fake_gh):
+        body = json.dumps([{"number": n} for n in range(5000)]).encode()
+        fake_gh(b'HTTP/2.0 200 OK\r\nLink: <https://api.github.com/x?page=2>; rel="next"\r\n\r\n' + body)
+        resp = GhCliTransport().stream("GET", "/x")
+        assert isinstance(resp, StreamedResponse)
+        assert resp.headers["link"].startswith("<https://api.github.com/x?page=2>")
+        assert b"".join(resp.chunks) == body
+
+    def test_error_status(self, fake_gh):
+        fake_gh(b'HTTP/2.0 404 Not Found\r\n\r\n{"message": "Not Found"}', exit_code=1)
+        resp = GhCliTransport().stream("GET", "/x")
+        assert resp.status == 404
+        assert json.loads(resp.body) == {"message": "Not Found"}
+
+    def test_failure_without_output(self, fake_gh):
+        fake_gh(b"", exit_code=4)
+        assert GhCliTransport().stream("GET", "/x").status == 404
@@ -0,0 +1,61 @@
+"""Tests for ghsec.watch module."""
+
+from ghsec.watch import PollInterval, watch
+from test.fixtures import alert_record
+
+
+# --- PollInterval ---
+
+
+class TestPollInterval:
+    def test_shrinks_on_change_and_grows_when_quiet(self):
+        interval = PollInterval(60, minimum=15, maximum=600)
+        assert interval.update(True) == 30
+        assert interval.update(True) == 15
+        assert interval.update(True) == 15
+        assert interval.update(False) == 22.5
+
+    def test_capped_at_maximum(self):
+        interval = PollInterval(500, minimum=15, maximum=600)
+        assert interval.update(False) == 600
+        assert interval.update(False) == 600
+
+    def test_stretches_when_budget_is_low(self):
+        interval = PollInterval(60, minimum=15, maximum=600)
+        # 10 points left for the next 1000 s, 2 points a poll, half the budget for us: 2.5 polls.
+        assert interval.update(True, remaining=10, reset_in=1000, cost=2) == 400
+        # Plenty of headroom: the usual policy applies.
+        assert interval.update(True, remaining=5000, reset_in=1000, cost=2) == 200
+
+    def test_exhausted_budget_waits_for_reset(self):
+        interval = PollInterval(60, minimum=15, maximum=600)
+        assert interval.update(False, remaining=0, reset_in=900) == 900
+
+
+# --- watch loop ---
+
+
+class TestWatch:
+    def test_reports_only_changes(self):
+        results = iter([
+            [alert_record(1), alert_record(2)],
+            [alert_record(1), alert_record(2)],
+            [alert_record(1), alert_record(2, "fixed", "2025-02-01T00:00:00Z"), alert_record(3)],
+            [alert_record(1), alert_record(3)],
+        ])
+        reports, sleeps = [], []
+        watch(lambda: next(results), reports.append, PollInterval(60, 15, 600), lambda: (None, None), polls=4, sleep=sleeps.append)
+        # Alert 2 dropping out of the list after it was fixed isn't a change worth reporting.
+        assert len(reports) == 1
+        assert [r.number for r in reports[0]["fixed"]] == [2]
+        assert [r.number for r in reports[0]["new"]] == [3]
+        assert sleeps == [60, 90, 45]
+
+    def test_cost_from_budget_drop(self):
+        remaining = iter([100, 90, 90, 80])
+        interval = PollInterval(60, 15, 600)
+        sleeps = []
+        watch(lambda: [], lambda changes: None, interval, lambda: (next(remaining), 1000.0), polls=3, sleep=sleeps.append)
+        # 90 points left and each poll costs 10: half the budget is 4.5 polls in 1000 s.
+        assert [round(s, 1) for s in sleeps] == [60, 222.2]
+        assert round(interval.current, 1) == 333.3  # quiet: 1.5x, already above the budget floor